@@ -30,12 +30,15 @@ REM Create development_types.json if not exists
 echo Creating configuration files...
 python -c "import json; import os; open('development_types.json', 'w').write(json.dumps({}, indent=2)) if not os.path.exists('development_types.json') else None"
 
+REM Compile the binary snapshot of the templates so startup skips parsing the JSON
+python compiled_catalogue.py development_types.json
+
 REM Create the executable with development_types.json as a resource and optional icon
 echo Creating executable...
 if defined ICON_PARAM (
-    pyinstaller --onefile --windowed %ICON_PARAM% --add-data "development_types.json;." --name "Git-OneClick" git_oneclick_gui.py
+    pyinstaller --onefile --windowed %ICON_PARAM% --add-data "development_types.json;." --add-data "development_types.json.compiled;." --name "Git-OneClick" git_oneclick_gui.py
 ) else (
-    pyinstaller --onefile --windowed --add-data "development_types.json;." --name "Git-OneClick" git_oneclick_gui.py
+    pyinstaller --onefile --windowed --add-data "development_types.json;." --add-data "development_types.json.compiled;." --name "Git-OneClick" git_oneclick_gui.py
 )
 
 echo.
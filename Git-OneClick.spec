@@ -1,11 +1,19 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
+import sys
+
+sys.path.insert(0, SPECPATH)
+from compiled_catalogue import main as compile_catalogue
+
+# Bundle the binary snapshot so the app only reads its index at startup
+compile_catalogue([os.path.join(SPECPATH, 'development_types.json')])
 
 
 a = Analysis(
     ['git_oneclick_gui.py'],
     pathex=[],
     binaries=[],
-    datas=[('development_types.json', '.')],
+    datas=[('development_types.json', '.'), ('development_types.json.compiled', '.')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
@@ -0,0 +1,23 @@
+"""Per-user locations for Git-OneClick's logs and caches."""
+import os
+import platform
+
+
+APP_DIR_NAME = "Git-OneClick"
+
+
+def app_data_dir(*parts):
+    """Per-user writable directory for logs and caches (created on demand)"""
+    system = platform.system()
+    if system == "Windows":
+        base = os.environ.get("LOCALAPPDATA") or os.environ.get("APPDATA") or os.path.expanduser("~")
+        path = os.path.join(base, APP_DIR_NAME)
+    elif system == "Darwin":
+        path = os.path.join(os.path.expanduser("~"), "Library", "Application Support", APP_DIR_NAME)
+    else:
+        base = os.environ.get("XDG_STATE_HOME") or os.path.join(os.path.expanduser("~"), ".local", "state")
+        path = os.path.join(base, APP_DIR_NAME.lower())
+
+    path = os.path.join(path, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
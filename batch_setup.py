@@ -0,0 +1,307 @@
+"""Headless batch mode: bootstrap many repositories from a manifest.
+
+Usage:
+    python batch_setup.py manifest.csv [--workers 4] [--config development_types.json]
+                                       [--name NAME --email EMAIL] [--engine native|subprocess]
+                                       [--large-files auto|ignore|lfs|continue|abort]
+                                       [--push-retries 3] [--push-backoff 2.0] [--no-hardlinks]
+                                       [--trace-dir DIR [--trace-format chrome|json]]
+                                       [--dry-run] [--report report.json]
+
+The manifest is either a CSV file with the columns ``folder``, ``remote_url`` and
+``dev_type`` (plus an optional ``mirrors`` column of space or semicolon separated
+URLs pushed alongside the main remote) or a JSON list of objects using the same
+keys, where ``mirrors`` may also be a list. Remotes may be local paths or
+``file://`` URLs of bare repositories (see local_remote.py). Relative folders are
+resolved against the manifest's directory. A ``dev_type`` of ``auto`` picks the
+type from the files in the folder (see type_detector.py).
+
+With ``--trace-dir`` every repository's step timings are written there as
+``<folder>-<n>.trace.json``; the Chrome format opens in chrome://tracing or
+Perfetto.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from git_env import set_global_config
+from git_pipeline import GitSetupPipeline, load_development_types
+from push_retry import PUSH_BACKOFF, PUSH_RETRIES
+from type_detector import compile_rules, detect_types
+
+
+# Accepted spellings for each manifest column
+MANIFEST_ALIASES = {
+    "folder": ("folder", "path", "folder_path"),
+    "remote_url": ("remote_url", "url", "repo_url", "remote"),
+    "dev_type": ("dev_type", "type", "template"),
+    "mirrors": ("mirrors", "mirror"),
+}
+
+# dev_type value that asks for detection from the folder's contents
+AUTO_DEV_TYPE = "auto"
+
+
+def normalize_manifest_entry(raw, base_dir):
+    """Map a raw manifest row onto the canonical folder/remote_url/dev_type keys"""
+    entry = {}
+    for key, aliases in MANIFEST_ALIASES.items():
+        for alias in aliases:
+            value = raw.get(alias)
+            if isinstance(value, list):
+                value = " ".join(str(item) for item in value)
+            if value is not None and str(value).strip():
+                entry[key] = str(value).strip()
+                break
+
+    if "folder" not in entry or "remote_url" not in entry:
+        raise ValueError(f"Manifest entry is missing a folder or remote URL: {raw}")
+
+    entry.setdefault("dev_type", "basic")
+    entry["mirrors"] = entry.get("mirrors", "").replace(";", " ").split()
+    if not os.path.isabs(entry["folder"]):
+        entry["folder"] = os.path.normpath(os.path.join(base_dir, entry["folder"]))
+    return entry
+
+
+def load_manifest(manifest_path):
+    """Read a CSV or JSON manifest into a list of normalized entries"""
+    base_dir = os.path.dirname(os.path.abspath(manifest_path))
+
+    with open(manifest_path, 'r', encoding='utf-8', newline='') as f:
+        if manifest_path.lower().endswith(".json"):
+            rows = json.load(f)
+            if isinstance(rows, dict):
+                rows = rows.get("repositories", [])
+        else:
+            rows = list(csv.DictReader(f))
+
+    return [normalize_manifest_entry(row, base_dir) for row in rows]
+
+
+def resolve_dev_type(entry, dev_types, messages, detect_rules=None):
+    """The entry's dev_type, detected from its folder when the manifest says "auto" (basic if unrecognised)"""
+    if entry["dev_type"] != AUTO_DEV_TYPE:
+        return entry["dev_type"]
+    candidates = detect_types(entry["folder"], dev_types, detect_rules)
+    if not candidates:
+        messages.append("Could not recognise the project type; using basic")
+        return "basic"
+    best = candidates[0]
+    messages.append(f"Detected {best.type_id} ({best.confidence:.0%} confidence: {', '.join(best.reasons)})")
+    return best.type_id
+
+
+def setup_repository(entry, dev_types, engine="native", large_file_action="auto", detect_rules=None,
+                     push_retries=PUSH_RETRIES, push_backoff=PUSH_BACKOFF, trace_path=None, trace_format="chrome",
+                     hardlinks=True):
+    """Run the full pipeline for one manifest entry and return its result record"""
+    messages = []
+    result = {
+        "folder": entry["folder"],
+        "remote_url": entry["remote_url"],
+        "dev_type": resolve_dev_type(entry, dev_types, messages, detect_rules),
+        "success": False,
+        "error": None,
+    }
+
+    started = time.perf_counter()
+    try:
+        pipeline = GitSetupPipeline(
+            entry["folder"],
+            entry["remote_url"],
+            result["dev_type"],
+            dev_types,
+            log_callback=messages.append,
+            engine=engine,
+            large_file_action=large_file_action,
+            mirrors=entry.get("mirrors", ()),
+            push_retries=push_retries,
+            push_backoff=push_backoff,
+            hardlinks=hardlinks
+        )
+        try:
+            pipeline.run()
+        finally:
+            result["engine"] = pipeline.engine
+            result["git_processes"] = pipeline.git_processes
+            result["pushes"] = [{key: push[key] for key in ("remote", "success", "attempts", "transport", "elapsed")}
+                                for push in pipeline.push_results]
+            result["steps"] = pipeline.trace.step_totals()
+            if trace_path:
+                result["trace"] = pipeline.trace.save(trace_path, trace_format)
+        result["success"] = True
+    except Exception as e:
+        result["error"] = str(e)
+    finally:
+        result["elapsed"] = round(time.perf_counter() - started, 3)
+        result["log"] = messages
+
+    return result
+
+
+def preview_repository(entry, dev_types, detect_rules=None):
+    """Dry run for one manifest entry: what would be committed and ignored"""
+    messages = []
+    result = {"folder": entry["folder"], "dev_type": resolve_dev_type(entry, dev_types, messages, detect_rules),
+              "error": None}
+    try:
+        pipeline = GitSetupPipeline(entry["folder"], entry["remote_url"], result["dev_type"],
+                                    dev_types, log_callback=messages.append)
+        result["preview"] = pipeline.preview_commit()
+    except Exception as e:
+        result["error"] = str(e)
+    result["log"] = messages
+    return result
+
+
+def configure_identity(git_name, git_email):
+    """Set the global Git identity once, before any worker starts (skipped if already set)"""
+    set_global_config({"user.name": git_name, "user.email": git_email})
+
+
+def run_batch(entries, dev_types, workers=4, on_result=None, engine="native", large_file_action="auto",
+              push_retries=PUSH_RETRIES, push_backoff=PUSH_BACKOFF, trace_dir=None, trace_format="chrome",
+              hardlinks=True):
+    """Bootstrap every manifest entry across a bounded worker pool.
+
+    A failing repository is recorded in the report and never stops the batch.
+    Returns a report dict with per-repository results and overall throughput.
+    """
+    results = []
+    started = time.perf_counter()
+    detect_rules = compile_rules(dev_types)
+    if trace_dir:
+        os.makedirs(trace_dir, exist_ok=True)
+
+    def trace_path(index, entry):
+        if not trace_dir:
+            return None
+        # The index keeps folders with the same name apart
+        name = os.path.basename(os.path.normpath(entry["folder"])) or "repository"
+        return os.path.join(trace_dir, f"{name}-{index + 1}.trace.json")
+
+    # Pipelines are cwd-independent, so repositories can share one process.
+    # Workers mostly wait on git subprocesses, which release the GIL.
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {executor.submit(setup_repository, entry, dev_types, engine, large_file_action, detect_rules,
+                                   push_retries, push_backoff, trace_path(index, entry), trace_format,
+                                   hardlinks): entry
+                   for index, entry in enumerate(entries)}
+        for future in as_completed(futures):
+            entry = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # setup_repository records its own errors; this only guards unexpected failures
+                result = {
+                    "folder": entry["folder"],
+                    "remote_url": entry["remote_url"],
+                    "dev_type": entry["dev_type"],
+                    "success": False,
+                    "error": f"Worker failed: {e}",
+                    "elapsed": 0.0,
+                    "log": [],
+                }
+            results.append(result)
+            if on_result:
+                on_result(result)
+
+    elapsed = time.perf_counter() - started
+    succeeded = sum(1 for r in results if r["success"])
+    return {
+        "total": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "workers": workers,
+        "elapsed": round(elapsed, 3),
+        "repos_per_minute": round(len(results) / elapsed * 60, 2) if elapsed > 0 else 0.0,
+        "results": results,
+    }
+
+
+def print_result(result):
+    """Print a one-line summary for a finished repository"""
+    status = "OK  " if result["success"] else "FAIL"
+    line = f"[{status}] {result['folder']} ({result['dev_type']}) in {result['elapsed']:.2f}s"
+    if "engine" in result:
+        line += f" [{result['engine']}, {result['git_processes']} git processes]"
+    if len(result.get("pushes", ())) > 1:
+        line += " [" + ", ".join(f"{push['remote']} {push['elapsed']:.2f}s" + ("" if push["success"] else " failed")
+                                 for push in result["pushes"]) + "]"
+    if result["error"]:
+        line += f" - {result['error']}"
+    print(line, flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bootstrap many Git repositories from a manifest")
+    parser.add_argument("manifest", help="CSV or JSON manifest of folder, remote_url, dev_type (\"auto\" to detect)")
+    parser.add_argument("--workers", type=int, default=4, help="Number of repositories processed at once")
+    parser.add_argument("--config", default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                         "development_types.json"),
+                        help="Development types configuration file")
+    parser.add_argument("--name", help="Set the global Git user.name before the batch")
+    parser.add_argument("--email", help="Set the global Git user.email before the batch")
+    parser.add_argument("--engine", choices=("native", "subprocess"), default="native",
+                        help="Write repositories in-process (native) or through git commands")
+    parser.add_argument("--large-files", choices=("auto", "ignore", "lfs", "continue", "abort"), default="auto",
+                        help="What to do with oversized or large binary files (auto stops only when "
+                             "a file exceeds the hosting limit)")
+    parser.add_argument("--push-retries", type=int, default=PUSH_RETRIES,
+                        help="Retries for pushes that fail with a transient network error")
+    parser.add_argument("--push-backoff", type=float, default=PUSH_BACKOFF,
+                        help="Seconds before the first push retry; doubled for each further retry")
+    parser.add_argument("--no-hardlinks", action="store_true",
+                        help="Push to local bare repositories with git instead of hardlinking objects")
+    parser.add_argument("--trace-dir", help="Write a timing trace per repository into this folder")
+    parser.add_argument("--trace-format", choices=("chrome", "json"), default="chrome",
+                        help="Trace file format: Chrome Trace Event Format or a plain span list")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Only preview what each repository would commit and ignore")
+    parser.add_argument("--report", help="Write the full JSON report to this file")
+    args = parser.parse_args(argv)
+
+    entries = load_manifest(args.manifest)
+    dev_types = load_development_types(args.config)
+
+    if args.dry_run:
+        previews = []
+        detect_rules = compile_rules(dev_types)
+        for entry in entries:
+            preview = preview_repository(entry, dev_types, detect_rules)
+            previews.append(preview)
+            print(f"{entry['folder']} ({preview['dev_type']})")
+            for line in preview["log"] or [f"ERROR: {preview['error']}"]:
+                print(f"    {line}")
+        if args.report:
+            with open(args.report, 'w', encoding='utf-8') as f:
+                json.dump(previews, f, indent=2, ensure_ascii=False)
+        return 0 if all(p["error"] is None for p in previews) else 1
+
+    if args.name and args.email:
+        configure_identity(args.name, args.email)
+
+    print(f"Bootstrapping {len(entries)} repositories with {args.workers} workers...", flush=True)
+    report = run_batch(entries, dev_types, workers=args.workers, on_result=print_result,
+                       engine=args.engine, large_file_action=args.large_files,
+                       push_retries=args.push_retries, push_backoff=args.push_backoff,
+                       trace_dir=args.trace_dir, trace_format=args.trace_format,
+                       hardlinks=not args.no_hardlinks)
+
+    print(f"Done: {report['succeeded']} succeeded, {report['failed']} failed "
+          f"in {report['elapsed']:.2f}s ({report['repos_per_minute']} repos/min)")
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    return 0 if report["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
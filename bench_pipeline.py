@@ -0,0 +1,408 @@
+"""Benchmark the setup pipeline against synthetic project trees.
+
+Usage:
+    python bench_pipeline.py [--types unity,python] [--files 300] [--depth 3] [--fanout 4]
+                             [--size-median 4096] [--size-spread 1.0] [--max-size 1048576]
+                             [--ignored 0.2] [--repeat 3] [--engine native|subprocess] [--no-hardlinks]
+                             [--seed 1] [--output bench.json] [--compare baseline.json]
+
+For every development type (all selectable ones by default) a project folder
+is generated with the requested number of files. Tracked files use the
+type's detection extensions and sit up to --depth folders deep; an --ignored
+share of them is placed where the type's .gitignore excludes them
+(node_modules/, Library/, *.pyc, ...). File sizes follow a log-normal
+distribution around --size-median and the contents are random, so they
+compress as badly as real binaries.
+
+Each run pushes to a fresh local bare repository (by hardlinking objects,
+or through git with --no-hardlinks) and happens in its own
+Python process, so the peak RSS belongs to that run alone. Git reads a
+scratch global config (GIT_CONFIG_GLOBAL, git 2.32+) with a fixed identity,
+which keeps the user's own settings and hooks out of the numbers.
+
+The JSON result holds every run (per-step seconds from the run trace, git
+process launches, peak RSS) and the median per type. --compare checks the
+medians against an earlier result and exits with 1 when a step got slower
+than --tolerance allows.
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from gitignore_matcher import IgnoreRules, compile_patterns
+from template_resolver import resolve_template, selectable_types
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows; peak_rss() asks the Win32 API instead
+    resource = None
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Tracked files of types that declare no detection extensions
+FALLBACK_EXTENSIONS = (".txt", ".md", ".json")
+
+# Steps faster than this in the baseline are too noisy to compare
+COMPARE_MIN_SECONDS = 0.01
+
+
+def peak_rss():
+    """Peak resident set size of this process in KiB, or None when it cannot be read"""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KiB, macOS bytes
+        return peak // 1024 if sys.platform == "darwin" else peak
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                        ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.PeakWorkingSetSize // 1024
+    return None
+
+
+# -- Synthetic trees -----------------------------------------------------------
+
+def ignored_samples(gitignore_lines):
+    """Concrete relative paths that the given .gitignore lines exclude"""
+    rules = IgnoreRules("", compile_patterns(gitignore_lines))
+    samples = []
+    for line in gitignore_lines:
+        line = line.strip()
+        if not line or line.startswith(("#", "!")) or "[!" in line or "[^" in line:
+            continue
+        dir_only = line.endswith("/")
+        pattern = line.strip("/")
+        # Character classes become their first character: [Ll]ibrary -> Library
+        while "[" in pattern and "]" in pattern[pattern.index("["):]:
+            start = pattern.index("[")
+            end = pattern.index("]", start)
+            pattern = pattern[:start] + pattern[start + 1:start + 2] + pattern[end + 1:]
+        pattern = pattern.replace("**", "deep").replace("*", "bench").replace("?", "x")
+        path = f"{pattern}/bench.bin" if dir_only else pattern
+        if is_ignored_path(rules, path):
+            samples.append(path)
+    return samples
+
+
+def is_ignored_path(rules, relative_path):
+    """Whether the file, or any folder above it, is ignored"""
+    parts = relative_path.split("/")
+    for depth in range(1, len(parts)):
+        if rules.is_ignored("/".join(parts[:depth]), True):
+            return True
+    return rules.is_ignored(relative_path, False)
+
+
+def ignored_path(rules, sample, directory, index, written):
+    """A new ignored path derived from sample, or None when every variant is taken"""
+    parent, _, name = sample.rpartition("/")
+    stem, ext = os.path.splitext(name)
+    renamed = f"{parent}/{stem}{index}{ext}" if parent else f"{stem}{index}{ext}"
+    # Basename patterns match at any depth; exact names (Thumbs.db) need a folder of their own
+    candidates = [f"{directory}/{renamed}" if directory else renamed, renamed, f"gen{index}/{sample}", sample]
+    for path in candidates:
+        if path not in written and is_ignored_path(rules, path):
+            return path
+    return None
+
+
+def file_size(rng, median, spread, max_size):
+    """Log-normal size around median; spread is the sigma of the underlying normal"""
+    return max(0, min(max_size, int(rng.lognormvariate(math.log(max(median, 1)), spread))))
+
+
+def generate_tree(folder, dev_types, type_id, files, depth, fanout, size_median, size_spread, max_size,
+                  ignored, rng):
+    """Write a synthetic project for type_id into folder; returns what was generated"""
+    template = resolve_template(dev_types, type_id)
+    gitignore = list(template.get("gitignore") or [])
+    rules = IgnoreRules("", compile_patterns(gitignore))
+    samples = ignored_samples(gitignore)
+    extensions = list(((dev_types.get(type_id) or {}).get("detect") or {}).get("extensions") or {})
+    extensions = extensions or list(FALLBACK_EXTENSIONS)
+    # Tracked files must not be ignored by accident (basic ignores *.txt)
+    extensions = [ext for ext in extensions if not is_ignored_path(rules, f"file{ext}")] or [".bench"]
+
+    ignored_count = round(files * ignored) if samples else 0
+    summary = {"files": 0, "bytes": 0, "ignored_files": 0, "ignored_bytes": 0}
+    written = set()
+    for index in range(files):
+        directory = "/".join(f"dir{rng.randrange(fanout)}" for _ in range(rng.randint(0, depth)))
+        if index < ignored_count:
+            path = ignored_path(rules, rng.choice(samples), directory, index, written)
+            if path is None:
+                continue
+        else:
+            name = f"file{index}{rng.choice(extensions)}"
+            path = f"{directory}/{name}" if directory else name
+        written.add(path)
+
+        size = file_size(rng, size_median, size_spread, max_size)
+        target = os.path.join(folder, *path.split("/"))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, "wb") as f:
+            f.write(rng.randbytes(size))
+
+        if is_ignored_path(rules, path):
+            summary["ignored_files"] += 1
+            summary["ignored_bytes"] += size
+        else:
+            summary["files"] += 1
+            summary["bytes"] += size
+    return summary
+
+
+# -- Runs ----------------------------------------------------------------------
+
+def scratch_environment(scratch):
+    """Environment with an isolated global git config holding a fixed identity"""
+    config_path = os.path.join(scratch, "gitconfig")
+    with open(config_path, "w", encoding="utf-8") as f:
+        f.write("[user]\n\tname = Benchmark\n\temail = bench@example.com\n[init]\n\tdefaultBranch = main\n")
+    env = dict(os.environ)
+    env.update({"GIT_CONFIG_GLOBAL": config_path, "GIT_CONFIG_NOSYSTEM": "1", "GIT_TERMINAL_PROMPT": "0"})
+    return env
+
+
+def run_one(folder, remote, type_id, config, engine, result_path, trace_memory=False, hardlinks=True):
+    """Child process: run the pipeline once and write its measurements to result_path"""
+    from git_pipeline import GitSetupPipeline, load_development_types
+
+    dev_types = load_development_types(config)
+    if trace_memory:
+        import tracemalloc
+        tracemalloc.start()
+
+    pipeline = GitSetupPipeline(folder, remote, type_id, dev_types, log_callback=lambda message: None,
+                                engine=engine, large_file_action="continue", push_retries=0, hardlinks=hardlinks)
+    result = {"success": False, "error": None}
+    started = time.perf_counter()
+    try:
+        pipeline.run()
+        result["success"] = True
+    except Exception as e:
+        result["error"] = str(e)
+    result["total"] = round(time.perf_counter() - started, 4)
+    result["steps"] = pipeline.trace.step_totals()
+    result["engine"] = pipeline.engine
+    result["git_processes"] = pipeline.git_processes
+    result["peak_rss_kb"] = peak_rss()
+    if trace_memory:
+        result["python_peak_kb"] = tracemalloc.get_traced_memory()[1] // 1024
+
+    with open(result_path, "w", encoding="utf-8") as f:
+        json.dump(result, f)
+
+
+def benchmark_type(dev_types, type_id, args, scratch, env, rng):
+    """Generate, run and clean up --repeat times for one type; returns the run records"""
+    runs = []
+    for repeat in range(args.repeat):
+        run_dir = os.path.join(scratch, f"{type_id}-{repeat}")
+        folder = os.path.join(run_dir, "project")
+        remote = os.path.join(run_dir, "remote.git")
+        os.makedirs(folder)
+        tree = generate_tree(folder, dev_types, type_id, args.files, args.depth, args.fanout,
+                             args.size_median, args.size_spread, args.max_size, args.ignored, rng)
+        subprocess.run(["git", "init", "-q", "--bare", remote], check=True, env=env)
+
+        result_path = os.path.join(run_dir, "result.json")
+        command = [sys.executable, os.path.abspath(__file__), "--run-one", folder, remote, type_id,
+                   "--config", args.config, "--engine", args.engine, "--result", result_path]
+        if args.trace_memory:
+            command.append("--trace-memory")
+        if args.no_hardlinks:
+            command.append("--no-hardlinks")
+        subprocess.run(command, env=env, cwd=HERE, stdout=subprocess.DEVNULL, check=True)
+        with open(result_path, "r", encoding="utf-8") as f:
+            result = json.load(f)
+
+        result.update({"type": type_id, "repeat": repeat, "tree": tree})
+        runs.append(result)
+        print_run(result)
+        if not args.keep:
+            shutil.rmtree(run_dir, ignore_errors=True)
+    return runs
+
+
+def summarize(runs):
+    """{type: {"total": median, "steps": {step: median}, ...}} over successful runs"""
+    summary = {}
+    for type_id in dict.fromkeys(run["type"] for run in runs):
+        ok = [run for run in runs if run["type"] == type_id and run["success"]]
+        if not ok:
+            summary[type_id] = {"failed": True}
+            continue
+        steps = {}
+        for run in ok:
+            for step, seconds in run["steps"].items():
+                steps.setdefault(step, []).append(seconds)
+        rss = [run["peak_rss_kb"] for run in ok if run.get("peak_rss_kb") is not None]
+        summary[type_id] = {
+            "runs": len(ok),
+            "total": round(statistics.median(run["total"] for run in ok), 4),
+            "steps": {step: round(statistics.median(values), 4) for step, values in steps.items()},
+            "git_processes": max(run["git_processes"] for run in ok),
+            "peak_rss_kb": max(rss) if rss else None,
+        }
+    return summary
+
+
+def compare(summary, baseline, tolerance):
+    """Lines describing steps that got slower than the tolerance allows"""
+    regressions = []
+    for type_id, current in summary.items():
+        before = baseline.get("summary", {}).get(type_id)
+        if not before or current.get("failed") or before.get("failed"):
+            continue
+        timings = [("total", before["total"], current["total"])]
+        timings += [(step, seconds, current["steps"][step])
+                    for step, seconds in before["steps"].items() if step in current["steps"]]
+        for step, old, new in timings:
+            if old >= COMPARE_MIN_SECONDS and new > old * (1 + tolerance):
+                regressions.append(f"{type_id} {step}: {old:.3f}s -> {new:.3f}s (+{new / old - 1:.0%})")
+    return regressions
+
+
+def source_revision():
+    """Commit of this checkout, with '-dirty' when it has local changes; None outside git"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=HERE, capture_output=True, text=True,
+                                check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=HERE,
+                               capture_output=True, text=True).stdout.strip()
+    except (subprocess.SubprocessError, OSError):
+        return None
+    return commit + ("-dirty" if dirty else "")
+
+
+def print_run(result):
+    status = "OK  " if result["success"] else "FAIL"
+    steps = ", ".join(f"{step} {seconds:.3f}s" for step, seconds in result["steps"].items())
+    line = (f"[{status}] {result['type']} #{result['repeat'] + 1}: {result['tree']['files']} files "
+            f"({result['tree']['ignored_files']} ignored) in {result['total']:.3f}s "
+            f"[{result['git_processes']} git processes, peak RSS {result['peak_rss_kb']} KiB] {steps}")
+    if result["error"]:
+        line += f" - {result['error']}"
+    print(line, flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the setup pipeline on synthetic project trees")
+    parser.add_argument("--types", help="Comma separated type ids (default: every selectable type)")
+    parser.add_argument("--config", default=os.path.join(HERE, "development_types.json"),
+                        help="Development types configuration file")
+    parser.add_argument("--files", type=int, default=300, help="Files per generated project")
+    parser.add_argument("--depth", type=int, default=3, help="Deepest folder level files are placed at")
+    parser.add_argument("--fanout", type=int, default=4, help="Sub-folders per folder level")
+    parser.add_argument("--size-median", type=int, default=4096, help="Median file size in bytes")
+    parser.add_argument("--size-spread", type=float, default=1.0,
+                        help="Sigma of the log-normal size distribution (0 gives equal sizes)")
+    parser.add_argument("--max-size", type=int, default=1024 * 1024, help="Largest file in bytes")
+    parser.add_argument("--ignored", type=float, default=0.2, help="Share of files the .gitignore excludes")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per type; the summary uses the median")
+    parser.add_argument("--engine", choices=("native", "subprocess"), default="native",
+                        help="Pipeline engine to measure")
+    parser.add_argument("--no-hardlinks", action="store_true",
+                        help="Push with git (pack protocol) instead of linking objects into the local remote")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for the generated trees")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Also record the Python heap peak with tracemalloc (slows the run down)")
+    parser.add_argument("--output", help="Write the JSON result to this file")
+    parser.add_argument("--compare", help="Earlier JSON result to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown against --compare before a step counts as a regression")
+    parser.add_argument("--keep", action="store_true", help="Keep the generated projects and remotes")
+    parser.add_argument("--run-one", nargs=3, metavar=("FOLDER", "REMOTE", "TYPE"), help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_one:
+        run_one(*args.run_one, args.config, args.engine, args.result, args.trace_memory, not args.no_hardlinks)
+        return 0
+
+    from git_pipeline import load_development_types
+    dev_types = load_development_types(args.config)
+    type_ids = args.types.split(",") if args.types else selectable_types(dev_types)
+    unknown = [type_id for type_id in type_ids if type_id not in dev_types]
+    if unknown:
+        parser.error(f"unknown development types: {', '.join(unknown)}")
+
+    scratch = tempfile.mkdtemp(prefix="oneclick-bench-")
+    env = scratch_environment(scratch)
+    rng = random.Random(args.seed)
+    started = time.time()
+    runs = []
+    try:
+        for type_id in type_ids:
+            runs.extend(benchmark_type(dev_types, type_id, args, scratch, env, rng))
+    finally:
+        if not args.keep:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    git_version = subprocess.run(["git", "--version"], capture_output=True, text=True).stdout.strip()
+    report = {
+        "meta": {
+            "revision": source_revision(),
+            "started_at": started,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "git": git_version,
+            "parameters": {key: value for key, value in vars(args).items()
+                           if key not in ("run_one", "result", "output", "compare", "keep")},
+        },
+        "runs": runs,
+        "summary": summarize(runs),
+    }
+    if args.keep:
+        print(f"Generated projects kept in {scratch}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    failed = sum(1 for run in runs if not run["success"])
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        # Timings only compare between runs on the same kind of tree
+        old_parameters = baseline.get("meta", {}).get("parameters", {})
+        changed = [key for key in ("files", "depth", "fanout", "size_median", "size_spread", "max_size",
+                                   "ignored", "engine", "no_hardlinks", "seed") if old_parameters.get(key) != getattr(args, key)]
+        if changed:
+            print(f"WARNING: {args.compare} used different {', '.join(changed)}; the comparison is not like for like")
+        regressions = compare(report["summary"], baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print(f"No step slower than {args.tolerance:.0%} against {args.compare}")
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,363 @@
+"""Import external template catalogues as a validated, deduplicated delta.
+
+    plan = plan_import("shared_types.json", store, replace=False)
+    print(plan.summary())
+    apply_import(store, plan)
+
+The source is read entry by entry (iter_catalogue), so a catalogue of many
+megabytes never exists as one parsed dict next to its text. Each entry is
+checked against TYPE_SCHEMA; broken entries are reported and left out
+instead of failing the whole import.
+
+Entries are compared by a hash of their canonical JSON, so formatting and
+key order do not count as changes and unchanged types are not written
+again. Only added, changed and (when replacing) removed types reach the
+store's journal.
+
+.gitignore sections (a comment header and the patterns under it) that
+appear in several imported types, or that equal an existing fragment, are
+moved into one abstract fragment which the types include. Generated
+fragments are named after their content (_gitignore-<hash>), so importing
+the same catalogue twice produces the same entries and no changes. Types
+with negated patterns keep their lines as they are, because moving a
+section in front of the type's own lines could change what a negation
+re-includes.
+"""
+import hashlib
+import json
+import sys
+
+from template_resolver import as_list, is_fragment
+
+
+# Characters read from the source per refill
+CHUNK_SIZE = 1024 * 1024
+
+# Sections with fewer patterns than this are not worth a fragment of their own
+MIN_FRAGMENT_PATTERNS = 3
+
+FRAGMENT_PREFIX = "_gitignore-"
+
+_decoder = json.JSONDecoder()
+
+
+class CatalogueFormatError(ValueError):
+    """The source is not a JSON object of development types"""
+
+
+# -- Streaming parser ----------------------------------------------------------
+
+def iter_catalogue(path, chunk_size=CHUNK_SIZE):
+    """Yield (type_id, value) for each member of the top-level JSON object in path"""
+    with open(path, "r", encoding="utf-8-sig") as f:
+        reader = CatalogueReader(f, chunk_size)
+        reader.expect("{")
+        if reader.peek() == "}":
+            return
+        while True:
+            type_id = reader.value()
+            if not isinstance(type_id, str):
+                raise reader.error("expected a type id")
+            reader.expect(":")
+            yield type_id, reader.value()
+            if reader.expect(",}") == "}":
+                return
+
+
+class CatalogueReader:
+    """A window over the source text that refills whenever a value runs past its end"""
+
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        # Characters dropped from the front of the buffer, for error positions
+        self.consumed = 0
+        self.eof = False
+
+    def fill(self):
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.consumed += self.pos
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Next non-whitespace character, or "" at the end of the source"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buffer) or not self.fill():
+                return self.buffer[self.pos:self.pos + 1]
+
+    def expect(self, allowed):
+        found = self.peek()
+        if not found or found not in allowed:
+            raise self.error(f"expected {' or '.join(repr(c) for c in allowed)}")
+        self.pos += 1
+        return found
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except ValueError:
+                # Most likely cut off by the end of the buffer
+                if self.fill():
+                    continue
+                raise self.error("invalid JSON")
+            if end == len(self.buffer) and not self.eof and self.fill():
+                # A number or literal may continue in the next chunk
+                continue
+            self.pos = end
+            return value
+
+    def error(self, message):
+        return CatalogueFormatError(f"{message} at character {self.consumed + self.pos}")
+
+
+# -- Validation ----------------------------------------------------------------
+
+def is_string_list(value):
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+
+def is_reference(value):
+    return isinstance(value, str) or is_string_list(value)
+
+
+TYPE_SCHEMA = {
+    "name": (lambda value: isinstance(value, str), "a string"),
+    "description": (lambda value: isinstance(value, str), "a string"),
+    "gitignore": (is_string_list, "a list of strings"),
+    "readme_template": (lambda value: isinstance(value, str), "a string"),
+    "extends": (is_reference, "a type id or a list of type ids"),
+    "include": (is_reference, "a type id or a list of type ids"),
+    "abstract": (lambda value: isinstance(value, bool), "true or false"),
+    "detect": (lambda value: isinstance(value, dict)
+               and isinstance(value.get("markers", []), list)
+               and isinstance(value.get("extensions", {}), dict), "an object with markers and extensions"),
+}
+
+
+def validate_entry(type_id, info, known_ids):
+    """Problems with one entry (empty when it is fine); unknown keys are kept as they are"""
+    if not type_id.strip():
+        return ["the type id is empty"]
+    if not isinstance(info, dict):
+        return ["the entry is not an object"]
+    problems = [f"'{key}' must be {expected}" for key, (check, expected) in TYPE_SCHEMA.items()
+                if key in info and not check(info[key])]
+    if not problems:
+        for key in ("extends", "include"):
+            missing = [ref for ref in as_list(info.get(key)) if ref not in known_ids]
+            if missing:
+                problems.append(f"'{key}' names unknown types: {', '.join(missing)}")
+    return problems
+
+
+# -- Diffing and dedup ---------------------------------------------------------
+
+def content_hash(info):
+    """Hash of an entry that ignores formatting and key order"""
+    canonical = json.dumps(info, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def gitignore_sections(lines):
+    """Split .gitignore lines into sections, each starting at a comment that follows patterns"""
+    sections = []
+    current = []
+    has_patterns = False
+    for line in lines:
+        is_comment = line.strip().startswith("#")
+        if is_comment and has_patterns:
+            sections.append(current)
+            current, has_patterns = [], False
+        current.append(line)
+        has_patterns = has_patterns or bool(line.strip() and not is_comment)
+    if current:
+        sections.append(current)
+    return sections
+
+
+def pattern_count(section):
+    return sum(1 for line in section if line.strip() and not line.strip().startswith("#"))
+
+
+def can_share(info):
+    """Whether a type's sections may move into fragments without changing its .gitignore"""
+    return (not info.get("abstract")
+            and not any(line.strip().startswith("!") for line in info.get("gitignore", [])))
+
+
+def plain_fragment(info):
+    """A fragment that is nothing but a fixed list of .gitignore lines"""
+    return info.get("abstract") and not info.get("extends") and not info.get("include")
+
+
+def fragment_entry(section):
+    title = next((line.strip().lstrip("#").strip() for line in section if line.strip().startswith("#")), "")
+    return {
+        "name": f"Shared: {title}" if title else "Shared .gitignore patterns",
+        "description": "Patterns shared by imported templates (fragment)",
+        "abstract": True,
+        "gitignore": list(section),
+    }
+
+
+def deduplicate(entries, store):
+    """Move shared .gitignore sections into fragments; returns (entries, generated fragments)"""
+    # Existing fragments that hold exactly one section can be reused as they are
+    owners = {}
+    for source in (store, entries):
+        for type_id in source:
+            if source is store and not is_fragment(store, type_id):
+                continue
+            info = source[type_id]
+            if plain_fragment(info) and info.get("gitignore"):
+                owners.setdefault(tuple(info["gitignore"]), type_id)
+
+    counts = {}
+    for info in entries.values():
+        if can_share(info):
+            for section in {tuple(section) for section in gitignore_sections(info.get("gitignore", []))}:
+                counts[section] = counts.get(section, 0) + 1
+
+    fragments = {}
+
+    def fragment_for(section):
+        if section in owners:
+            return owners[section]
+        if counts.get(section, 0) < 2 or pattern_count(section) < MIN_FRAGMENT_PATTERNS:
+            return None
+        fragment_id = FRAGMENT_PREFIX + content_hash(list(section))[:10]
+        fragments[fragment_id] = fragment_entry(section)
+        owners[section] = fragment_id
+        return fragment_id
+
+    result = {}
+    for type_id, info in entries.items():
+        if not can_share(info):
+            result[type_id] = info
+            continue
+        kept = []
+        includes = as_list(info.get("include"))
+        for section in gitignore_sections(info.get("gitignore", [])):
+            fragment_id = fragment_for(tuple(section))
+            if fragment_id is None or fragment_id == type_id:
+                kept.extend(section)
+            elif fragment_id not in includes:
+                includes.append(fragment_id)
+        if includes != as_list(info.get("include")):
+            info = dict(info, gitignore=kept, include=includes)
+        result[type_id] = info
+    return result, fragments
+
+
+# -- Plan and apply ------------------------------------------------------------
+
+class ImportPlan:
+    """What an import would change; nothing is written until apply_import()"""
+
+    def __init__(self):
+        self.added = {}
+        self.changed = {}
+        self.unchanged = []
+        self.removed = []
+        self.invalid = {}     # type_id -> problems
+        self.fragments = []   # generated fragment ids that are added or changed
+
+    @property
+    def updates(self):
+        return {**self.added, **self.changed}
+
+    def summary(self, limit=None):
+        """Counts of each kind of change, followed by the problems of skipped entries"""
+        lines = [f"{len(self.added)} added, {len(self.changed)} changed, {len(self.unchanged)} unchanged"
+                 + (f", {len(self.removed)} removed" if self.removed else "")]
+        if self.fragments:
+            lines.append(f"{len(self.fragments)} shared .gitignore fragments")
+        if self.invalid:
+            lines.append(f"{len(self.invalid)} invalid entries skipped:")
+            invalid = list(self.invalid.items())
+            lines.extend(f"  {type_id}: {'; '.join(problems)}" for type_id, problems in invalid[:limit])
+            if limit is not None and len(invalid) > limit:
+                lines.append(f"  ... and {len(invalid) - limit} more")
+        return "\n".join(lines)
+
+
+def plan_import(path, store, replace=False):
+    """Read, validate, deduplicate and diff a catalogue against store"""
+    plan = ImportPlan()
+    entries = dict(iter_catalogue(path))
+
+    known_ids = set(entries) if replace else set(entries) | set(store)
+    valid = {}
+    for type_id, info in entries.items():
+        problems = validate_entry(type_id, info, known_ids)
+        if problems:
+            plan.invalid[type_id] = problems
+        else:
+            valid[type_id] = info
+    # An entry building on a rejected one would not resolve either
+    while True:
+        broken = [type_id for type_id, info in valid.items()
+                  if any(ref in plan.invalid for ref in as_list(info.get("extends")) + as_list(info.get("include")))]
+        if not broken:
+            break
+        for type_id in broken:
+            plan.invalid[type_id] = ["builds on an invalid entry"]
+            del valid[type_id]
+
+    valid, fragments = deduplicate(valid, {} if replace else store)
+    for type_id, info in list(valid.items()) + list(fragments.items()):
+        if type_id not in store:
+            plan.added[type_id] = info
+        elif content_hash(store[type_id]) != content_hash(info):
+            plan.changed[type_id] = info
+        else:
+            plan.unchanged.append(type_id)
+    plan.fragments = [type_id for type_id in fragments if type_id in plan.updates]
+
+    if replace:
+        kept = set(valid) | set(fragments)
+        plan.removed = [type_id for type_id in store if type_id not in kept]
+    return plan
+
+
+def apply_import(store, plan):
+    """Persist only the delta: one journal append for all added, changed and removed types"""
+    store.apply(plan.updates, plan.removed)
+
+
+def main(argv=None):
+    import argparse
+    import os
+
+    from git_pipeline import load_development_types
+
+    parser = argparse.ArgumentParser(description="Import development types from another catalogue")
+    parser.add_argument("source", help="JSON catalogue to import")
+    parser.add_argument("--config", default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                         "development_types.json"),
+                        help="Development types configuration file to import into")
+    parser.add_argument("--replace", action="store_true", help="Remove types the source does not contain")
+    parser.add_argument("--dry-run", action="store_true", help="Only show what would change")
+    args = parser.parse_args(argv)
+
+    store = load_development_types(args.config)
+    plan = plan_import(args.source, store, replace=args.replace)
+    print(plan.summary())
+    if not args.dry_run:
+        apply_import(store, plan)
+    return 1 if plan.invalid else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""Binary snapshot of development_types.json that loads without parsing the bodies.
+
+``development_types.json.compiled`` sits next to the JSON source:
+
+    header   magic, format version, source size, mtime and BLAKE2 digest,
+             number of types, index length
+    index    JSON list of [type_id, name, description, truthy keys, offset, length]
+    bodies   each type's JSON text, back to back
+
+The file is memory-mapped and only the index is decoded at startup, which
+is all the type picker needs (names, descriptions, which entries are
+abstract fragments). A body (gitignore list, README template) is read from
+the mapping and decoded the first time that type is used. The index is
+JSON rather than fixed records because the C decoder reads a list of
+thousands of entries faster than unpacking them one by one in Python.
+
+The snapshot is only trusted while it describes the JSON file byte for
+byte: a matching size and mtime is accepted directly, a matching size with
+another mtime (PyInstaller extracts its data files afresh on every launch)
+is confirmed by the digest, and anything else means the source changed and
+the snapshot is compiled again. Edits made in the app go to the store's
+journal and are replayed on top, as before.
+
+    python compiled_catalogue.py development_types.json
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+
+
+COMPILED_SUFFIX = ".compiled"
+
+MAGIC = b"GOCATLG\0"
+
+# Bumped whenever the layout changes; older snapshots are recompiled
+FORMAT_VERSION = 1
+
+# magic, version, source size, source mtime_ns, source digest, type count, index length
+HEADER = struct.Struct("<8sIQQ16sIQ")
+
+
+def compiled_path(source_path):
+    return source_path + COMPILED_SUFFIX
+
+
+def source_digest(data):
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class CompiledEntry:
+    """One type's index row in the mapped snapshot; the body is decoded on first use"""
+
+    __slots__ = ("catalogue", "row")
+
+    def __init__(self, catalogue, row):
+        self.catalogue = catalogue
+        # [type_id, name, description, truthy keys, offset, length]
+        self.row = row
+
+    @property
+    def summary(self):
+        _, name, description = self.row[:3]
+        summary = {}
+        if name is not None:
+            summary["name"] = name
+        if description is not None:
+            summary["description"] = description
+        return summary
+
+    def declares(self, key):
+        return key in self.row[3]
+
+    def text(self):
+        start = self.catalogue.base + self.row[4]
+        return self.catalogue.data[start:start + self.row[5]].decode("utf-8")
+
+    def decode(self):
+        return json.loads(self.text())
+
+
+class CompiledCatalogue:
+    """A mapped snapshot; entries maps type ids to CompiledEntry in catalogue order"""
+
+    def __init__(self, data, base, index):
+        self.data = data
+        # Bodies start right after the index
+        self.base = base
+        self.entries = {row[0]: CompiledEntry(self, row) for row in index}
+
+    @classmethod
+    def open(cls, source_path):
+        """The snapshot for source_path if it is current, else None"""
+        try:
+            with open(compiled_path(source_path), "rb") as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            source = os.stat(source_path)
+        except (OSError, ValueError):
+            return None
+
+        try:
+            magic, version, size, mtime_ns, digest, count, index_length = HEADER.unpack_from(data)
+        except struct.error:
+            data.close()
+            return None
+        current = magic == MAGIC and version == FORMAT_VERSION and size == source.st_size
+        if current and mtime_ns != source.st_mtime_ns:
+            try:
+                with open(source_path, "rb") as f:
+                    current = source_digest(f.read()) == digest
+            except OSError:
+                current = False
+        if not current:
+            data.close()
+            return None
+
+        index = json.loads(data[HEADER.size:HEADER.size + index_length].decode("utf-8"))
+        return cls(data, HEADER.size + index_length, index)
+
+    def close(self):
+        self.data.close()
+
+
+def build_catalogue(source_bytes, source_mtime_ns, types):
+    """Snapshot bytes for a source file's content; types maps type ids to dicts or raw JSON text"""
+    index = []
+    bodies = []
+    offset = 0
+    for type_id, value in types.items():
+        if isinstance(value, str):
+            body, info = value, json.loads(value)
+        else:
+            body, info = json.dumps(value, ensure_ascii=False), value
+        encoded = body.encode("utf-8")
+        index.append([type_id, info.get("name"), info.get("description"),
+                      [key for key, item in info.items() if item], offset, len(encoded)])
+        bodies.append(encoded)
+        offset += len(encoded)
+
+    index_bytes = json.dumps(index, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, len(source_bytes), source_mtime_ns,
+                         source_digest(source_bytes), len(index), len(index_bytes))
+    return header + index_bytes + b"".join(bodies)
+
+
+def main(argv=None):
+    """Compile (or confirm) the snapshot of each catalogue, e.g. before bundling"""
+    from template_store import TemplateStore
+
+    argv = sys.argv[1:] if argv is None else argv
+    for source_path in argv or ["development_types.json"]:
+        store = TemplateStore(source_path)
+        state = "up to date" if store.compiled_loaded else "compiled"
+        print(f"{compiled_path(source_path)}: {len(store)} types, {state}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+"""The git installation and its user-level configuration.
+
+detect_git() finds the git executable and reads the system and global
+configuration with a single ``git config --list --show-origin`` call. The
+result is cached in memory and on disk, keyed by the git binary's and every
+config file's modification time, so later launches and batch jobs do not
+spawn git at all until something actually changes. Spawning matters: on
+machines where every process launch is scanned it can take seconds.
+"""
+import json
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+from threading import Lock
+
+from app_paths import app_data_dir
+from native_git import parse_config_list
+
+
+# Where the Git for Windows installer puts git when it is not on PATH
+WINDOWS_GIT_LOCATIONS = (
+    r"%ProgramFiles%\Git\cmd\git.exe",
+    r"%ProgramFiles(x86)%\Git\cmd\git.exe",
+    r"%LocalAppData%\Programs\Git\cmd\git.exe",
+)
+
+# Environment variables that change which configuration git reads
+CONFIG_ENVIRONMENT = (
+    "HOME", "USERPROFILE", "XDG_CONFIG_HOME", "GIT_CONFIG_GLOBAL", "GIT_CONFIG_SYSTEM",
+    "GIT_CONFIG_NOSYSTEM", "GIT_CONFIG_PARAMETERS", "GIT_CONFIG_COUNT",
+)
+
+# Bumped whenever the cached structure changes
+CACHE_VERSION = 1
+
+_detect_lock = Lock()
+_detected = {}
+
+
+def no_window_flags():
+    """creationflags that stop a console window flashing up from the windowed build"""
+    return getattr(subprocess, "CREATE_NO_WINDOW", 0)
+
+
+def find_git():
+    """Absolute path of the git executable, or None"""
+    path = shutil.which("git")
+    if path:
+        return path
+    if platform.system() == "Windows":
+        for location in WINDOWS_GIT_LOCATIONS:
+            candidate = os.path.expandvars(location)
+            if os.path.isfile(candidate):
+                return candidate
+    return None
+
+
+def cache_path():
+    return os.path.join(app_data_dir("cache"), "git-environment.json")
+
+
+def file_signature(path):
+    """(mtime_ns, size) of a file, or None when it does not exist"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def global_config_candidates():
+    """Global config files git would read, whether or not they exist yet"""
+    if os.environ.get("GIT_CONFIG_GLOBAL"):
+        return [os.environ["GIT_CONFIG_GLOBAL"]]
+    home = os.path.expanduser("~")
+    xdg = os.environ.get("XDG_CONFIG_HOME") or os.path.join(home, ".config")
+    return [os.path.join(home, ".gitconfig"), os.path.join(xdg, "git", "config")]
+
+
+def environment_key(git_path, origins):
+    """Everything that would make a cached probe stale"""
+    files = sorted(set(origins) | set(global_config_candidates()))
+    return {
+        "version": CACHE_VERSION,
+        "git": [git_path, file_signature(git_path)],
+        "files": {path: file_signature(path) for path in files},
+        "environ": {name: os.environ.get(name) for name in CONFIG_ENVIRONMENT},
+    }
+
+
+def parse_config_origins(output):
+    """Parse `git config --list --show-origin -z` into (config dict, origin files)"""
+    items = output.split("\0")
+    entries = []
+    origins = []
+    for origin, entry in zip(items[0::2], items[1::2]):
+        if origin.startswith("file:"):
+            path = origin[len("file:"):]
+            if path not in origins:
+                origins.append(path)
+        entries.append(entry)
+    return parse_config_list("\0".join(entries)), origins
+
+
+def summarize(config):
+    """The settings the app cares about, pulled out of a config dict"""
+    return {
+        "user_name": config.get("user.name", ""),
+        "user_email": config.get("user.email", ""),
+        "credential_helper": config.get("credential.helper", ""),
+        "default_branch": config.get("init.defaultbranch", ""),
+        # includeIf sections depend on the repository path, so this config is not the whole story
+        "conditional_includes": any(key.startswith("includeif.") for key in config),
+    }
+
+
+def probe_git(git_path):
+    """Spawn git to read its version and user-level config"""
+    neutral_dir = app_data_dir()
+    try:
+        version = subprocess.run([git_path, "--version"], check=True, capture_output=True, text=True,
+                                 creationflags=no_window_flags()).stdout.strip()
+        # Run outside any repository so only system and global settings are listed
+        listing = subprocess.run([git_path, "config", "--list", "--show-origin", "-z"],
+                                 cwd=neutral_dir, capture_output=True, text=True,
+                                 creationflags=no_window_flags()).stdout
+    except (subprocess.SubprocessError, OSError):
+        return None
+
+    config, origins = parse_config_origins(listing)
+    env = {"path": git_path, "version": version, "config": config, "origins": origins}
+    env.update(summarize(config))
+    return env
+
+
+def load_cached(git_path):
+    try:
+        with open(cache_path(), "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    env = cached.get("environment") or {}
+    if cached.get("key") != environment_key(git_path, env.get("origins", [])):
+        return None
+    return env
+
+
+def save_cached(env):
+    payload = {"key": environment_key(env["path"], env["origins"]), "environment": env}
+    try:
+        fd, temp_path = tempfile.mkstemp(dir=app_data_dir("cache"), prefix=".tmp-")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        os.replace(temp_path, cache_path())
+    except OSError as e:
+        print(f"Could not cache the git environment: {e}")
+
+
+def detect_git(refresh=False):
+    """The git environment, or None when git is not installed.
+
+    Returns a dict with path, version, config (system + global settings),
+    user_name, user_email, credential_helper and default_branch. Cached in
+    memory and on disk; refresh=True forces a new probe. Concurrent callers
+    wait for a probe already in progress instead of starting their own.
+    """
+    with _detect_lock:
+        if not refresh and "git" in _detected:
+            return _detected["git"]
+
+        git_path = find_git()
+        env = None
+        if git_path:
+            env = None if refresh else load_cached(git_path)
+            if env is None:
+                env = probe_git(git_path)
+                if env:
+                    save_cached(env)
+        _detected["git"] = env
+        return env
+
+
+def set_global_config(values):
+    """Write global config values that differ from the current ones.
+
+    Returns the number of git processes spawned (0 when nothing changed).
+    """
+    env = detect_git()
+    git_path = env["path"] if env else "git"
+    current = env["config"] if env else {}
+
+    spawned = 0
+    for key, value in values.items():
+        if current.get(key.lower()) == value:
+            continue
+        subprocess.run([git_path, "config", "--global", key, value],
+                       check=True, capture_output=True, text=True, creationflags=no_window_flags())
+        spawned += 1
+
+    if spawned and env:
+        with _detect_lock:
+            for key, value in values.items():
+                env["config"][key.lower()] = value
+            env.update(summarize(env["config"]))
+            # The global file may not have been an origin before this write
+            env["origins"] = sorted(set(env["origins"]) | set(global_config_candidates()))
+            save_cached(env)
+    return spawned
@@ -1,12 +1,47 @@
+import time
+
+# Taken before the remaining imports so the startup report includes them
+STARTUP_STARTED = time.perf_counter()
+
+import argparse
 import os
-import subprocess
 import sys
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
-from threading import Thread
+from threading import Thread, Event, current_thread, main_thread
 import json
 import shutil
 import platform
+import queue
+from collections import ChainMap
+
+from catalogue_import import apply_import, plan_import
+from gitignore_import import plan_collection
+from git_pipeline import GitSetupPipeline, load_development_types
+from git_env import detect_git
+from gitignore_matcher import format_preview
+from large_file_scan import describe_findings
+from log_view import LOG_MAX_LINES, LogView, setup_file_logging
+from readme_engine import render_readme
+from run_trace import save_run_trace
+from template_index import TemplateIndex
+from template_resolver import TemplateError, TemplateResolver, as_list, dependants, is_fragment, resolve_template, selectable_types
+from type_detector import compile_rules, detect_types
+from type_picker import TypePicker
+
+
+# How often (ms) the Tk main loop drains events posted by worker threads
+UI_TICK_MS = 50
+
+# Upper bound of events handled per tick so a chatty worker cannot starve the UI
+UI_MAX_EVENTS_PER_TICK = 2000
+
+# (phase, seconds since STARTUP_STARTED) recorded for --startup-report
+startup_marks = []
+
+
+def mark_startup(phase):
+    startup_marks.append((phase, time.perf_counter() - STARTUP_STARTED))
 
 
 class GitOneClickGUI:
@@ -22,31 +57,47 @@ class GitOneClickGUI:
         self.root.minsize(740, 700)
         self.root.maxsize(740, 700)  # Fixed size like your perfect adjustment
         
-        # Load development types
+        # Load development types (bodies are decoded lazily by the template store)
         self.dev_types = {}
         self.load_development_types()
+        mark_startup("templates loaded")
         
         # Variables
         self.folder_path = ""
         self.repo_url = tk.StringVar(value="")
+        self.mirror_urls = tk.StringVar(value="")  # Optional extra remotes, comma separated
         self.user_type = tk.StringVar(value="new_user")  # new_user or existing_user
         self.dev_type = tk.StringVar(value="basic")  # Will be populated from config
         self.git_name = tk.StringVar(value="")
         self.git_email = tk.StringVar(value="")
-        self.git_installed = False
+        self.git_installed = None  # None until the background probe reports
         
         # Store references to important UI elements
         self.dev_type_frame = None
-        self.dev_scrollable_frame = None
+        self.type_picker = None
+        self.type_index = None
+        self.detect_rules = None
+        
+        # Worker threads never touch widgets; they post events drained on the Tk thread
+        self.ui_events = queue.Queue()
+        
+        # Full, untrimmed log goes to a rotating file written on a background thread
+        try:
+            self.file_log, self.file_log_listener = setup_file_logging()
+        except OSError as e:
+            print(f"File logging disabled: {e}")
+            self.file_log, self.file_log_listener = None, None
         
         # Create GUI elements
         self.create_widgets()
+        self.root.after(UI_TICK_MS, self.drain_ui_events)
+        mark_startup("widgets created")
         
         # Auto-resize window based on content
         self.auto_resize_window()
         
-        # Check for Git installation
-        self.git_installed = self.check_git()
+        # Check for Git installation without holding up the first frame
+        self.start_git_detection()
     
     def setup_glassmorphism(self):
         """Setup glassmorphism effects and styling"""
@@ -71,7 +122,10 @@ class GitOneClickGUI:
         self.setup_custom_styles()
     
     def setup_custom_styles(self):
-        """Create beautiful glassmorphism-inspired TTK styles"""
+        """Create beautiful glassmorphism-inspired TTK styles (configured once, then reused)"""
+        if getattr(self, "style_colors", None):
+            return self.style_colors
+        
         style = ttk.Style()
         
         # Set theme base
@@ -179,6 +233,14 @@ class GitOneClickGUI:
         style.map('Glass.TRadiobutton',
                  background=[('active', colors['bg_secondary'])])
         
+        style.configure('Glass.TCheckbutton',
+                       background=colors['bg_glass'],
+                       foreground=colors['text_primary'],
+                       font=('Segoe UI', 9))
+        
+        style.map('Glass.TCheckbutton',
+                 background=[('active', colors['bg_secondary'])])
+        
         # Progress bar with Alice purple
         style.configure('Alice.Horizontal.TProgressbar',
                        background=colors['accent'],
@@ -193,6 +255,7 @@ class GitOneClickGUI:
                        troughcolor=colors['bg_primary'],
                        bordercolor=colors['border'])
         
+        self.style_colors = colors
         return colors  # Return colors for use in Text widgets
     
     def get_dev_type_emoji(self, dev_id):
@@ -213,57 +276,9 @@ class GitOneClickGUI:
 
     def load_development_types(self):
         """Load development types from the configuration file"""
-        try:
-            # Try to find the config file in the same directory as the script
-            config_path = self.resource_path("development_types.json")
-            
-            if os.path.exists(config_path):
-                with open(config_path, 'r', encoding='utf-8') as f:
-                    self.dev_types = json.load(f)
-                print(f"Loaded {len(self.dev_types)} development types from {config_path}")
-            else:
-                # Use default development types if config file doesn't exist
-                self.dev_types = {
-                    "basic": {
-                        "name": "Basic",
-                        "description": "Basic project structure with minimal ignores",
-                        "gitignore": [
-                            "# List of ignore folder and files",
-                            "/[Tt]emp/",
-                            "# List of ignore files",
-                            "*.exe",
-                            "*.txt"
-                        ],
-                        "readme_template": "# PROJECT TITLE\n\nSoftware Version: [Version]\n\n## Description\nThis software is used for..."
-                    },
-                    "unity": {
-                        "name": "Unity",
-                        "description": "Unity game development project",
-                        "gitignore": [
-                            "# Unity generated folders and files",
-                            "/[Ll]ibrary/",
-                            "/[Tt]emp/",
-                            "/[Ll]ogs/",
-                            "/[Uu]serSettings/",
-                            "/[Oo]bj/",
-                            "/[Bb]uild/",
-                            "/[Bb]uilds/"
-                        ],
-                        "readme_template": "# Unity Project\n\nUnity Version: [Your Unity Version]"
-                    }
-                }
-                print("Using default development types")
-        except Exception as e:
-            print(f"Error loading development types: {e}")
-            # Fallback to basic type if there's an error
-            self.dev_types = {
-                "basic": {
-                    "name": "Basic",
-                    "description": "Basic project structure",
-                    "gitignore": ["# Basic gitignore", "/[Tt]emp/", "*.exe"],
-                    "readme_template": "# Project\n\n## Description\nA basic project."
-                }
-            }
+        # Try to find the config file in the same directory as the script
+        config_path = self.resource_path("development_types.json")
+        self.dev_types = load_development_types(config_path)
 
     def resource_path(self, relative_path):
         """Get absolute path to resource, works for dev and for PyInstaller"""
@@ -393,6 +408,9 @@ class GitOneClickGUI:
         ttk.Label(repo_frame, text="🌐 GitHub Repository URL:", style="Accent.TLabel").pack(anchor=tk.W, pady=(0, 5))
         ttk.Entry(repo_frame, textvariable=self.repo_url, style="Glass.TEntry", font=('Segoe UI', 9)).pack(fill=tk.X, pady=(3, 0))
         
+        ttk.Label(repo_frame, text="🪞 Mirror URLs (optional, comma separated):", style="Glass.TLabel").pack(anchor=tk.W, pady=(6, 0))
+        ttk.Entry(repo_frame, textvariable=self.mirror_urls, style="Glass.TEntry", font=('Segoe UI', 9)).pack(fill=tk.X, pady=(3, 0))
+        
         # Development Type section with glassmorphism
         self.dev_type_frame = ttk.LabelFrame(content_frame, text="⚙️ Development Type", padding="15", style="Glass.TLabelframe")
         self.dev_type_frame.pack(fill=tk.X, pady=(0, 12))
@@ -410,10 +428,17 @@ class GitOneClickGUI:
         action_frame = ttk.Frame(content_frame, style="Glass.TFrame")
         action_frame.pack(fill=tk.X, pady=(15, 0))
         
-        # Beautiful primary connect button
-        connect_btn = ttk.Button(action_frame, text="🚀 Connect to GitHub 💫", 
+        # Beautiful primary connect button with a dry-run preview beside it
+        button_row = ttk.Frame(action_frame, style="Glass.TFrame")
+        button_row.pack(pady=(5, 15))
+        
+        preview_btn = ttk.Button(button_row, text="👁️ Preview Commit", 
+                               command=self.preview_commit, style="Glass.TButton")
+        preview_btn.pack(side=tk.LEFT, padx=(0, 10))
+        
+        connect_btn = ttk.Button(button_row, text="🚀 Connect to GitHub 💫", 
                                command=self.start_connection, style="Primary.TButton")
-        connect_btn.pack(pady=(5, 15))
+        connect_btn.pack(side=tk.LEFT)
         
         # Alice-themed progress bar
         self.progress_bar = ttk.Progressbar(action_frame, mode="determinate", style="Alice.Horizontal.TProgressbar")
@@ -438,6 +463,7 @@ class GitOneClickGUI:
                                font=('Consolas', 9), relief=tk.FLAT, borderwidth=0)
         self.log_text.pack(fill=tk.BOTH, expand=True, side=tk.LEFT)
         log_scrollbar.config(command=self.log_text.yview)
+        self.log_view = LogView(self.log_text, max_lines=LOG_MAX_LINES)
         
         # Beautiful status bar with Alice signature
         self.status_var = tk.StringVar(value="✨ Ready - Alice is here to help! ✨")
@@ -455,83 +481,51 @@ class GitOneClickGUI:
         self.root.after(100, lambda: main_canvas.configure(scrollregion=main_canvas.bbox("all")))
 
     def create_development_type_widgets(self):
-        """Create the development type selection widgets"""
-        # Clear existing dev type widgets
-        for widget in self.dev_type_frame.winfo_children():
-            if not isinstance(widget, ttk.Button) and not isinstance(widget, ttk.Frame):
-                widget.destroy()
-        
-        # Create beautiful development type layout with glassmorphism
-        if len(self.dev_types) <= 6:
-            # If 6 or fewer types, show them all without scrolling
-            for dev_id, dev_info in self.dev_types.items():
-                dev_row = ttk.Frame(self.dev_type_frame, style="Glass.TFrame")
-                dev_row.pack(fill=tk.X, pady=3)
-                
-                # Add appropriate emoji for each dev type
-                dev_emoji = self.get_dev_type_emoji(dev_id)
-                rb = ttk.Radiobutton(dev_row, text=f"{dev_emoji} {dev_info['name']}", 
-                                   variable=self.dev_type, value=dev_id, style="Glass.TRadiobutton")
-                rb.pack(side=tk.LEFT)
-                
-                if "description" in dev_info:
-                    desc_label = ttk.Label(dev_row, text=f"• {dev_info['description']}", 
-                                         style="Glass.TLabel", font=("Segoe UI", 8))
-                    desc_label.pack(side=tk.LEFT, padx=(10, 0))
-        else:
-            # If more than 6 types, use a beautiful scrollable frame with glassmorphism
-            colors = self.setup_custom_styles()
-            dev_canvas = tk.Canvas(self.dev_type_frame, highlightthickness=0, height=150, 
-                                 bg=colors['bg_glass'])
-            dev_canvas.pack(fill=tk.X, pady=(0, 8))
-            
-            dev_scrollbar = ttk.Scrollbar(self.dev_type_frame, orient="vertical", command=dev_canvas.yview, 
-                                        style="Glass.Vertical.TScrollbar")
-            dev_scrollbar.pack(side=tk.RIGHT, fill=tk.Y, before=dev_canvas)
-            
-            dev_canvas.configure(yscrollcommand=dev_scrollbar.set)
-            
-            self.dev_scrollable_frame = ttk.Frame(dev_canvas, style="Glass.TFrame")
-            canvas_window = dev_canvas.create_window((0, 0), window=self.dev_scrollable_frame, anchor="nw")
-            
-            # Create beautiful radio buttons with glassmorphism for each development type
-            for dev_id, dev_info in self.dev_types.items():
-                dev_row = ttk.Frame(self.dev_scrollable_frame, style="Glass.TFrame")
-                dev_row.pack(fill=tk.X, pady=3)
-                
-                # Add appropriate emoji for each dev type
-                dev_emoji = self.get_dev_type_emoji(dev_id)
-                rb = ttk.Radiobutton(dev_row, text=f"{dev_emoji} {dev_info['name']}", 
-                                   variable=self.dev_type, value=dev_id, style="Glass.TRadiobutton")
-                rb.pack(side=tk.LEFT)
-                
-                if "description" in dev_info:
-                    desc_label = ttk.Label(dev_row, text=f"• {dev_info['description']}", 
-                                         style="Glass.TLabel", font=("Segoe UI", 8))
-                    desc_label.pack(side=tk.LEFT, padx=(10, 0))
-            
-            # Configure scroll region
-            def configure_dev_scroll(event=None):
-                dev_canvas.configure(scrollregion=dev_canvas.bbox("all"))
-                canvas_width = dev_canvas.winfo_width()
-                if canvas_width > 1:
-                    dev_canvas.itemconfig(canvas_window, width=canvas_width)
-            
-            self.dev_scrollable_frame.bind('<Configure>', configure_dev_scroll)
-            dev_canvas.bind('<Configure>', configure_dev_scroll)
-            self.root.after(100, configure_dev_scroll)
-        
-        # Set default development type
-        if self.dev_types:
-            if self.dev_type.get() not in self.dev_types:
-                self.dev_type.set(next(iter(self.dev_types)))
+        """Create the development type picker (a fixed pool of rows, whatever the catalogue size)"""
+        self.type_picker = TypePicker(self.dev_type_frame, self.dev_types, self.dev_type, self.search_types,
+                                      emoji_for=self.get_dev_type_emoji,
+                                      selectable=lambda type_id: not is_fragment(self.dev_types, type_id))
+        self.type_picker.pack(fill=tk.X)
+        self.ensure_dev_type_selected()
+
+    def ensure_dev_type_selected(self):
+        """Fall back to the first development type when the selected one no longer exists"""
+        current = self.dev_type.get()
+        if current not in self.dev_types or is_fragment(self.dev_types, current):
+            choices = selectable_types(self.dev_types)
+            if choices:
+                self.dev_type.set(choices[0])
 
-    def refresh_development_types_ui(self):
-        """Refresh the development types section in the main UI"""
-        if self.dev_type_frame and self.dev_type_frame.winfo_exists():
-            self.create_development_type_widgets()
-            # Auto-resize window after refresh
-            self.root.after(100, self.auto_resize_window)
+    def search_types(self, query):
+        """Ranked type ids for a search query; the index is built on first use"""
+        if self.type_index is None:
+            self.type_index = TemplateIndex(self.dev_types, resolve=lambda type_id: resolve_template(self.dev_types, type_id))
+        return self.type_index.search(query)
+
+    def refresh_development_types_ui(self, type_id=None, removed=False):
+        """Update the search index and picker for one changed type, or reload both when type_id is None"""
+        self.detect_rules = None
+        if self.type_index is not None:
+            if type_id is None or not removed and is_fragment(self.dev_types, type_id):
+                # Fragments feed other types' entries, so rebuild the index on next use
+                self.type_index = None
+            else:
+                if removed:
+                    self.type_index.remove(type_id)
+                else:
+                    self.type_index.update(type_id, self.dev_types[type_id])
+                # Types that extend this one are indexed with the .gitignore lines they inherit
+                for child_id in dependants(self.dev_types, type_id):
+                    self.type_index.update(child_id, self.dev_types[child_id])
+        
+        if self.type_picker and self.type_picker.winfo_exists():
+            if type_id is None:
+                self.type_picker.reload()
+            elif removed:
+                self.type_picker.remove(type_id)
+            else:
+                self.type_picker.upsert(type_id)
+            self.ensure_dev_type_selected()
 
     def open_manage_types(self):
         """Open dialog to manage development types with beautiful glassmorphism"""
@@ -562,6 +556,14 @@ class GitOneClickGUI:
         types_frame = ttk.LabelFrame(manage_window, text="📋 Current Development Types", padding="15", style="Glass.TLabelframe")
         types_frame.pack(fill=tk.BOTH, expand=True, padx=15, pady=15)
         
+        # Search box filtering the list below
+        search_frame = ttk.Frame(types_frame, style="Glass.TFrame")
+        search_frame.pack(fill=tk.X, pady=(0, 8))
+        
+        ttk.Label(search_frame, text="🔍 Search:", style="Accent.TLabel").pack(side=tk.LEFT)
+        search_var = tk.StringVar(value="")
+        ttk.Entry(search_frame, textvariable=search_var, style="Glass.TEntry").pack(side=tk.LEFT, padx=8, fill=tk.X, expand=True)
+        
         # Create a listbox to display types with Alice styling
         listbox_frame = ttk.Frame(types_frame, style="Glass.TFrame")
         listbox_frame.pack(fill=tk.BOTH, expand=True)
@@ -576,13 +578,18 @@ class GitOneClickGUI:
         listbox.pack(fill=tk.BOTH, expand=True, side=tk.LEFT)
         scrollbar.config(command=listbox.yview)
         
-        # Populate listbox with types
-        def refresh_listbox():
+        # Populate listbox with types; shown_ids[i] is the type id of row i
+        shown_ids = []
+        
+        def refresh_listbox(*args):
+            query = search_var.get().strip()
+            shown_ids[:] = self.search_types(query) if query else list(self.dev_types)
             listbox.delete(0, tk.END)
-            for dev_id, dev_info in self.dev_types.items():
-                listbox.insert(tk.END, f"{dev_info['name']} ({dev_id})")
+            listbox.insert(tk.END, *[f"{'🧩 ' if is_fragment(self.dev_types, dev_id) else ''}"
+                                     f"{self.dev_types[dev_id].get('name', dev_id)} ({dev_id})" for dev_id in shown_ids])
         
         refresh_listbox()
+        search_var.trace_add("write", refresh_listbox)
         
         # Buttons for adding, editing, and removing types with glassmorphism
         btn_frame = ttk.Frame(types_frame, style="Glass.TFrame")
@@ -595,8 +602,7 @@ class GitOneClickGUI:
         def get_selected_type_id():
             selection = listbox.curselection()
             if selection:
-                selected_text = listbox.get(selection[0])
-                return selected_text.split(" (")[-1][:-1]
+                return shown_ids[selection[0]]
             return None
         
         ttk.Button(btn_frame, text="✏️ Edit Selected", 
@@ -615,6 +621,10 @@ class GitOneClickGUI:
                 command=lambda: self.import_types(refresh_listbox), 
                 style="Glass.TButton").pack(side=tk.LEFT, padx=6)
         
+        ttk.Button(io_frame, text="📂 Import .gitignore Collection", 
+                command=lambda: self.import_gitignore_collection(refresh_listbox), 
+                style="Glass.TButton").pack(side=tk.LEFT, padx=6)
+        
         ttk.Button(io_frame, text="📤 Export All Types", 
                 command=self.export_types, 
                 style="Glass.TButton").pack(side=tk.LEFT, padx=6)
@@ -630,7 +640,7 @@ class GitOneClickGUI:
         
         dialog = tk.Toplevel(parent)
         dialog.title(f"{'➕ Add' if is_new else '✏️ Edit'} Development Type - Alice Edition")
-        dialog.geometry("620x720")
+        dialog.geometry("620x790")
         dialog.resizable(True, True)
         dialog.transient(parent)
         dialog.grab_set()
@@ -648,6 +658,10 @@ class GitOneClickGUI:
         type_id_var = tk.StringVar(value=type_id if not is_new else "")
         type_name_var = tk.StringVar(value=self.dev_types.get(type_id, {}).get("name", "") if not is_new else "")
         type_desc_var = tk.StringVar(value=self.dev_types.get(type_id, {}).get("description", "") if not is_new else "")
+        existing = self.dev_types.get(type_id, {}) if not is_new else {}
+        extends_var = tk.StringVar(value=", ".join(as_list(existing.get("extends"))))
+        include_var = tk.StringVar(value=", ".join(as_list(existing.get("include"))))
+        abstract_var = tk.BooleanVar(value=bool(existing.get("abstract")))
         
         # Main frame with glassmorphism
         main_frame = ttk.Frame(dialog, padding="15", style="Glass.TFrame")
@@ -679,6 +693,18 @@ class GitOneClickGUI:
         ttk.Label(desc_frame, text="📄 Description:", style="Accent.TLabel").pack(side=tk.LEFT)
         ttk.Entry(desc_frame, textvariable=type_desc_var, style="Glass.TEntry").pack(side=tk.LEFT, padx=8, fill=tk.X, expand=True)
         
+        # Composition: parent types and shared fragments (comma separated ids)
+        compose_frame = ttk.Frame(main_frame, style="Glass.TFrame")
+        compose_frame.pack(fill=tk.X, pady=8)
+        
+        ttk.Label(compose_frame, text="⬆️ Extends:", style="Accent.TLabel").pack(side=tk.LEFT)
+        ttk.Entry(compose_frame, textvariable=extends_var, style="Glass.TEntry", width=16).pack(side=tk.LEFT, padx=8)
+        ttk.Label(compose_frame, text="🧩 Includes:", style="Accent.TLabel").pack(side=tk.LEFT)
+        ttk.Entry(compose_frame, textvariable=include_var, style="Glass.TEntry").pack(side=tk.LEFT, padx=8, fill=tk.X, expand=True)
+        
+        ttk.Checkbutton(main_frame, text="Fragment only (used by other types, hidden from the type list)",
+                       variable=abstract_var, style="Glass.TCheckbutton").pack(anchor=tk.W)
+        
         # .gitignore content with glassmorphism
         gitignore_frame = ttk.LabelFrame(main_frame, text="📝 .gitignore Content", padding="10", style="Glass.TLabelframe")
         gitignore_frame.pack(fill=tk.BOTH, expand=True, pady=8)
@@ -732,10 +758,15 @@ class GitOneClickGUI:
                     type_desc_var.get(), 
                     gitignore_text.get("1.0", tk.END), 
                     readme_text.get("1.0", tk.END),
-                    refresh_callback
+                    refresh_callback,
+                    composition={
+                        "extends": extends_var.get(),
+                        "include": include_var.get(),
+                        "abstract": abstract_var.get(),
+                    }
                 ), style="Primary.TButton").pack(side=tk.RIGHT, padx=8)
 
-    def save_type(self, dialog, type_id, name, description, gitignore, readme, refresh_callback=None):
+    def save_type(self, dialog, type_id, name, description, gitignore, readme, refresh_callback=None, composition=None):
         """Save a development type to the configuration"""
         if not type_id:
             messagebox.showwarning("Invalid Input", "Type ID is required.")
@@ -748,24 +779,46 @@ class GitOneClickGUI:
         # Process gitignore content
         gitignore_lines = [line for line in gitignore.splitlines() if line.strip()]
         
-        # Save to configuration
-        self.dev_types[type_id] = {
+        info = {
             "name": name,
             "description": description,
             "gitignore": gitignore_lines,
             "readme_template": readme.strip()
         }
+        # Keep settings this dialog does not edit, such as "detect" rules
+        for key, value in (self.dev_types.get(type_id) or {}).items():
+            if key not in info and key not in ("extends", "include", "abstract"):
+                info[key] = value
+        
+        # Parents and fragments are comma separated type ids; check they resolve before saving
+        composition = composition or {}
+        for key in ("extends", "include"):
+            ids = [part.strip() for part in composition.get(key, "").split(",") if part.strip()]
+            if ids:
+                info[key] = ids[0] if key == "extends" and len(ids) == 1 else ids
+        if composition.get("abstract"):
+            info["abstract"] = True
+        try:
+            candidate = TemplateResolver(ChainMap({type_id: info}, self.dev_types))
+            # A dry render catches README syntax errors and includes of unknown templates
+            render_readme(candidate.resolve(type_id)["readme_template"], {},
+                          loader=lambda include_id: candidate.resolve(include_id)["readme_template"])
+        except TemplateError as e:
+            messagebox.showwarning("Invalid Template", str(e))
+            return
         
-        # Save to file
-        self.save_development_types()
+        # Save to configuration (journalled to disk immediately)
+        saved = self.persist_types(lambda: self.dev_types.update({type_id: info}))
+        if not saved:
+            return
         
         # Close dialog
         dialog.destroy()
         
-        # Refresh UI components
+        # Refresh UI components (index first, so the manage list searches the new data)
+        self.refresh_development_types_ui(type_id)
         if refresh_callback:
             refresh_callback()
-        self.refresh_development_types_ui()
 
     def remove_type(self, type_id, refresh_callback=None):
         """Remove a development type from the configuration"""
@@ -777,18 +830,16 @@ class GitOneClickGUI:
         if messagebox.askyesno("Confirm Deletion", f"Are you sure you want to remove the '{self.dev_types.get(type_id, {}).get('name', type_id)}' development type?"):
             # Remove from configuration
             if type_id in self.dev_types:
-                del self.dev_types[type_id]
-                
-                # Save to file
-                self.save_development_types()
+                if not self.persist_types(lambda: self.dev_types.pop(type_id)):
+                    return
                 
-                # Refresh UI components
+                # Refresh UI components (index first, so the manage list searches the new data)
+                self.refresh_development_types_ui(type_id, removed=True)
                 if refresh_callback:
                     refresh_callback()
-                self.refresh_development_types_ui()
 
     def import_types(self, refresh_callback=None):
-        """Import development types from a JSON file"""
+        """Import development types from a JSON file, applying only what changed"""
         file_path = filedialog.askopenfilename(
             title="Import Development Types",
             filetypes=[("JSON files", "*.json"), ("All Files", "*.*")]
@@ -796,35 +847,70 @@ class GitOneClickGUI:
         
         if file_path:
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    imported_types = json.load(f)
+                # Ask for import mode
+                replace = not messagebox.askyesno("Import Mode", "Do you want to merge with existing types? Click 'Yes' to merge, or 'No' to replace all existing types.")
                 
-                # Validate format
-                if not isinstance(imported_types, dict):
-                    messagebox.showerror("Invalid Format", "The selected file does not contain valid development types.")
+                # Validate, deduplicate and diff against the current types before anything is written
+                try:
+                    plan = plan_import(file_path, self.dev_types, replace=replace)
+                except ValueError as e:
+                    messagebox.showerror("Invalid Format", f"The selected file does not contain valid development types: {str(e)}")
                     return
                 
-                # Ask for import mode
-                if messagebox.askyesno("Import Mode", "Do you want to merge with existing types? Click 'Yes' to merge, or 'No' to replace all existing types."):
-                    # Merge with existing types
-                    self.dev_types.update(imported_types)
-                else:
-                    # Replace all existing types
-                    self.dev_types = imported_types
+                if not plan.updates and not plan.removed:
+                    messagebox.showinfo("Nothing to Import", f"The development types are already up to date.\n\n{plan.summary(limit=10)}")
+                    return
+                if not messagebox.askyesno("Import Preview", f"{plan.summary(limit=10)}\n\nApply these changes?"):
+                    return
                 
-                # Save to file
-                self.save_development_types()
+                if not self.persist_types(lambda: apply_import(self.dev_types, plan)):
+                    return
                 
-                # Refresh UI components
+                # Refresh UI components (index first, so the manage list searches the new data)
+                self.refresh_development_types_ui()
                 if refresh_callback:
                     refresh_callback()
-                self.refresh_development_types_ui()
                 
-                messagebox.showinfo("Import Successful", f"Successfully imported {len(imported_types)} development types.")
+                messagebox.showinfo("Import Successful", f"Imported development types: {plan.summary(limit=10)}")
             
             except Exception as e:
                 messagebox.showerror("Import Error", f"An error occurred during import: {str(e)}")
 
+    def import_gitignore_collection(self, refresh_callback=None):
+        """Import a checkout of the github/gitignore collection, re-reading only changed files"""
+        folder = filedialog.askdirectory(title="Select a checkout of the .gitignore template collection")
+        if not folder:
+            return
+        try:
+            try:
+                result = plan_collection(folder, self.dev_types)
+            except ValueError as e:
+                messagebox.showerror("Invalid Collection", str(e))
+                return
+            
+            plan = result.plan
+            details = f"{len(result.files)} templates, {result.read} new or changed since the last import\n\n{plan.summary(limit=10)}"
+            if not plan.updates and not plan.removed:
+                result.apply(self.dev_types)
+                messagebox.showinfo("Nothing to Import", f"The imported templates are already up to date.\n\n{details}")
+                return
+            if not messagebox.askyesno("Import Preview", f"{details}\n\nApply these changes?"):
+                return
+            
+            if not self.persist_types(lambda: result.apply(self.dev_types)):
+                return
+            
+            self.refresh_development_types_ui()
+            if refresh_callback:
+                refresh_callback()
+            
+            messagebox.showinfo("Import Successful",
+                                f"{plan.summary(limit=10)}\n\nFragments from Global/ (e.g. _global-macos) can be added "
+                                f"to any type under \"include\" in its edit dialog.")
+        
+        except Exception as e:
+            messagebox.showerror("Import Error", f"An error occurred during import: {str(e)}")
+
     def export_types(self):
         """Export all development types to a JSON file"""
         file_path = filedialog.asksaveasfilename(
@@ -836,29 +922,23 @@ class GitOneClickGUI:
         if file_path:
             try:
                 with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(self.dev_types, f, indent=2, ensure_ascii=False)
+                    json.dump(self.dev_types.to_dict(), f, indent=2, ensure_ascii=False)
                 
                 messagebox.showinfo("Export Successful", f"Successfully exported {len(self.dev_types)} development types to {file_path}.")
             
             except Exception as e:
                 messagebox.showerror("Export Error", f"An error occurred during export: {str(e)}")
 
-    def save_development_types(self):
-        """Save development types to the configuration file"""
+    def persist_types(self, change):
+        """Apply a change to the template store, which writes only the changed types to disk"""
         try:
-            config_path = self.resource_path("development_types.json")
-            
-            # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(config_path), exist_ok=True)
-            
-            with open(config_path, 'w', encoding='utf-8') as f:
-                json.dump(self.dev_types, f, indent=2, ensure_ascii=False)
-            
-            print(f"Saved {len(self.dev_types)} development types to {config_path}")
+            change()
+            return True
         
         except Exception as e:
             print(f"Error saving development types: {e}")
             messagebox.showwarning("Save Error", f"Could not save development types: {str(e)}")
+            return False
 
     def toggle_user_fields(self):
         """Show or hide user info fields based on user type"""
@@ -867,18 +947,29 @@ class GitOneClickGUI:
         else:
             self.user_info_frame.pack_forget()
 
-    def check_git(self):
-        """Check if Git is installed"""
-        try:
-            result = subprocess.run(["git", "--version"], check=True, capture_output=True, text=True)
-            version_output = result.stdout
-            
-            self.log(f"Git detected: {version_output.strip()}")
-            return True
-                
-        except (subprocess.SubprocessError, FileNotFoundError):
+    def start_git_detection(self):
+        """Look for git on a worker thread; the result is reported back on the Tk thread"""
+        def detect():
+            info = detect_git()
+            self.call_in_ui(self.report_git, info)
+        
+        Thread(target=detect, daemon=True).start()
+
+    def report_git(self, info):
+        """Record a detection result, logging it or showing the install dialog"""
+        self.git_installed = info is not None
+        mark_startup("git detected")
+        if info:
+            self.log(f"Git detected: {info['version']} ({info['path']})")
+            if info["user_name"] and info["user_email"]:
+                self.log(f"Global identity: {info['user_name']} <{info['user_email']}>")
+        else:
             self.show_git_missing_dialog()
-            return False
+        return self.git_installed
+
+    def check_git(self):
+        """Check again whether Git is installed, bypassing the cached result"""
+        return self.report_git(detect_git(refresh=True))
 
     def show_git_missing_dialog(self):
         """Show dialog when Git is not installed"""
@@ -956,17 +1047,107 @@ class GitOneClickGUI:
             self.folder_path = directory
             self.folder_label.config(text=directory)
             self.log(f"Project folder set to: {directory}")
+            self.start_type_detection(directory)
+
+    def start_type_detection(self, directory):
+        """Guess the development type from the folder's files and preselect it"""
+        if self.detect_rules is None:
+            self.detect_rules = compile_rules(self.dev_types)
+        rules = self.detect_rules
+        
+        def detect():
+            candidates = detect_types(directory, self.dev_types, rules)
+            self.call_in_ui(self.report_detected_type, directory, candidates)
+        
+        Thread(target=detect, daemon=True).start()
+
+    def report_detected_type(self, directory, candidates):
+        if directory != self.folder_path:
+            return  # Another folder was chosen meanwhile
+        # Types deleted or renamed while the detection ran are no longer offered
+        candidates = [candidate for candidate in candidates if candidate.type_id in self.dev_types]
+        if not candidates:
+            self.log(f"Could not recognise the project type; keeping {self.dev_type.get()}")
+            return
+        
+        best = candidates[0]
+        name = (self.dev_types.get(best.type_id) or {}).get("name", best.type_id)
+        self.dev_type.set(best.type_id)
+        if self.type_picker:
+            self.type_picker.scroll_to(best.type_id)
+        self.log(f"Detected {name} project ({best.confidence:.0%} confidence: {', '.join(best.reasons)})")
+        if len(candidates) > 1:
+            others = ", ".join(f"{c.type_id} {c.confidence:.0%}" for c in candidates[1:4])
+            self.log(f"Other candidates: {others}")
 
     def log(self, message):
-        """Add message to log area"""
-        self.log_text.insert(tk.END, message + "\n")
-        self.log_text.see(tk.END)
-        print(message)  # Also print to console for debugging
+        """Add message to log area (safe to call from any thread)"""
+        self.ui_events.put(("log", message))
+        if self.file_log:
+            self.file_log.info(message)
 
     def update_status(self, message):
-        """Update status bar message"""
-        self.status_var.set(message)
-        self.root.update_idletasks()
+        """Update status bar message (safe to call from any thread)"""
+        self.ui_events.put(("status", message))
+
+    def call_in_ui(self, func, *args, wait=False, **kwargs):
+        """Run func on the Tk thread; with wait=True block the worker until it returns"""
+        if current_thread() is main_thread():
+            return func(*args, **kwargs)
+        
+        waiter = {"done": Event(), "result": None, "error": None} if wait else None
+        self.ui_events.put(("call", (func, args, kwargs, waiter)))
+        if waiter:
+            waiter["done"].wait()
+            if waiter["error"]:
+                raise waiter["error"]
+            return waiter["result"]
+
+    def drain_ui_events(self):
+        """Apply queued worker events in one batch per tick"""
+        log_lines = []
+        status = None
+        progress = None
+        calls = []
+        
+        try:
+            for _ in range(UI_MAX_EVENTS_PER_TICK):
+                kind, payload = self.ui_events.get_nowait()
+                if kind == "log":
+                    log_lines.append(payload)
+                elif kind == "status":
+                    status = payload
+                elif kind == "progress":
+                    progress = payload
+                elif kind == "call":
+                    calls.append(payload)
+        except queue.Empty:
+            pass
+        
+        # Only the latest status and progress matter; log lines go in with one insert
+        if log_lines:
+            self.log_view.append(log_lines)
+            self.log_view.flush()
+        if status is not None:
+            self.status_var.set(status)
+        if progress is not None:
+            self.progress_bar["value"] = progress
+        
+        for func, args, kwargs, waiter in calls:
+            try:
+                result = func(*args, **kwargs)
+                if waiter:
+                    waiter["result"] = result
+            except Exception as e:
+                if waiter:
+                    waiter["error"] = e
+                else:
+                    print(f"UI callback failed: {e}")
+            finally:
+                if waiter:
+                    waiter["done"].set()
+        
+        self.root.after(UI_TICK_MS, self.drain_ui_events)
 
     def validate_inputs(self):
         """Validate user inputs before connecting"""
@@ -986,6 +1167,10 @@ class GitOneClickGUI:
                 messagebox.showwarning("Missing Information", "Please enter your Git email.")
                 return False
         
+        if self.git_installed is None:
+            # Connect was clicked before the background probe reported; wait for it
+            self.git_installed = detect_git() is not None
+        
         if not self.git_installed:
             result = messagebox.askokcancel(
                 "Git Not Detected", 
@@ -996,6 +1181,31 @@ class GitOneClickGUI:
         
         return True
 
+    def preview_commit(self):
+        """Show what the selected template would commit and ignore in the chosen folder"""
+        if not self.folder_path:
+            messagebox.showwarning("No Folder", "Please select a project folder.")
+            return
+        
+        pipeline = GitSetupPipeline(
+            self.folder_path,
+            self.repo_url.get(),
+            self.dev_type.get(),
+            self.dev_types,
+            log_callback=self.log
+        )
+        
+        def run_preview():
+            try:
+                self.log(f"Previewing commit for {self.dev_type.get()} development type...")
+                summary = pipeline.preview_commit()
+                self.call_in_ui(messagebox.showinfo, "Commit Preview", "\n\n".join(format_preview(summary)))
+            except Exception as e:
+                self.log(f"ERROR: {str(e)}")
+                self.call_in_ui(messagebox.showerror, "Preview Error", f"Could not preview the commit: {str(e)}")
+        
+        Thread(target=run_preview, daemon=True).start()
+
     def start_connection(self):
         """Start the GitHub connection process"""
         if not self.validate_inputs():
@@ -1017,153 +1227,139 @@ class GitOneClickGUI:
 
     def perform_connection(self):
         """Perform the GitHub connection process"""
+        pipeline = None
         try:
-            self.log("Starting GitHub connection process...")
-            self.update_status("Connecting...")
-            
-            # Step 1: Create appropriate .gitignore and README based on development type
-            self.progress_bar["value"] = 10
-            self.create_git_files()
-            
-            # Step 2: Initialize Git repository
-            self.progress_bar["value"] = 30
-            self.initialize_git()
-            
-            # Step 3: Configure Git (for new users)
-            self.progress_bar["value"] = 50
-            if self.user_type.get() == "new_user":
-                self.configure_git()
-            
-            # Step 4: Add and commit files
-            self.progress_bar["value"] = 70
-            self.commit_files()
-            
-            # Step 5: Connect to GitHub and push
-            self.progress_bar["value"] = 90
-            self.push_to_github()
-            
-            # Complete
-            self.progress_bar["value"] = 100
-            self.update_status("Connection completed successfully.")
-            messagebox.showinfo("Success", "GitHub repository setup completed successfully!")
+            pipeline = GitSetupPipeline(
+                self.folder_path,
+                self.repo_url.get(),
+                self.dev_type.get(),
+                self.dev_types,
+                git_name=self.git_name.get(),
+                git_email=self.git_email.get(),
+                configure_user=self.user_type.get() == "new_user",
+                log_callback=self.log,
+                progress_callback=self.update_progress,
+                large_file_action=self.ask_large_file_action,
+                mirrors=[url.strip() for url in self.mirror_urls.get().split(",") if url.strip()]
+            )
+            pipeline.run()
+            self.call_in_ui(messagebox.showinfo, "Success", "GitHub repository setup completed successfully!")
             
         except Exception as e:
             self.log(f"ERROR: {str(e)}")
-            messagebox.showerror("Error", f"An error occurred during the connection process: {str(e)}")
+            self.call_in_ui(messagebox.showerror, "Error", f"An error occurred during the connection process: {str(e)}")
             self.update_status("Connection failed.")
         
         finally:
-            # Re-enable UI elements
-            self.root.config(cursor="")
-            for widget in self.root.winfo_children():
-                if isinstance(widget, ttk.Button):
-                    widget.config(state=tk.NORMAL)
-
-    def create_git_files(self):
-        """Create .gitignore and README.md based on selected development type"""
-        self.log(f"Creating Git files for {self.dev_type.get()} development type...")
-        
-        # Change to the project directory
-        os.chdir(self.folder_path)
-        
-        # Get selected development type
-        dev_type_id = self.dev_type.get()
-        dev_type = self.dev_types.get(dev_type_id, {})
-        
-        if not dev_type:
-            raise Exception(f"Development type '{dev_type_id}' not found in configuration.")
-        
-        # Create .gitignore based on development type
-        gitignore_content = "\n".join(dev_type.get("gitignore", []))
-        with open(".gitignore", "w") as f:
-            f.write(gitignore_content)
-        
-        # Create README.md based on development type
-        readme_content = dev_type.get("readme_template", "# Project\n\n## Description\nProject description.")
-        with open("README.md", "w") as f:
-            f.write(readme_content)
-        
-        self.log(f"Created .gitignore and README.md files for {dev_type.get('name', dev_type_id)} development")
+            if pipeline is not None:
+                self.save_trace(pipeline.trace)
+            self.call_in_ui(self.finish_connection)
 
-    def initialize_git(self):
-        """Initialize Git repository"""
-        self.log("Initializing Git repository...")
-        
-        # Initialize git repository
-        subprocess.run(["git", "init"], check=True, capture_output=True, text=True)
-        self.log("Git repository initialized")
-
-    def configure_git(self):
-        """Configure Git for new users"""
-        self.log("Configuring Git user settings...")
-        
-        # Set user name
-        subprocess.run(["git", "config", "--global", "user.name", self.git_name.get()], 
-                       check=True, capture_output=True, text=True)
-        
-        # Set user email
-        subprocess.run(["git", "config", "--global", "user.email", self.git_email.get()], 
-                       check=True, capture_output=True, text=True)
-        
-        self.log(f"Git configured with username: {self.git_name.get()} and email: {self.git_email.get()}")
-
-    def commit_files(self):
-        """Add and commit files to the repository"""
-        self.log("Adding files to repository...")
-        
-        # Remove cached files to respect new .gitignore
+    def save_trace(self, trace):
+        """Keep the run's step timings for chrome://tracing or Perfetto"""
         try:
-            subprocess.run(["git", "rm", "-r", "--cached", "."], 
-                        check=True, capture_output=True, text=True)
-        except subprocess.CalledProcessError:
-            # This might fail if no files were previously tracked, which is fine
-            pass
-        
-        # Add all files respecting .gitignore
-        subprocess.run(["git", "add", "."], check=True, capture_output=True, text=True)
-        
-        # Initial commit
-        subprocess.run(["git", "commit", "-m", "Initial commit"], 
-                     check=True, capture_output=True, text=True)
-        
-        # Create main branch
-        subprocess.run(["git", "branch", "-M", "main"], 
-                     check=True, capture_output=True, text=True)
-        
-        self.log("Files committed to repository")
+            self.log(f"Trace saved to {save_run_trace(trace)}")
+        except OSError as e:
+            self.log(f"Could not save the run trace: {e}")
 
-    def push_to_github(self):
-        """Connect to GitHub repository and push"""
-        self.log("Connecting to GitHub repository...")
-        
-        # Add remote origin
-        subprocess.run(["git", "remote", "add", "origin", self.repo_url.get()], 
-                     check=True, capture_output=True, text=True)
-        
-        try:
-            # Push to GitHub
-            self.log("Pushing to GitHub (this may take a moment)...")
-            result = subprocess.run(["git", "push", "-u", "origin", "main"], 
-                                 check=True, capture_output=True, text=True)
+    def finish_connection(self):
+        """Re-enable UI elements once the worker is done"""
+        self.root.config(cursor="")
+        for widget in self.root.winfo_children():
+            if isinstance(widget, ttk.Button):
+                widget.config(state=tk.NORMAL)
+
+    def ask_large_file_action(self, findings):
+        """Ask how to handle large files; called from the worker thread, shown on the Tk thread"""
+        answer = {"action": "abort"}
+        answered = Event()
+        
+        def show_dialog():
+            dialog = tk.Toplevel(self.root)
+            dialog.title("Large Files Found")
+            dialog.resizable(False, False)
+            dialog.transient(self.root)
+            dialog.grab_set()
             
-            self.log("Successfully pushed to GitHub repository")
-            self.log(f"Output: {result.stdout}")
+            colors = self.setup_custom_styles()
+            dialog.configure(bg=colors['bg_primary'])
             
-        except subprocess.CalledProcessError as e:
-            error_output = e.stderr if e.stderr else "No detailed error information available"
-            self.log(f"Error during push: {error_output}")
+            frame = ttk.Frame(dialog, padding="15", style="Glass.TFrame")
+            frame.pack(fill=tk.BOTH, expand=True)
             
-            # Check for common errors
-            if "Authentication failed" in error_output:
-                self.log("HINT: Authentication failed. Make sure you have the correct permissions and credentials.")
-                self.log("For first-time users, you might need to set up a Personal Access Token (PAT) in GitHub.")
-                
-                raise Exception("GitHub authentication failed. Check credentials and permissions.")
-            else:
-                raise Exception(f"Failed to push to GitHub: {error_output}")
+            blocking = any(finding["blocking"] for finding in findings)
+            message = "These files are very large and would slow down or break the push:\n\n"
+            message += "\n".join(describe_findings(findings))
+            ttk.Label(frame, text=message, style="Glass.TLabel", wraplength=520, justify=tk.LEFT).pack(anchor=tk.W, pady=(0, 12))
+            
+            def choose(action):
+                answer["action"] = action
+                dialog.destroy()
+            
+            btn_frame = ttk.Frame(frame, style="Glass.TFrame")
+            btn_frame.pack(fill=tk.X)
+            ttk.Button(btn_frame, text="🙈 Add to .gitignore", command=lambda: choose("ignore"), 
+                      style="Glass.TButton").pack(side=tk.LEFT, padx=4)
+            ttk.Button(btn_frame, text="📦 Use Git LFS", command=lambda: choose("lfs"), 
+                      style="Glass.TButton").pack(side=tk.LEFT, padx=4)
+            continue_btn = ttk.Button(btn_frame, text="➡️ Commit Anyway", command=lambda: choose("continue"), 
+                                    style="Glass.TButton")
+            continue_btn.pack(side=tk.LEFT, padx=4)
+            if blocking:
+                continue_btn.config(state=tk.DISABLED)
+            ttk.Button(btn_frame, text="❌ Stop", command=lambda: choose("abort"), 
+                      style="Glass.TButton").pack(side=tk.LEFT, padx=4)
+            
+            dialog.protocol("WM_DELETE_WINDOW", lambda: choose("abort"))
+            dialog.bind("<Destroy>", lambda e: answered.set() if e.widget is dialog else None)
+        
+        self.call_in_ui(show_dialog)
+        answered.wait()
+        return answer["action"]
+
+    def update_progress(self, value, status=None):
+        """Progress callback used by the setup pipeline (runs on the worker thread)"""
+        self.ui_events.put(("progress", value))
+        if status:
+            self.update_status(status)
+
+
+def write_startup_report(root, app, path):
+    """Once the window is drawn and git detection finished, write the timings and quit"""
+    if app.git_installed is None:
+        root.after(10, write_startup_report, root, app, path)
+        return
+    
+    report = {
+        "phases": [{"phase": phase, "ms": round(seconds * 1000, 1)} for phase, seconds in startup_marks],
+        "total_ms": round((time.perf_counter() - STARTUP_STARTED) * 1000, 1),
+        "git_installed": app.git_installed,
+        "dev_types": len(app.dev_types),
+    }
+    text = json.dumps(report, indent=2)
+    if path == "-":
+        print(text)
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    root.destroy()
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Git-OneClick")
+    parser.add_argument("--startup-report", nargs="?", const="-", metavar="PATH",
+                        help="Measure startup, write the timings as JSON (stdout by default) and exit")
+    args, _ = parser.parse_known_args()
+    
+    mark_startup("imports")
     root = tk.Tk()
+    mark_startup("tk initialized")
     app = GitOneClickGUI(root)
-    root.mainloop()
\ No newline at end of file
+    if args.startup_report:
+        def first_frame():
+            mark_startup("first frame")
+            write_startup_report(root, app, args.startup_report)
+        root.after_idle(first_frame)
+    root.mainloop()
+    if app.file_log_listener:
+        app.file_log_listener.stop()
\ No newline at end of file
@@ -0,0 +1,669 @@
+import os
+import subprocess
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from git_env import detect_git, set_global_config
+from git_progress import GitProgressParser, run_git_streaming
+from gitignore_matcher import format_preview, preview_worktree, repository_rules, walk_worktree
+from large_file_scan import describe_findings, ignore_findings, scan_large_files, track_findings_with_lfs
+from local_remote import LocalPushUnavailable, local_remote_path, push_local, update_ref
+from native_git import NativeGitEngine, NativeEngineUnavailable, config_bool, parse_config_list, read_ref
+from pipeline_state import PipelineState
+from push_retry import PUSH_BACKOFF, PUSH_RETRIES, backoff_delay, classify_push_error
+from readme_engine import readme_context, render_readme
+from run_trace import RunTrace
+from template_resolver import TemplateError, is_fragment, resolve_template
+from template_store import TemplateStore
+
+
+# Mirrors get remote names of their own, so remotes the user added are never repointed or removed
+MIRROR_REMOTE_PREFIX = "oneclick-mirror-"
+
+# Steps whose failure leaves an earlier run's commit worth reusing
+STEPS_AFTER_COMMIT = ("remote", "push")
+
+# Fallback templates used when development_types.json is missing
+DEFAULT_DEV_TYPES = {
+    "basic": {
+        "name": "Basic",
+        "description": "Basic project structure with minimal ignores",
+        "gitignore": [
+            "# List of ignore folder and files",
+            "/[Tt]emp/",
+            "# List of ignore files",
+            "*.exe",
+            "*.txt"
+        ],
+        "readme_template": "# {{ project_name }}\n\nSoftware Version: {{ project_version | default(\"[Version]\") }}\n\n## Description\nThis software is used for..."
+    },
+    "unity": {
+        "name": "Unity",
+        "description": "Unity game development project",
+        "gitignore": [
+            "# Unity generated folders and files",
+            "/[Ll]ibrary/",
+            "/[Tt]emp/",
+            "/[Ll]ogs/",
+            "/[Uu]serSettings/",
+            "/[Oo]bj/",
+            "/[Bb]uild/",
+            "/[Bb]uilds/"
+        ],
+        "readme_template": "# {{ project_name }}\n\nUnity Version: {{ unity_version | default(\"[Your Unity Version]\") }}"
+    }
+}
+
+# Used when even the fallback cannot be produced (e.g. a corrupt config file)
+EMERGENCY_DEV_TYPES = {
+    "basic": {
+        "name": "Basic",
+        "description": "Basic project structure",
+        "gitignore": ["# Basic gitignore", "/[Tt]emp/", "*.exe"],
+        "readme_template": "# Project\n\n## Description\nA basic project."
+    }
+}
+
+
+def load_development_types(config_path):
+    """Load development types from a configuration file, falling back to the defaults"""
+    try:
+        if os.path.exists(config_path):
+            dev_types = TemplateStore(config_path)
+            print(f"Loaded {len(dev_types)} development types from {config_path}")
+        else:
+            # Use default development types if config file doesn't exist
+            dev_types = TemplateStore(config_path, defaults=json.loads(json.dumps(DEFAULT_DEV_TYPES)))
+            print("Using default development types")
+        return dev_types
+    except Exception as e:
+        print(f"Error loading development types: {e}")
+        # Fallback to basic type if there's an error; the first edit rewrites the broken file
+        return TemplateStore.from_types(config_path, json.loads(json.dumps(EMERGENCY_DEV_TYPES)))
+
+
+class GitSetupPipeline:
+    """Headless repository setup: files -> init -> config -> commit -> push for one folder"""
+
+    def __init__(self, folder_path, repo_url, dev_type_id, dev_types,
+                 git_name="", git_email="", configure_user=False,
+                 log_callback=None, progress_callback=None, engine="native",
+                 large_file_action="auto", mirrors=(), push_retries=PUSH_RETRIES, push_backoff=PUSH_BACKOFF,
+                 hardlinks=True):
+        self.folder_path = folder_path
+        self.repo_url = repo_url
+        self.dev_type_id = dev_type_id
+        self.dev_types = dev_types
+        self.git_name = git_name
+        self.git_email = git_email
+        self.configure_user = configure_user
+        self.log_callback = log_callback
+        self.progress_callback = progress_callback
+        # "native" writes the repository in-process and falls back to "subprocess" when needed
+        self.engine = engine
+        self.native = None
+        self.git_processes = 0
+        # Executable found by detect_git(); it may live outside PATH (e.g. Program Files on Windows)
+        self.git_path = None
+        self.config = None
+        # Checkpoints of this folder's setup, loaded when run() starts
+        self.state = None
+        # "auto", "ignore", "lfs", "continue", "abort" or a callable(findings) returning one of them
+        self.large_file_action = large_file_action
+        # Extra remotes pushed alongside origin
+        self.mirrors = [url for url in mirrors if url]
+        # Transient push failures are retried this many times, waiting push_backoff * 2**n seconds
+        self.push_retries = push_retries
+        self.push_backoff = push_backoff
+        # Bare repositories on the same filesystem receive hardlinked objects instead of a pushed pack
+        self.hardlinks = hardlinks
+        # One record per remote from the last push (name, url, success, attempts, elapsed, error)
+        self.push_results = []
+        # Timing spans for every step, exportable with self.trace.save(path)
+        self.trace = RunTrace("setup", counters=lambda: {"subprocesses": self.git_processes})
+
+    def log(self, message):
+        """Forward a log message to the caller (or the console when headless)"""
+        if self.log_callback:
+            self.log_callback(message)
+        else:
+            print(message)
+
+    def set_progress(self, value, status=None):
+        """Report overall progress (0-100) and an optional status line"""
+        if self.progress_callback:
+            self.progress_callback(value, status)
+
+    def run_git(self, *args, check=True, text=True):
+        """Run a git command inside the project folder without touching the process cwd"""
+        self.git_processes += 1
+        return subprocess.run([self.git_executable(), *args], cwd=self.folder_path,
+                              check=check, capture_output=True, text=text)
+
+    def git_executable(self):
+        """Path of the git that was detected, falling back to whatever "git" PATH finds"""
+        if self.git_path is None:
+            env = detect_git()
+            self.git_path = env["path"] if env else "git"
+        return self.git_path
+
+    def git_config(self, refresh=False):
+        """Effective git configuration for the project folder, read once per run"""
+        if self.config is None or refresh:
+            config = self.known_config()
+            if config is None:
+                output = self.run_git("config", "--list", "-z", check=False).stdout
+                config = parse_config_list(output)
+            self.config = config
+        return self.config
+
+    def known_config(self):
+        """The effective config without spawning git, when the repository part of it is known.
+
+        That is the case before the folder is a repository and right after the
+        native engine created one; otherwise returns None.
+        """
+        env = detect_git()
+        if not env or env["conditional_includes"]:
+            return None
+        if self.native and self.native.local_config is not None:
+            local = self.native.local_config
+        elif not os.path.lexists(self.project_file(".git")):
+            local = {}
+        else:
+            return None
+        config = dict(env["config"])
+        config.update(local)
+        return config
+
+    def use_subprocess_engine(self, reason):
+        """Fall back to the git command line for the rest of the run"""
+        self.log(f"Native Git engine unavailable ({reason}); using git commands instead")
+        self.engine = "subprocess"
+        self.native = None
+
+    def project_file(self, name):
+        """Absolute path of a file inside the project folder"""
+        return os.path.join(self.folder_path, name)
+
+    def run(self):
+        """Run every setup step in order; raises on the first failing step"""
+        self.log("Starting GitHub connection process...")
+        self.set_progress(0, "Connecting...")
+        started = time.perf_counter()
+
+        # Checkpoints from an earlier, interrupted run let completed steps be skipped
+        self.state = PipelineState(self.folder_path)
+        if self.state.resumed:
+            failed = self.state.failed
+            self.log("Resuming earlier setup" + (f" (it stopped at '{failed['step']}')" if failed else ""))
+
+        # Step 1: Create appropriate .gitignore and README based on development type
+        self.run_step("files", 10, self.create_git_files)
+
+        # Step 2: Initialize Git repository
+        self.run_step("init", 30, self.initialize_git)
+
+        # Step 3: Configure Git (for new users; unchanged values are not rewritten)
+        self.set_progress(50)
+        if self.configure_user:
+            with self.trace.span("configure"):
+                self.configure_git()
+
+        # Step 4: Catch files the remote would reject before staging them
+        self.run_step("large_files", 60, self.check_large_files)
+
+        # Step 5: Add and commit files
+        self.run_step("commit", 70, self.commit_files)
+
+        # Step 6: Connect to GitHub and push (progress streams from 80 to 100)
+        self.run_step("remote", 80, self.connect_remote)
+        self.run_step("push", 80, self.push_to_github)
+
+        # Complete; only a failed run is resumed, a later one commits new work again
+        self.state.finish()
+        elapsed = time.perf_counter() - started
+        self.log(f"Setup finished in {elapsed:.2f}s using the {self.engine} engine "
+                 f"({self.git_processes} git process launches)")
+        self.log(f"Slowest steps: {self.trace.summary(limit=3)}")
+        self.set_progress(100, "Connection completed successfully.")
+
+    def run_step(self, name, progress, step):
+        """Run one checkpointed step unless an earlier run already completed it"""
+        self.set_progress(progress)
+        if self.step_done(name):
+            self.log(f"Skipping '{name}': already done by an earlier run")
+            with self.trace.span(name, skipped=True):
+                return
+        try:
+            with self.trace.span(name):
+                details = step()
+        except Exception as e:
+            self.state.fail(name, e)
+            raise
+        self.state.complete(name, details)
+
+    def step_done(self, name):
+        """Whether a step's checkpoint exists and what it produced is still there"""
+        done = self.state.get(name)
+        if done is None:
+            return False
+        if name == "files":
+            if not os.path.isfile(self.project_file(".gitignore")):
+                return False
+            if done.get("dev_type") == self.dev_type_id:
+                return True
+            # A different type only matters while nothing has been committed yet
+            if self.step_done("commit"):
+                self.log(f"Keeping the files already committed for the '{done.get('dev_type')}' type")
+                return True
+            return False
+        if name == "init":
+            return os.path.isfile(os.path.join(self.folder_path, ".git", "HEAD"))
+        if name == "large_files":
+            # The scan only guards staging, so it is redone until a commit exists
+            return self.step_done("commit")
+        if name == "commit":
+            # Only worth keeping when the run failed after it; otherwise new work must be committed
+            failed = (self.state.failed or {}).get("step")
+            return (failed in STEPS_AFTER_COMMIT and bool(done.get("commit"))
+                    and done["commit"] == self.head_commit())
+        if name == "remote":
+            return done.get("remotes") == dict(self.remotes())
+        if name == "push":
+            return not self.pending_pushes()
+        return True
+
+    def remotes(self):
+        """(name, url) of origin followed by the mirrors"""
+        remotes = [("origin", self.repo_url)]
+        for number, url in enumerate(self.mirrors, 1):
+            remotes.append((f"{MIRROR_REMOTE_PREFIX}{number}", url))
+        return remotes
+
+    def pending_pushes(self):
+        """Remotes that do not have the current commit from an earlier push yet"""
+        pushed = self.state.get("pushed") or {}
+        target = {"commit": self.head_commit()}
+        return [(name, url) for name, url in self.remotes() if pushed.get(name) != dict(target, url=url)]
+
+    def head_commit(self):
+        """SHA of the main branch, read from .git without spawning git"""
+        return read_ref(os.path.join(self.folder_path, ".git"), "refs/heads/main")
+
+    def dev_type(self):
+        """The selected development type with extends/include resolved, or an error if it is missing"""
+        if is_fragment(self.dev_types, self.dev_type_id):
+            raise Exception(f"'{self.dev_type_id}' is a template fragment and cannot be used on its own.")
+        return resolve_template(self.dev_types, self.dev_type_id)
+
+    def preview_commit(self):
+        """Report what the initial commit would contain without touching the folder"""
+        if not os.path.isdir(self.folder_path):
+            raise Exception(f"Project folder '{self.folder_path}' does not exist.")
+
+        summary = preview_worktree(self.folder_path, self.dev_type().get("gitignore", []), self.git_config())
+        for line in format_preview(summary):
+            self.log(line)
+        return summary
+
+    def create_git_files(self):
+        """Create .gitignore and README.md based on selected development type"""
+        self.log(f"Creating Git files for {self.dev_type_id} development type...")
+
+        if not os.path.isdir(self.folder_path):
+            raise Exception(f"Project folder '{self.folder_path}' does not exist.")
+
+        # Get selected development type
+        dev_type = self.dev_type()
+
+        # Create .gitignore based on development type
+        gitignore_content = "\n".join(dev_type.get("gitignore", []))
+        with open(self.project_file(".gitignore"), "w", encoding="utf-8") as f:
+            f.write(gitignore_content)
+        self.trace.add(files=1, bytes=len(gitignore_content.encode("utf-8")))
+
+        # Create README.md based on development type, filling in what is known about the project
+        readme_template = dev_type.get("readme_template", "# Project\n\n## Description\nProject description.")
+        try:
+            readme_content = render_readme(readme_template, self.readme_context(dev_type),
+                                           loader=lambda type_id: resolve_template(self.dev_types, type_id)["readme_template"])
+        except TemplateError as e:
+            # Templates written before variables existed may contain literal braces, and imported
+            # ones may include a template this catalogue does not have
+            self.log(f"README template not rendered ({e}); writing it unchanged")
+            readme_content = readme_template
+        with open(self.project_file("README.md"), "w", encoding="utf-8") as f:
+            f.write(readme_content)
+        self.trace.add(files=1, bytes=len(readme_content.encode("utf-8")))
+
+        self.log(f"Created .gitignore and README.md files for {dev_type.get('name', self.dev_type_id)} development")
+        return {"dev_type": self.dev_type_id}
+
+    def readme_context(self, dev_type):
+        """Variables for the README template; the author comes from the cached git config, not a git call"""
+        env = detect_git() or {}
+        arguments = dict(folder_path=self.folder_path, remote_url=self.repo_url,
+                         dev_type_name=dev_type.get("name", self.dev_type_id),
+                         author=self.git_name or env.get("user_name", ""),
+                         author_email=self.git_email or env.get("user_email", ""))
+        try:
+            return readme_context(**arguments)
+        except Exception as e:
+            # An unreadable manifest only costs the version variables, never the setup
+            self.log(f"Could not read project versions for the README ({e}); using the basic variables")
+            return readme_context(**arguments, detect=False)
+
+    def initialize_git(self):
+        """Initialize Git repository"""
+        self.log("Initializing Git repository...")
+
+        if self.engine == "native":
+            try:
+                self.native = NativeGitEngine(self.folder_path)
+                self.native.init_repository()
+                # One config read replaces the separate lookups git add/commit would do
+                self.native.load_config(self.git_config(refresh=True))
+                self.log("Git repository initialized")
+                return
+            except NativeEngineUnavailable as e:
+                self.use_subprocess_engine(str(e))
+
+        # Initialize git repository
+        self.run_git("init")
+        self.log("Git repository initialized")
+
+    def configure_git(self):
+        """Configure Git for new users"""
+        self.log("Configuring Git user settings...")
+
+        # Only values that differ from the current global identity are written
+        self.git_processes += set_global_config({"user.name": self.git_name, "user.email": self.git_email})
+
+        if self.config is not None:
+            self.config["user.name"] = self.git_name
+            self.config["user.email"] = self.git_email
+
+        self.log(f"Git configured with username: {self.git_name} and email: {self.git_email}")
+
+    def check_large_files(self):
+        """Find oversized and large binary files and resolve them before anything is staged"""
+        self.log("Scanning for large and binary files...")
+        findings = scan_large_files(self.folder_path, self.git_config())
+        if not findings:
+            self.log("No oversized files found")
+            return
+
+        for line in describe_findings(findings):
+            self.log(f"WARNING: {line}")
+        blocking = [finding for finding in findings if finding["blocking"]]
+
+        action = self.large_file_action
+        if callable(action):
+            action = action(findings)
+        if action == "auto":
+            action = "abort" if blocking else "continue"
+
+        if action == "ignore":
+            ignore_findings(self.folder_path, findings)
+            self.log(f"Added {len(findings)} large files to .gitignore")
+        elif action == "lfs":
+            self.enable_lfs()
+            track_findings_with_lfs(self.folder_path, findings)
+            self.log(f"Tracking {len(findings)} large files with Git LFS")
+        elif action == "continue":
+            if blocking:
+                raise Exception(f"{len(blocking)} files exceed the hosting size limit; "
+                                "the push would be rejected. Ignore them or use Git LFS.")
+            self.log("Committing large files as requested")
+        else:
+            raise Exception("Setup stopped before committing large files.")
+
+    def enable_lfs(self):
+        """Install the Git LFS filters for this repository"""
+        try:
+            self.run_git("lfs", "install", "--local")
+        except subprocess.CalledProcessError:
+            raise Exception("Git LFS is not installed. Install it from https://git-lfs.com or "
+                            "add the large files to .gitignore instead.")
+
+    def commit_files(self):
+        """Add and commit files to the repository"""
+        self.log("Adding files to repository...")
+
+        if self.native:
+            try:
+                self.commit_files_native()
+                self.log("Files committed to repository")
+                return {"commit": self.head_commit()}
+            except NativeEngineUnavailable as e:
+                self.use_subprocess_engine(str(e))
+
+        # Remove cached files to respect new .gitignore
+        with self.trace.span("rm --cached"):
+            try:
+                self.run_git("rm", "-r", "--cached", ".")
+            except subprocess.CalledProcessError:
+                # This might fail if no files were previously tracked, which is fine
+                pass
+
+        # Add all files respecting .gitignore
+        with self.trace.span("add"):
+            self.run_git("add", ".")
+
+        # Initial commit; a repository committed by an earlier run may have nothing new
+        with self.trace.span("commit"):
+            result = self.run_git("commit", "-m", "Initial commit", check=False)
+            if result.returncode != 0:
+                if "nothing to commit" in result.stdout and self.run_git("rev-parse", "--verify", "HEAD", check=False).returncode == 0:
+                    self.log("Nothing new to commit; keeping the existing commit")
+                else:
+                    raise subprocess.CalledProcessError(result.returncode, result.args, result.stdout, result.stderr)
+
+        # Create main branch
+        with self.trace.span("branch"):
+            self.run_git("branch", "-M", "main")
+
+        self.log("Files committed to repository")
+        return {"commit": self.head_commit()}
+
+    def commit_files_native(self):
+        """Stage, commit and branch in-process with a single ignore-aware walk of the folder"""
+        ignorecase = config_bool(self.native.config, "core.ignorecase")
+        rules = repository_rules(self.folder_path, self.native.config)
+        files = walk_worktree(self.folder_path, rules, ignorecase)
+
+        started = time.perf_counter()
+        # The walk is lazy, so this span covers walking and hashing together
+        with self.trace.span("stage"):
+            entries = self.native.stage_worktree(
+                files,
+                on_progress=lambda count, size: self.report_staging_progress(count, size, started)
+            )
+            self.trace.add(files=len(entries), bytes=sum(entry["stat"].st_size for entry in entries))
+        if not entries:
+            raise Exception("Nothing to commit: every file in the folder is ignored.")
+
+        if self.configure_user:
+            name, email = self.native.identity(self.git_name, self.git_email)
+        else:
+            name, email = self.native.identity()
+
+        with self.trace.span("write tree"):
+            tree_sha = self.native.write_tree(entries)
+        with self.trace.span("write index"):
+            self.native.write_index(entries)
+        with self.trace.span("commit"):
+            self.native.commit(tree_sha, "Initial commit", name, email)
+        self.log(f"Staged {len(entries)} files ({self.native.objects_written} objects written)")
+
+    def report_staging_progress(self, count, size, started):
+        """Log staging throughput while blobs are being hashed"""
+        elapsed = max(time.perf_counter() - started, 1e-6)
+        megabytes = size / (1024 * 1024)
+        message = (f"Staging: {count} files, {megabytes:.1f} MB "
+                   f"({count / elapsed:.0f} files/s, {megabytes / elapsed:.1f} MB/s)")
+        self.log(message)
+        self.set_progress(70, message)
+
+    def connect_remote(self):
+        """Point origin and the mirrors at their URLs, updating remotes an earlier run added"""
+        self.log("Connecting to GitHub repository...")
+
+        config = self.git_config()
+        for name, url in self.remotes():
+            current = config.get(f"remote.{name}.url")
+            if current == url:
+                self.log(f"Remote {name} already set")
+            elif current:
+                self.run_git("remote", "set-url", name, url)
+                self.log(f"Remote {name} changed from {current}")
+            elif self.native:
+                self.native.add_remote(name, url)
+            else:
+                self.run_git("remote", "add", name, url)
+            config[f"remote.{name}.url"] = url
+
+        # Mirrors an earlier run added that are no longer in the list
+        wanted = {name for name, _ in self.remotes()}
+        stale = sorted({key[len("remote."):-len(".url")] for key in config
+                        if key.startswith("remote." + MIRROR_REMOTE_PREFIX) and key.endswith(".url")} - wanted)
+        for name in stale:
+            self.run_git("remote", "remove", name)
+            for key in [key for key in config if key.startswith(f"remote.{name}.")]:
+                del config[key]
+            self.log(f"Remote {name} removed (no longer a mirror)")
+        return {"remotes": dict(self.remotes())}
+
+    def push_to_github(self):
+        """Push main to every remote at once; each retries transient failures on its own"""
+        commit = self.head_commit()
+        pending = self.pending_pushes()
+        for name, url in self.remotes():
+            if (name, url) not in pending:
+                self.log(f"Remote {name} already has this commit")
+        if not pending:
+            return {"commit": commit, "remotes": [name for name, _ in self.remotes()]}
+
+        local = all(local_remote_path(url, self.folder_path) is not None for _, url in pending)
+        host = "the local repository" if local else "GitHub"
+        self.log(f"Pushing to {host} (this may take a moment)..." if len(pending) == 1 else
+                 f"Pushing to {len(pending)} remotes in parallel (this may take a moment)...")
+        # Only the first remote drives the progress bar; the others report when done
+        with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+            futures = [executor.submit(self.push_remote, name, url, index == 0)
+                       for index, (name, url) in enumerate(pending)]
+            self.push_results = [future.result() for future in futures]
+
+        pushed = dict(self.state.get("pushed") or {})
+        for result in self.push_results:
+            self.git_processes += result["processes"]
+            if result["success"]:
+                pushed[result["remote"]] = {"commit": commit, "url": result["url"]}
+                self.log(f"Pushed to {result['remote']} in {result['elapsed']:.2f}s "
+                         f"({result['attempts']} attempt{'s' if result['attempts'] > 1 else ''})")
+            else:
+                self.log(f"Error during push to {result['remote']}: {result['error']}")
+        # Remotes that succeeded are not pushed again when the run is retried
+        self.state.complete("pushed", pushed)
+
+        failures = [result for result in self.push_results if not result["success"]]
+        if not failures:
+            self.log(f"Successfully pushed to {host}")
+            return {"commit": commit, "remotes": [name for name, _ in self.remotes()]}
+
+        if any(result["kind"] == "auth" for result in failures):
+            self.log("HINT: Authentication failed. Make sure you have the correct permissions and credentials.")
+            self.log("For first-time users, you might need to set up a Personal Access Token (PAT) in GitHub.")
+        names = ", ".join(result["remote"] for result in failures)
+        if len(failures) == 1 and failures[0]["kind"] == "auth":
+            raise Exception(f"GitHub authentication failed for {names}. Check credentials and permissions.")
+        if len(failures) == 1 and failures[0]["kind"] == "not_found":
+            path = local_remote_path(failures[0]["url"], self.folder_path)
+            if path is not None:
+                raise Exception(f"Repository {failures[0]['url']} was not found. Create it with "
+                                f"'git init --bare {path}' first or check the path.")
+            raise Exception(f"Repository {failures[0]['url']} was not found. Create it on GitHub first or check the URL.")
+        raise Exception(f"Failed to push to {names}: {failures[0]['error']}")
+
+    def push_remote(self, name, url, show_progress):
+        """Push main to one remote, retrying transient network errors with exponential backoff"""
+        path = local_remote_path(url, self.folder_path) if self.hardlinks else None
+        if path is not None:
+            result = self.push_local_remote(name, url, path)
+            if result is not None:
+                return result
+
+        args = ["push", "--progress", "-u", name, "main"] if name == "origin" else ["push", "--progress", name, "main"]
+
+        def on_progress(event, fraction):
+            self.set_progress(80 + 20 * fraction, event["text"])
+
+        result = {"remote": name, "url": url, "success": False, "attempts": 0, "kind": None, "error": None,
+                  "transport": "git"}
+        started = time.perf_counter()
+        with self.trace.span(f"push {name}", url=url) as span:
+            while True:
+                result["attempts"] += 1
+                parser = GitProgressParser(on_progress if show_progress else None)
+                returncode, _ = run_git_streaming(args, self.folder_path, parser.feed, self.git_executable())
+                span["bytes"] += parser.transferred
+                output = "\n".join(parser.messages).strip()
+                if returncode == 0:
+                    result["success"] = True
+                    break
+
+                result["kind"] = classify_push_error(output)
+                result["error"] = output or "No detailed error information available"
+                if result["kind"] != "transient" or result["attempts"] > self.push_retries:
+                    break
+                delay = backoff_delay(result["attempts"], self.push_backoff)
+                reason = output.splitlines()[-1] if output else f"exit code {returncode}"
+                self.log(f"Push to {name} failed ({reason}); retrying in {delay:.1f}s "
+                         f"(attempt {result['attempts'] + 1} of {self.push_retries + 1})")
+                time.sleep(delay)
+            # Pushes run on worker threads and are added to git_processes afterwards
+            result["processes"] = result["attempts"]
+            span["subprocesses"] = result["processes"]
+            span["attempts"] = result["attempts"]
+
+        result["elapsed"] = round(time.perf_counter() - started, 3)
+        return result
+
+    def push_local_remote(self, name, url, path):
+        """Link the objects into a bare repository on this filesystem; None when git push must do it"""
+        commit = self.head_commit()
+        started = time.perf_counter()
+        with self.trace.span(f"push {name}", url=url, transport="hardlink") as span:
+            try:
+                counts = push_local(os.path.join(self.folder_path, ".git"), path, "main", commit)
+            except (LocalPushUnavailable, OSError) as e:
+                self.log(f"Pushing to {name} with git instead of linking objects: {e}")
+                span["fallback"] = str(e)
+                return None
+            span["files"] = counts["linked"] + counts["copied"]
+            span["bytes"] = counts["bytes"]
+        try:
+            self.track_remote(name, commit)
+        except (LocalPushUnavailable, OSError) as e:
+            # The remote has the commit; only the local bookkeeping is missing
+            self.log(f"Could not record {name}/main locally: {e}")
+
+        self.log(f"Linked {counts['linked']} object files into {path}"
+                 + (f" ({counts['copied']} copied)" if counts["copied"] else "")
+                 + (f", {counts['existing']} already there" if counts["existing"] else ""))
+        return {"remote": name, "url": url, "success": True, "attempts": 1, "processes": 0, "kind": None,
+                "error": None, "transport": "hardlink", "elapsed": round(time.perf_counter() - started, 3)}
+
+    def track_remote(self, name, commit):
+        """What `git push [-u]` records locally: the remote-tracking ref and origin as upstream"""
+        git_dir = os.path.join(self.folder_path, ".git")
+        ref = f"refs/remotes/{name}/main"
+        update_ref(git_dir, ref, commit, expected=read_ref(git_dir, ref))
+        config = self.git_config()
+        if name == "origin" and "branch.main.remote" not in config:
+            with open(os.path.join(git_dir, "config"), "a", encoding="utf-8", newline="\n") as f:
+                f.write('[branch "main"]\n\tremote = origin\n\tmerge = refs/heads/main\n')
+            config["branch.main.remote"] = "origin"
+            config["branch.main.merge"] = "refs/heads/main"
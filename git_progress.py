@@ -0,0 +1,122 @@
+"""Live progress for long-running git commands.
+
+git prints progress to stderr as carriage-return separated updates such as
+``Writing objects:  40% (2/5), 1.20 MiB | 2.40 MiB/s``. run_git_streaming()
+reads stderr incrementally, and GitProgressParser turns each update into a
+structured event with phase, object counts, bytes transferred and rate.
+"""
+import re
+import subprocess
+from threading import Thread
+
+
+PROGRESS_PATTERN = re.compile(
+    r"^(?:remote: )?(?P<phase>[A-Za-z][A-Za-z ]*?):\s+"
+    r"(?:(?P<percent>\d+)% \((?P<current>\d+)/(?P<total>\d+)\)|(?P<count>\d+))"
+    r"(?:, (?P<size>[\d.]+ (?:[KMGT]?i?B|bytes))(?: \| (?P<rate>[\d.]+ (?:[KMGT]?i?B|bytes)/s))?)?"
+    r"(?P<done>, done\.)?"
+)
+
+# Share of the overall step each push phase represents
+PHASE_WEIGHTS = {
+    "Enumerating objects": (0.0, 0.05),
+    "Counting objects": (0.05, 0.10),
+    "Compressing objects": (0.10, 0.25),
+    "Writing objects": (0.25, 0.95),
+    "Resolving deltas": (0.95, 1.0),
+}
+
+SIZE_UNITS = {"B": 1, "bytes": 1, "KiB": 1024, "MiB": 1024 ** 2, "GiB": 1024 ** 3, "TiB": 1024 ** 4,
+              "KB": 1000, "MB": 1000 ** 2, "GB": 1000 ** 3, "TB": 1000 ** 4}
+
+
+def parse_size(text):
+    """Convert git's '1.20 MiB' notation into bytes"""
+    if not text:
+        return None
+    value, _, unit = text.partition(" ")
+    unit = unit.replace("/s", "")
+    return int(float(value) * SIZE_UNITS.get(unit, 1))
+
+
+def parse_progress_line(line):
+    """Parse one progress update; returns None for ordinary output lines"""
+    match = PROGRESS_PATTERN.match(line.strip())
+    if not match:
+        return None
+    percent = match.group("percent")
+    return {
+        "phase": match.group("phase"),
+        "percent": int(percent) if percent is not None else None,
+        "current": int(match.group("current") or match.group("count")),
+        "total": int(match.group("total")) if match.group("total") else None,
+        "bytes": parse_size(match.group("size")),
+        "rate": parse_size(match.group("rate")),
+        "done": bool(match.group("done")),
+        "text": line.strip(),
+    }
+
+
+class GitProgressParser:
+    """Feed raw stderr lines; emits progress events and keeps the non-progress output"""
+
+    def __init__(self, on_progress=None):
+        self.on_progress = on_progress
+        self.messages = []
+        self.last_event = None
+        # Largest byte count reported by any phase (the pack size for a push)
+        self.transferred = 0
+
+    def feed(self, line):
+        event = parse_progress_line(line)
+        if event is None:
+            if line.strip():
+                self.messages.append(line.rstrip())
+            return
+
+        self.last_event = event
+        if event["bytes"]:
+            self.transferred = max(self.transferred, event["bytes"])
+        if event["done"]:
+            # Keep the final line of each phase for the log
+            self.messages.append(event["text"])
+        if self.on_progress:
+            self.on_progress(event, self.fraction(event))
+
+    @staticmethod
+    def fraction(event):
+        """Overall completion (0-1) of the command implied by a progress event"""
+        start, end = PHASE_WEIGHTS.get(event["phase"], (0.0, 1.0))
+        if event["percent"] is None:
+            return start
+        return start + (end - start) * event["percent"] / 100
+
+
+def run_git_streaming(args, cwd, on_line, git_path="git"):
+    """Run git with stderr read as it is produced; on_line receives each \\r or \\n separated line.
+
+    Returns (returncode, stdout). stdout is drained on a helper thread so a
+    chatty command can never block on a full pipe.
+    """
+    process = subprocess.Popen([git_path, *args], cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    stdout_chunks = []
+    stdout_reader = Thread(target=lambda: stdout_chunks.append(process.stdout.read()), daemon=True)
+    stdout_reader.start()
+
+    pending = b""
+    while True:
+        chunk = process.stderr.read1(4096)
+        if not chunk:
+            break
+        pending += chunk
+        *lines, pending = re.split(rb"[\r\n]", pending)
+        for line in lines:
+            if line:
+                on_line(line.decode("utf-8", "replace"))
+    if pending:
+        on_line(pending.decode("utf-8", "replace"))
+
+    returncode = process.wait()
+    stdout_reader.join()
+    return returncode, b"".join(stdout_chunks).decode("utf-8", "replace")
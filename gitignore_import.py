@@ -0,0 +1,280 @@
+"""Import a local checkout of the github/gitignore template collection.
+
+    result = plan_collection("~/src/gitignore", store, include_global=["macOS"])
+    print(result.plan.summary())
+    result.apply(store)
+
+Every ``*.gitignore`` file becomes a development type: ``Python.gitignore``
+turns into ``gitignore-python`` and ``community/Python/JupyterNotebooks.gitignore``
+into ``gitignore-python-jupyternotebooks``. ``+`` and ``#`` are spelled out
+(``C++.gitignore`` is ``gitignore-cplusplus``, not a second ``gitignore-c``)
+and any other clash gets a suffix, so every file keeps a type of its own.
+Files under ``Global/`` (editors, operating systems) become abstract
+fragments such as ``_global-macos``, which any type can list under
+"include" to compose, say, Python + macOS + JetBrains. ``--with macOS``
+adds such includes to every imported type.
+
+Imports are incremental. The size, mtime and hash of every file are kept
+in the app data folder, one state file per checkout; the next import only
+reads files whose size or mtime changed, and only builds entries for files
+whose content did. Types whose file was deleted from the checkout are
+removed, unless they were edited in the app since. Files are read and
+parsed on a thread pool, and the delta is written with one journal append.
+"""
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from app_paths import app_data_dir
+from catalogue_import import ImportPlan, apply_import, content_hash
+from template_store import atomic_write
+
+
+GITIGNORE_SUFFIX = ".gitignore"
+
+# Folders of the collection whose files are fragments rather than project types
+GLOBAL_DIR = "Global"
+
+TYPE_PREFIX = "gitignore-"
+FRAGMENT_PREFIX = "_global-"
+
+# Bumped whenever entries are built differently, so every file is processed again
+STATE_VERSION = 1
+
+READ_WORKERS = 8
+
+README_TEMPLATE = ("# {{ project_name }}\n\n## Description\n"
+                   "{{ project_description | default(\"A %s project.\") }}\n")
+
+
+# Characters that tell templates apart (C, C++) and would be lost as separators
+SPELLED_OUT = {"+": "plus", "#": "sharp"}
+
+
+def slug(text):
+    text = "".join(SPELLED_OUT.get(char, char) for char in text.lower())
+    return re.sub(r"[^a-z0-9]+", "-", text).strip("-")
+
+
+def scan_collection(root):
+    """{relative path: os.stat_result} of every template file in the checkout"""
+    found = {}
+    for folder, dirs, files in os.walk(root):
+        dirs[:] = sorted(name for name in dirs if not name.startswith("."))
+        for name in files:
+            # The collection's own ".gitignore" is not a template
+            if name.endswith(GITIGNORE_SUFFIX) and name != GITIGNORE_SUFFIX:
+                path = os.path.join(folder, name)
+                relative = os.path.relpath(path, root).replace(os.sep, "/")
+                try:
+                    found[relative] = os.stat(path)
+                except OSError:
+                    continue
+    return found
+
+
+def type_id_for(relative):
+    """Type id of a template file; files under Global/ get fragment ids"""
+    parts = relative[:-len(GITIGNORE_SUFFIX)].split("/")
+    if parts[0] == GLOBAL_DIR:
+        return FRAGMENT_PREFIX + slug("-".join(parts[1:]))
+    if parts[0] == "community":
+        parts = parts[1:]
+    return TYPE_PREFIX + slug("-".join(parts))
+
+
+def assign_type_ids(paths):
+    """{relative path: type id}, unique even where two names slug the same ("Foo_Bar", "Foo-Bar")"""
+    ids = {}
+    taken = set()
+    for relative in sorted(paths):
+        type_id = base = type_id_for(relative)
+        attempt = 0
+        while type_id in taken:
+            # The later file (by path) gets a suffix derived from its path, so it stays stable
+            attempt += 1
+            suffix = hashlib.blake2b(f"{relative}\0{attempt}".encode("utf-8"), digest_size=3).hexdigest()
+            type_id = f"{base}-{suffix}"
+        ids[relative] = type_id
+        taken.add(type_id)
+    return ids
+
+
+def build_entry(relative, text):
+    """The development type for one template file"""
+    name = os.path.basename(relative)[:-len(GITIGNORE_SUFFIX)]
+    lines = [line.rstrip() for line in text.splitlines()]
+    while lines and not lines[0]:
+        lines.pop(0)
+    while lines and not lines[-1]:
+        lines.pop()
+    if relative.startswith(GLOBAL_DIR + "/"):
+        return {
+            "name": name,
+            "description": f"{name} patterns from {relative} (fragment)",
+            "abstract": True,
+            "gitignore": lines,
+        }
+    return {
+        "name": name,
+        "description": f"{name} project ({relative})",
+        "gitignore": lines,
+        "readme_template": README_TEMPLATE % name,
+    }
+
+
+def read_template(root, relative):
+    """(content hash, text) of one file; runs on the worker pool"""
+    with open(os.path.join(root, relative), "rb") as f:
+        data = f.read()
+    return hashlib.blake2b(data, digest_size=16).hexdigest(), data.decode("utf-8", errors="replace")
+
+
+# -- Import state --------------------------------------------------------------
+
+def state_path(root):
+    """State file for one checkout, named after its absolute path"""
+    key = hashlib.blake2b(os.path.abspath(root).encode("utf-8"), digest_size=8).hexdigest()
+    return os.path.join(app_data_dir("gitignore-imports"), f"{key}.json")
+
+
+def load_state(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(state, dict) or state.get("version") != STATE_VERSION:
+        return {}
+    return state.get("files", {})
+
+
+def save_state(path, root, files):
+    state = {"version": STATE_VERSION, "root": os.path.abspath(root), "files": files}
+    atomic_write(path, json.dumps(state, indent=1, sort_keys=True))
+
+
+# -- Plan and apply ------------------------------------------------------------
+
+class CollectionImport:
+    """The plan for a checkout plus the file state to save once it is applied"""
+
+    def __init__(self, root, plan, files, state_file, reread, read):
+        self.root = root
+        self.plan = plan
+        self.files = files
+        self.state_file = state_file
+        # Files whose size or mtime changed, and those whose content actually did
+        self.reread = reread
+        self.read = read
+
+    def apply(self, store):
+        apply_import(store, self.plan)
+        save_state(self.state_file, self.root, self.files)
+
+
+def plan_collection(root, store, include_global=(), state_file=None):
+    """Compare a checkout with the last import and the store; nothing is written yet"""
+    root = os.path.expanduser(root)
+    if not os.path.isdir(root):
+        raise ValueError(f"{root} is not a folder")
+    state_file = state_file or state_path(root)
+    previous = load_state(state_file)
+    found = scan_collection(root)
+    if not found:
+        raise ValueError(f"no *{GITIGNORE_SUFFIX} files found in {root}")
+
+    plan = ImportPlan()
+    ids = assign_type_ids(found)
+    owned = set(ids.values())
+
+    includes = []
+    for name in include_global:
+        fragment_id = ids.get(f"{GLOBAL_DIR}/{name}{GITIGNORE_SUFFIX}") or type_id_for(f"{GLOBAL_DIR}/{name}{GITIGNORE_SUFFIX}")
+        if f"{GLOBAL_DIR}/{name}{GITIGNORE_SUFFIX}" not in found and fragment_id not in store:
+            raise ValueError(f"{GLOBAL_DIR}/{name}{GITIGNORE_SUFFIX} is not in the collection")
+        includes.append(fragment_id)
+
+    files = {}
+    pending = []
+    for relative, stat in found.items():
+        known = previous.get(relative)
+        unchanged = (known and known["type_id"] == ids[relative] and known["type_id"] in store
+                     and known["size"] == stat.st_size and known["mtime_ns"] == stat.st_mtime_ns
+                     and known.get("include", []) == includes)
+        if unchanged:
+            files[relative] = known
+        else:
+            pending.append(relative)
+
+    read = 0
+    with ThreadPoolExecutor(max_workers=READ_WORKERS) as executor:
+        for relative, (digest, text) in zip(pending, executor.map(lambda path: read_template(root, path), pending)):
+            stat = found[relative]
+            known = previous.get(relative)
+            type_id = ids[relative]
+            record = {"type_id": type_id, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                      "hash": digest, "include": includes}
+            if (known and known["type_id"] == type_id and type_id in store
+                    and known["hash"] == digest and known.get("include", []) == includes):
+                # Touched but not changed (a fresh clone, a checkout of another branch)
+                files[relative] = dict(record, entry=known["entry"])
+                plan.unchanged.append(type_id)
+                continue
+            read += 1
+            info = build_entry(relative, text)
+            if includes and not info.get("abstract"):
+                info["include"] = list(includes)
+            entry_hash = content_hash(info)
+            files[relative] = dict(record, entry=entry_hash)
+            if type_id not in store:
+                plan.added[type_id] = info
+            elif content_hash(store[type_id]) != entry_hash:
+                plan.changed[type_id] = info
+            else:
+                plan.unchanged.append(type_id)
+    plan.unchanged.extend(record["type_id"] for relative, record in files.items() if relative not in pending)
+
+    # Types of deleted (or renamed) files go too, unless someone edited them after the import
+    for relative, known in previous.items():
+        type_id = known["type_id"]
+        if (type_id not in owned and type_id in store and type_id not in plan.removed
+                and content_hash(store[type_id]) == known["entry"]):
+            plan.removed.append(type_id)
+    plan.fragments = [type_id for type_id in plan.updates if type_id.startswith(FRAGMENT_PREFIX)]
+    return CollectionImport(root, plan, files, state_file, reread=len(pending), read=read)
+
+
+def main(argv=None):
+    import argparse
+
+    from git_pipeline import load_development_types
+
+    parser = argparse.ArgumentParser(description="Import a checkout of the github/gitignore collection")
+    parser.add_argument("collection", help="Folder of the checkout (with Global/ and community/)")
+    parser.add_argument("--config", default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                         "development_types.json"),
+                        help="Development types configuration file to import into")
+    parser.add_argument("--with", dest="include_global", action="append", default=[], metavar="GLOBAL",
+                        help="Include Global/GLOBAL.gitignore in every imported type (repeatable), e.g. macOS")
+    parser.add_argument("--dry-run", action="store_true", help="Only show what would change")
+    args = parser.parse_args(argv)
+
+    store = load_development_types(args.config)
+    try:
+        result = plan_collection(args.collection, store, include_global=args.include_global)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    print(f"{len(result.files)} templates, {result.reread} re-read, {result.read} changed")
+    print(result.plan.summary())
+    if not args.dry_run:
+        result.apply(store)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
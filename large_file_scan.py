@@ -0,0 +1,118 @@
+"""Pre-commit scan for oversized and binary files.
+
+Runs after the .gitignore has been written and before anything is staged, so
+files GitHub would reject can be ignored or routed to Git LFS before a long
+upload starts. Only file sizes are read from the directory walk; binary
+detection sniffs the first few kilobytes of large files, never whole files.
+"""
+import os
+
+from gitignore_matcher import config_ignorecase, format_size, repository_rules, walk_worktree
+
+
+# GitHub rejects pushes containing files above this size
+GITHUB_FILE_LIMIT = 100 * 1024 * 1024
+
+# GitHub warns above this size; such files are reported but not blocking
+LARGE_FILE_WARNING = 50 * 1024 * 1024
+
+# Binary files above this size are reported as LFS candidates
+LARGE_BINARY_WARNING = 10 * 1024 * 1024
+
+# Git itself decides "binary" by looking for a NUL byte in the first 8000 bytes
+BINARY_SNIFF_SIZE = 8000
+
+# Characters that must be escaped in .gitignore / .gitattributes patterns
+PATTERN_SPECIAL_CHARS = "\\*?[!#"
+
+
+def is_binary_file(path):
+    """Sniff the start of a file for NUL bytes, as git's buffer_is_binary() does"""
+    try:
+        with open(path, "rb") as f:
+            return b"\0" in f.read(BINARY_SNIFF_SIZE)
+    except OSError:
+        return False
+
+
+def scan_large_files(folder_path, config=None, file_limit=GITHUB_FILE_LIMIT,
+                     large_limit=LARGE_FILE_WARNING, binary_limit=LARGE_BINARY_WARNING):
+    """Find files that would be committed and are oversized or large binaries.
+
+    Returns a list of findings sorted by size (largest first). Findings with
+    "blocking" set exceed the hosting limit and would make the push fail.
+    """
+    config = config or {}
+    rules = repository_rules(folder_path, config)
+    findings = []
+
+    for relative_path, st in walk_worktree(folder_path, rules, config_ignorecase(config)):
+        if st is None or st.st_size < min(large_limit, binary_limit):
+            continue
+
+        binary = is_binary_file(os.path.join(folder_path, relative_path))
+        if st.st_size > file_limit:
+            reason = f"exceeds the {format_size(file_limit)} limit"
+        elif st.st_size > large_limit:
+            reason = f"is larger than {format_size(large_limit)}"
+        elif binary:
+            reason = "is a large binary file"
+        else:
+            continue
+
+        findings.append({
+            "path": relative_path,
+            "size": st.st_size,
+            "binary": binary,
+            "blocking": st.st_size > file_limit,
+            "reason": reason,
+        })
+
+    findings.sort(key=lambda finding: finding["size"], reverse=True)
+    return findings
+
+
+def escape_pattern(relative_path):
+    """Turn a relative path into an exact, anchored gitignore/gitattributes pattern"""
+    escaped = "".join("\\" + c if c in PATTERN_SPECIAL_CHARS else c for c in relative_path)
+    return "/" + escaped
+
+
+def append_lines(path, lines):
+    """Append lines to a text file, starting on a fresh line"""
+    prefix = ""
+    if os.path.exists(path) and os.path.getsize(path) > 0:
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                prefix = "\n"
+    with open(path, "a", encoding="utf-8", newline="\n") as f:
+        f.write(prefix + "\n".join(lines) + "\n")
+
+
+def ignore_findings(folder_path, findings):
+    """Add the flagged files to the project's .gitignore"""
+    lines = ["# Large files excluded by Git-OneClick"]
+    lines += [escape_pattern(finding["path"]) for finding in findings]
+    append_lines(os.path.join(folder_path, ".gitignore"), lines)
+
+
+def track_findings_with_lfs(folder_path, findings):
+    """Route the flagged files through Git LFS via .gitattributes"""
+    lines = []
+    for finding in findings:
+        # gitattributes patterns cannot contain literal spaces
+        pattern = escape_pattern(finding["path"]).replace(" ", "[[:space:]]")
+        lines.append(f"{pattern} filter=lfs diff=lfs merge=lfs -text")
+    append_lines(os.path.join(folder_path, ".gitattributes"), lines)
+
+
+def describe_findings(findings, limit=10):
+    """Render findings as short human readable lines"""
+    lines = []
+    for finding in findings[:limit]:
+        kind = "binary, " if finding["binary"] else ""
+        lines.append(f"{finding['path']} ({kind}{format_size(finding['size'])}) {finding['reason']}")
+    if len(findings) > limit:
+        lines.append(f"... and {len(findings) - limit} more")
+    return lines
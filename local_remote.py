@@ -0,0 +1,191 @@
+"""Push to a bare repository on the local filesystem without the pack protocol.
+
+Air-gapped setups push to bare repositories on a local disk or an NFS
+share, given as a plain path (``/srv/git/app.git``, ``..\\mirror.git``,
+``\\\\server\\git\\app.git``) or a ``file://`` URL. ``git push`` would still
+enumerate, delta-compress and stream a pack through receive-pack. When the
+target lives on the same filesystem as the project, push_local() instead
+does what ``git clone --local`` does: it hardlinks the immutable object
+files into the target, then moves the branch with git's own lock-file
+protocol, so readers see either the old or the new commit.
+
+Anything that would make the result differ from a real push (receive hooks,
+fsck or shared-permission settings, a branch that already points elsewhere,
+a lock held by another writer) raises LocalPushUnavailable and the caller
+falls back to ``git push``, which handles those cases itself.
+"""
+import os
+import re
+import shutil
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+from native_git import read_ref
+
+
+class LocalPushUnavailable(Exception):
+    """Raised when a local push has to go through `git push` after all"""
+
+
+# Hooks receive-pack would run; a direct ref update would skip them
+RECEIVE_HOOKS = ("pre-receive", "update", "proc-receive", "reference-transaction", "post-receive", "post-update")
+
+# Target settings that make receive-pack do more than store objects and move a ref
+RECEIVE_CONFIG = re.compile(r"^\s*(?:hookspath|fsckobjects|sharedrepository)\s*=",
+                            re.IGNORECASE | re.MULTILINE)
+
+# Parallel link calls hide the per-file latency of network filesystems
+LINK_WORKERS = 8
+
+
+def local_remote_path(url, base_dir):
+    """Filesystem path of a local remote URL, or None for network remotes.
+
+    Follows git's rules: "scheme://" is a URL, "host:path" with the colon
+    before the first slash is scp-style SSH, and anything else is a path,
+    relative ones resolved against base_dir (where git would run).
+    """
+    if url.lower().startswith("file://"):
+        path = urllib.parse.unquote(url[len("file://"):])
+        if path.lower().startswith("localhost/"):
+            path = path[len("localhost"):]
+        if re.match(r"^/[A-Za-z]:[\\/]", path):
+            # file:///C:/repos/app.git
+            path = path[1:]
+        elif not path.startswith("/"):
+            # file://server/share is a UNC path
+            path = "//" + path
+        return os.path.normpath(path)
+    if "://" in url:
+        return None
+    if not re.match(r"^[A-Za-z]:[\\/]", url):
+        colon, slash = url.find(":"), url.find("/")
+        if colon != -1 and (slash == -1 or colon < slash):
+            return None
+    return os.path.normpath(os.path.join(base_dir, os.path.expanduser(url)))
+
+
+def is_bare_repository(path):
+    return (os.path.isfile(os.path.join(path, "HEAD"))
+            and os.path.isdir(os.path.join(path, "objects"))
+            and os.path.isdir(os.path.join(path, "refs")))
+
+
+def check_target(target):
+    """Refuse targets where receive-pack would do more than a plain push"""
+    if not is_bare_repository(target):
+        raise LocalPushUnavailable(f"{target} is not a bare repository")
+    hooks = os.path.join(target, "hooks")
+    for hook in RECEIVE_HOOKS:
+        if os.path.isfile(os.path.join(hooks, hook)):
+            raise LocalPushUnavailable(f"the target has a {hook} hook")
+    try:
+        with open(os.path.join(target, "config"), "r", encoding="utf-8", errors="replace") as f:
+            match = RECEIVE_CONFIG.search(f.read())
+    except OSError:
+        match = None
+    if match:
+        raise LocalPushUnavailable(f"the target sets {match.group(0).strip(' =')}")
+
+
+def object_files(objects_dir):
+    """{fan-out folder: [file names]} of loose objects, plus "pack" for pack files"""
+    found = {}
+    try:
+        entries = list(os.scandir(objects_dir))
+    except OSError:
+        return found
+    for entry in entries:
+        if len(entry.name) == 2 or entry.name == "pack":
+            try:
+                names = os.listdir(entry.path)
+            except OSError:
+                continue
+            if entry.name == "pack":
+                # Indexes go last so the target never sees an index without its pack
+                names = sorted((name for name in names if name.endswith((".pack", ".idx", ".rev"))),
+                               key=lambda name: name.endswith(".idx"))
+            if names:
+                found[entry.name] = names
+    return found
+
+
+def link_folder(source_dir, target_dir, names):
+    """Hardlink (or copy, where links are refused) names that the target lacks"""
+    counts = {"linked": 0, "copied": 0, "existing": 0, "bytes": 0}
+    os.makedirs(target_dir, exist_ok=True)
+    for name in names:
+        source = os.path.join(source_dir, name)
+        target = os.path.join(target_dir, name)
+        try:
+            os.link(source, target)
+            counts["linked"] += 1
+        except FileExistsError:
+            # Objects are named by their content, so an existing file is the same object
+            counts["existing"] += 1
+            continue
+        except OSError:
+            temp = target + ".tmp"
+            shutil.copyfile(source, temp)
+            os.replace(temp, target)
+            counts["copied"] += 1
+        counts["bytes"] += os.path.getsize(source)
+    return counts
+
+
+def update_ref(git_dir, ref, new, expected=None):
+    """Point ref at new if it still holds expected (None: absent), via ref.lock like git"""
+    path = os.path.join(git_dir, ref)
+    lock = path + ".lock"
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    try:
+        fd = os.open(lock, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    except FileExistsError:
+        raise LocalPushUnavailable(f"{ref} is locked by another writer")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="\n") as f:
+            f.write(new + "\n")
+        current = read_ref(git_dir, ref)
+        if current != expected and current != new:
+            raise LocalPushUnavailable(f"{ref} changed during the push")
+        os.replace(lock, path)
+    except BaseException:
+        try:
+            os.unlink(lock)
+        except OSError:
+            pass
+        raise
+
+
+def push_local(source_git_dir, target, branch, commit):
+    """Make the bare repository at target hold commit on branch by linking objects.
+
+    Returns counts of linked, copied and already present object files.
+    Raises LocalPushUnavailable whenever `git push` should do it instead.
+    """
+    check_target(target)
+    ref = f"refs/heads/{branch}"
+    current = read_ref(target, ref)
+    if current not in (None, commit):
+        raise LocalPushUnavailable(f"the target's {branch} already points to {current[:7]}")
+
+    source_objects = os.path.join(source_git_dir, "objects")
+    target_objects = os.path.join(target, "objects")
+    if os.path.exists(os.path.join(source_objects, "info", "alternates")):
+        raise LocalPushUnavailable("the project borrows objects from another repository")
+    if os.stat(source_objects).st_dev != os.stat(target_objects).st_dev:
+        raise LocalPushUnavailable("the target is on a different filesystem")
+
+    counts = {"linked": 0, "copied": 0, "existing": 0, "bytes": 0}
+    if current != commit:
+        folders = object_files(source_objects)
+        with ThreadPoolExecutor(max_workers=LINK_WORKERS) as executor:
+            results = executor.map(lambda item: link_folder(os.path.join(source_objects, item[0]),
+                                                            os.path.join(target_objects, item[0]), item[1]),
+                                   folders.items())
+            for result in results:
+                for key, value in result.items():
+                    counts[key] += value
+        # Only once every object is in place may the branch point at them
+        update_ref(target, ref, commit, expected=current)
+    return counts
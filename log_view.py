@@ -0,0 +1,92 @@
+"""Bounded connection log.
+
+LogView keeps the on-screen log to a fixed number of lines, inserts all
+lines received during a UI tick with a single Text operation and only
+autoscrolls when the user is already looking at the end. The complete,
+untrimmed log is written to a rotating file by a background thread.
+"""
+import collections
+import logging
+import logging.handlers
+import os
+import queue
+import tkinter as tk
+
+from app_paths import app_data_dir
+
+
+# Default number of lines kept in the on-screen log
+LOG_MAX_LINES = 5000
+
+# Rotating log file size and number of backups kept on disk
+LOG_FILE_MAX_BYTES = 2 * 1024 * 1024
+LOG_FILE_BACKUPS = 5
+
+
+class LogView:
+    """Ring buffer in front of a tk.Text widget; call flush() once per UI tick"""
+
+    def __init__(self, text_widget, max_lines=LOG_MAX_LINES):
+        self.text = text_widget
+        self.max_lines = max_lines
+        # Lines that would be trimmed immediately are dropped before they reach Tk
+        self.pending = collections.deque(maxlen=max_lines)
+        self.line_count = 0
+
+    def append(self, messages):
+        """Queue messages (which may contain newlines) for the next flush"""
+        for message in messages:
+            self.pending.extend(str(message).split("\n"))
+
+    def flush(self):
+        """Insert pending lines, trim the oldest ones and autoscroll if pinned to the bottom"""
+        if not self.pending:
+            return
+
+        lines = list(self.pending)
+        self.pending.clear()
+
+        # yview()[1] is the visible fraction's bottom edge; 1.0 means the end is on screen
+        at_bottom = self.text.yview()[1] >= 0.999
+
+        self.text.insert(tk.END, "\n".join(lines) + "\n")
+        self.line_count += len(lines)
+
+        excess = self.line_count - self.max_lines
+        if excess > 0:
+            self.text.delete("1.0", f"{excess + 1}.0")
+            self.line_count -= excess
+
+        if at_bottom:
+            self.text.see(tk.END)
+
+    def clear(self):
+        """Remove everything from the view (the log file is untouched)"""
+        self.pending.clear()
+        self.text.delete("1.0", tk.END)
+        self.line_count = 0
+
+
+def setup_file_logging(name="git-oneclick", directory=None):
+    """Create a logger whose records are written to a rotating file on a background thread.
+
+    Returns (logger, listener); call listener.stop() on shutdown to flush the file.
+    """
+    directory = directory or app_data_dir("logs")
+    handler = logging.handlers.RotatingFileHandler(
+        os.path.join(directory, f"{name}.log"),
+        maxBytes=LOG_FILE_MAX_BYTES,
+        backupCount=LOG_FILE_BACKUPS,
+        encoding="utf-8"
+    )
+    handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+
+    records = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(records, handler)
+    listener.start()
+
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.handlers = [logging.handlers.QueueHandler(records)]
+    return logger, listener
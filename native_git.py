@@ -0,0 +1,466 @@
+"""In-process Git repository writer.
+
+Creates the repository skeleton, loose objects, index, refs and remote
+configuration directly on disk so a fresh project can be committed without
+spawning ``git init``/``add``/``commit``/``branch``/``remote``. Anything this
+module cannot reproduce exactly raises NativeEngineUnavailable so the caller
+can fall back to the git command line.
+"""
+import hashlib
+import os
+import platform
+import stat
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+
+class NativeEngineUnavailable(Exception):
+    """Raised when a repository needs a feature only the git binary provides"""
+
+
+# Config values that change what `git add` / `git commit` would produce
+UNSUPPORTED_CONFIG = {
+    "commit.gpgsign": "commit signing",
+    "core.hookspath": "a custom hooks path",
+    "core.fsmonitor": "a filesystem monitor",
+    "core.sparsecheckout": "sparse checkout",
+    "core.attributesfile": "a global attributes file",
+}
+
+FALSE_VALUES = ("false", "no", "off", "0")
+
+# Control characters git does not treat as printable (\b \t \f \033 are printable)
+NONPRINTABLE_BYTES = bytes(c for c in range(32) if c not in (8, 9, 10, 12, 13, 27)) + b"\x7f"
+
+# Loose objects are written with git's default core.looseCompression
+LOOSE_COMPRESSION = 1
+
+# Files larger than this are hashed in chunks instead of being read whole
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# Minimum seconds between staging progress reports
+PROGRESS_INTERVAL = 1.0
+
+
+def parse_config_list(output):
+    """Parse `git config --list -z` output into a dict of lowercased keys (last value wins)"""
+    config = {}
+    for item in output.split("\0"):
+        if not item:
+            continue
+        key, _, value = item.partition("\n")
+        config[key.lower()] = value
+    return config
+
+
+def config_bool(config, key, default=False):
+    """Interpret a git config value as a boolean"""
+    value = config.get(key)
+    if value is None:
+        return default
+    return value.strip().lower() not in FALSE_VALUES
+
+
+def autocrlf_mode(config):
+    """Normalise core.autocrlf to 'true', 'false' or 'input'"""
+    value = config.get("core.autocrlf", "false").strip().lower()
+    if value == "input":
+        return value
+    return "true" if config_bool(config, "core.autocrlf") else "false"
+
+
+def read_ref(git_dir, ref):
+    """SHA a ref such as refs/heads/main points to (loose or packed), or None"""
+    try:
+        with open(os.path.join(git_dir, ref), "r", encoding="utf-8") as f:
+            return f.read().strip() or None
+    except OSError:
+        pass
+    try:
+        with open(os.path.join(git_dir, "packed-refs"), "r", encoding="utf-8") as f:
+            for line in f:
+                sha, _, name = line.strip().partition(" ")
+                if name == ref:
+                    return sha
+    except OSError:
+        pass
+    return None
+
+
+def gather_text_stats(data):
+    """Port of git's convert.c gather_stats(): count line endings and printable bytes"""
+    cr = data.count(b"\r")
+    crlf = data.count(b"\r\n")
+    nul = data.count(b"\0")
+
+    nonprintable = len(data) - len(data.translate(None, NONPRINTABLE_BYTES))
+    # \r and \n are counted as line endings, not as printable characters
+    printable = len(data) - nonprintable - cr - data.count(b"\n")
+    # A trailing EOF (\032) is not counted as non-printable
+    if data.endswith(b"\x1a"):
+        nonprintable -= 1
+
+    return {
+        "lonecr": cr - crlf,
+        "crlf": crlf,
+        "nul": nul,
+        "printable": printable,
+        "nonprintable": nonprintable,
+    }
+
+
+def is_binary_stats(stats):
+    """Mirror git's convert_is_binary()"""
+    return bool(stats["lonecr"] or stats["nul"] or (stats["printable"] >> 7) < stats["nonprintable"])
+
+
+def convert_to_git(data, autocrlf):
+    """Apply core.autocrlf normalisation the way `git add` does without .gitattributes"""
+    if autocrlf not in ("true", "input") or b"\r\n" not in data:
+        return data
+    if is_binary_stats(gather_text_stats(data)):
+        return data
+    return data.replace(b"\r\n", b"\n")
+
+
+def tree_sort_key(entry):
+    """Git orders tree entries as if directory names ended with '/'"""
+    name, mode = entry[0], entry[1]
+    return name + b"/" if mode == b"40000" else name
+
+
+class NativeGitEngine:
+    """Writes a new repository, its first commit and remote configuration in-process"""
+
+    def __init__(self, folder_path, branch="main"):
+        self.folder_path = os.path.abspath(folder_path)
+        self.git_dir = os.path.join(self.folder_path, ".git")
+        self.branch = branch
+        self.config = {}
+        # Repository-level settings written by init_repository (lowercased keys)
+        self.local_config = None
+        self.objects_written = 0
+        self.lock = threading.Lock()
+
+    # -- repository skeleton -------------------------------------------------
+
+    def can_initialize(self):
+        """Only brand new repositories are created natively"""
+        return not os.path.lexists(self.git_dir)
+
+    def init_repository(self):
+        """Equivalent of `git init` + `git branch -M <branch>` for an empty folder"""
+        if not self.can_initialize():
+            raise NativeEngineUnavailable("the folder already contains a .git directory")
+
+        for sub in ("objects/info", "objects/pack", "refs/heads", "refs/tags", "info"):
+            os.makedirs(os.path.join(self.git_dir, sub), exist_ok=True)
+
+        self.write_file("HEAD", f"ref: refs/heads/{self.branch}\n")
+        self.write_file("description", "Unnamed repository; edit this file 'description' to name the repository.\n")
+        self.write_file("config", self.initial_config())
+
+    def initial_config(self):
+        """Build the [core] section `git init` would write on this platform"""
+        core = {
+            "repositoryformatversion": "0",
+            "filemode": "true" if self.probe_filemode() else "false",
+            "bare": "false",
+            "logallrefupdates": "true",
+        }
+        if platform.system() == "Windows":
+            core["symlinks"] = "false"
+        if self.probe_ignorecase():
+            core["ignorecase"] = "true"
+        if platform.system() == "Darwin":
+            core["precomposeunicode"] = "true"
+
+        self.local_config = {f"core.{name}": value for name, value in core.items()}
+        lines = ["[core]"] + [f"\t{name} = {value}" for name, value in core.items()]
+        return "\n".join(lines) + "\n"
+
+    def probe_filemode(self):
+        """Check whether the filesystem keeps the executable bit (as git init does)"""
+        if platform.system() == "Windows":
+            return False
+        probe = os.path.join(self.git_dir, "filemode-probe")
+        try:
+            with open(probe, "w"):
+                pass
+            os.chmod(probe, 0o755)
+            return bool(os.stat(probe).st_mode & stat.S_IXUSR)
+        except OSError:
+            return False
+        finally:
+            if os.path.exists(probe):
+                os.remove(probe)
+
+    def probe_ignorecase(self):
+        """Detect a case-insensitive filesystem by looking up HEAD with different case"""
+        return os.path.exists(os.path.join(self.git_dir, "head"))
+
+    def write_file(self, relative, content):
+        """Atomically write a text file inside .git"""
+        path = os.path.join(self.git_dir, relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".lock"
+        with open(tmp_path, "w", encoding="utf-8", newline="\n") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    def append_file(self, relative, content):
+        """Append to a text file inside .git (config sections, reflogs)"""
+        path = os.path.join(self.git_dir, relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "a", encoding="utf-8", newline="\n") as f:
+            f.write(content)
+
+    # -- configuration -------------------------------------------------------
+
+    def load_config(self, config):
+        """Accept the effective git config and refuse settings we cannot honour"""
+        self.config = config
+        for key, feature in UNSUPPORTED_CONFIG.items():
+            if key in config and config_bool(config, key):
+                raise NativeEngineUnavailable(f"{feature} is configured ({key})")
+
+    def identity(self, git_name="", git_email=""):
+        """Resolve the committer identity, preferring explicitly supplied values"""
+        name = git_name or self.config.get("user.name", "")
+        email = git_email or self.config.get("user.email", "")
+        if not name or not email:
+            raise Exception("Git user identity is not configured. Set user.name and user.email "
+                            "or choose 'First Time User'.")
+        return name, email
+
+    # -- objects ---------------------------------------------------------------
+
+    def write_object(self, obj_type, data):
+        """Store a loose object and return its hex id (skips objects that already exist)"""
+        header = f"{obj_type} {len(data)}\0".encode()
+        sha = hashlib.sha1(header + data).hexdigest()
+        path = self.object_path(sha)
+        if not os.path.exists(path):
+            fd, tmp_path = tempfile.mkstemp(prefix="tmp_obj_", dir=os.path.join(self.git_dir, "objects"))
+            with os.fdopen(fd, "wb") as f:
+                f.write(zlib.compress(header + data, LOOSE_COMPRESSION))
+            self.store_object(tmp_path, path)
+        return sha
+
+    def write_blob_stream(self, full_path, size):
+        """Hash and compress a file chunk by chunk so large assets never sit in memory"""
+        header = f"blob {size}\0".encode()
+        digest = hashlib.sha1(header)
+        compressor = zlib.compressobj(LOOSE_COMPRESSION)
+
+        fd, tmp_path = tempfile.mkstemp(prefix="tmp_obj_", dir=os.path.join(self.git_dir, "objects"))
+        try:
+            remaining = size
+            with os.fdopen(fd, "wb") as out, open(full_path, "rb") as f:
+                out.write(compressor.compress(header))
+                while True:
+                    chunk = f.read(STREAM_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    digest.update(chunk)
+                    out.write(compressor.compress(chunk))
+                out.write(compressor.flush())
+            if remaining != 0:
+                raise Exception(f"'{full_path}' changed while it was being staged")
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+        sha = digest.hexdigest()
+        path = self.object_path(sha)
+        if os.path.exists(path):
+            os.remove(tmp_path)
+        else:
+            self.store_object(tmp_path, path)
+        return sha
+
+    def object_path(self, sha):
+        """Location of a loose object inside .git/objects"""
+        return os.path.join(self.git_dir, "objects", sha[:2], sha[2:])
+
+    def store_object(self, tmp_path, path):
+        """Move a finished temporary object into place; identical objects may race"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            os.replace(tmp_path, path)
+        except OSError:
+            # Another worker stored the same content first (Windows refuses to replace it)
+            os.remove(tmp_path)
+            if not os.path.exists(path):
+                raise
+            return
+        with self.lock:
+            self.objects_written += 1
+
+    def stage_file(self, relative_path, st=None):
+        """Hash one worktree file into a blob and return its index entry"""
+        if relative_path.endswith("/"):
+            # Nested repositories would have to be recorded as gitlinks
+            raise NativeEngineUnavailable(f"nested repository at '{relative_path}'")
+        if os.path.basename(relative_path) == ".gitattributes":
+            raise NativeEngineUnavailable("the project defines .gitattributes")
+
+        full_path = os.path.join(self.folder_path, relative_path)
+        if st is None:
+            st = os.lstat(full_path)
+
+        if stat.S_ISLNK(st.st_mode) and config_bool(self.config, "core.symlinks", True):
+            mode = 0o120000
+            sha = self.write_object("blob", os.fsencode(os.readlink(full_path)))
+        elif stat.S_ISREG(st.st_mode) or stat.S_ISLNK(st.st_mode):
+            executable = st.st_mode & stat.S_IXUSR and config_bool(self.config, "core.filemode", True)
+            mode = 0o100755 if executable else 0o100644
+            autocrlf = autocrlf_mode(self.config)
+            if autocrlf == "false" and st.st_size > STREAM_CHUNK_SIZE:
+                sha = self.write_blob_stream(full_path, st.st_size)
+            else:
+                # Line ending conversion needs the whole file, exactly as git reads it
+                with open(full_path, "rb") as f:
+                    data = f.read()
+                sha = self.write_object("blob", convert_to_git(data, autocrlf))
+        else:
+            raise NativeEngineUnavailable(f"unsupported file type at '{relative_path}'")
+
+        return {
+            "path": relative_path.replace(os.sep, "/").encode("utf-8", "surrogateescape"),
+            "mode": mode,
+            "sha": sha,
+            "stat": st,
+        }
+
+    def stage_worktree(self, files, workers=None, on_progress=None):
+        """Hash files from a (path, stat) iterator on a thread pool while the walk continues.
+
+        hashlib, zlib and file reads release the GIL, so blob hashing scales across
+        cores. The number of in-flight files is bounded to keep memory flat.
+        on_progress(files, bytes) is called at most every PROGRESS_INTERVAL seconds.
+        """
+        workers = workers or min(32, (os.cpu_count() or 1) + 4)
+        entries = []
+        staged_bytes = 0
+        last_report = time.perf_counter()
+
+        def collect(done):
+            nonlocal staged_bytes, last_report
+            for future in done:
+                entry = future.result()
+                entries.append(entry)
+                staged_bytes += entry["stat"].st_size
+            now = time.perf_counter()
+            if on_progress and now - last_report >= PROGRESS_INTERVAL:
+                last_report = now
+                on_progress(len(entries), staged_bytes)
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+            try:
+                for relative_path, st in files:
+                    pending.add(pool.submit(self.stage_file, relative_path, st))
+                    if len(pending) >= workers * 4:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        collect(done)
+                done, pending = wait(pending)
+                collect(done)
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                raise
+
+        if on_progress:
+            on_progress(len(entries), staged_bytes)
+        return entries
+
+    def write_tree(self, entries):
+        """Write the tree objects for the staged entries and return the root tree id"""
+        root = {}
+        for entry in entries:
+            parts = entry["path"].split(b"/")
+            node = root
+            for part in parts[:-1]:
+                node = node.setdefault(part, {})
+            node[parts[-1]] = (b"%o" % entry["mode"], entry["sha"])
+
+        def write_node(node):
+            items = []
+            for name, child in node.items():
+                if isinstance(child, dict):
+                    items.append((name, b"40000", write_node(child)))
+                else:
+                    items.append((name, child[0], child[1]))
+            items.sort(key=tree_sort_key)
+            body = b"".join(mode + b" " + name + b"\0" + bytes.fromhex(sha) for name, mode, sha in items)
+            return self.write_object("tree", body)
+
+        return write_node(root)
+
+    def write_index(self, entries):
+        """Write a version 2 index so `git status` sees the committed files as clean"""
+        on_windows = platform.system() == "Windows"
+        body = [b"DIRC", struct.pack(">II", 2, len(entries))]
+
+        for entry in sorted(entries, key=lambda e: e["path"]):
+            st = entry["stat"]
+            path = entry["path"]
+            fields = (
+                int(st.st_ctime) & 0xFFFFFFFF, st.st_ctime_ns % 1000000000,
+                int(st.st_mtime) & 0xFFFFFFFF, st.st_mtime_ns % 1000000000,
+                0 if on_windows else st.st_dev & 0xFFFFFFFF,
+                0 if on_windows else st.st_ino & 0xFFFFFFFF,
+                entry["mode"],
+                0 if on_windows else st.st_uid & 0xFFFFFFFF,
+                0 if on_windows else st.st_gid & 0xFFFFFFFF,
+                st.st_size & 0xFFFFFFFF,
+            )
+            record = struct.pack(">10I", *fields) + bytes.fromhex(entry["sha"])
+            record += struct.pack(">H", min(len(path), 0xFFF)) + path
+            # Entries are NUL-terminated and padded to a multiple of eight bytes
+            record += b"\0" * (8 - len(record) % 8)
+            body.append(record)
+
+        data = b"".join(body)
+        data += hashlib.sha1(data).digest()
+
+        index_path = os.path.join(self.git_dir, "index")
+        with open(index_path + ".lock", "wb") as f:
+            f.write(data)
+        os.replace(index_path + ".lock", index_path)
+
+    # -- commits, refs and remotes --------------------------------------------
+
+    def commit(self, tree_sha, message, name, email):
+        """Create a root commit, point the branch at it and record the reflog"""
+        timestamp = int(time.time())
+        offset = time.localtime(timestamp).tm_gmtoff
+        sign = "+" if offset >= 0 else "-"
+        offset = abs(offset) // 60
+        signature = f"{name} <{email}> {timestamp} {sign}{offset // 60:02d}{offset % 60:02d}"
+
+        body = (f"tree {tree_sha}\n"
+                f"author {signature}\n"
+                f"committer {signature}\n"
+                f"\n{message}\n").encode("utf-8")
+        commit_sha = self.write_object("commit", body)
+
+        ref = f"refs/heads/{self.branch}"
+        self.write_file(ref, commit_sha + "\n")
+        reflog = f"{'0' * 40} {commit_sha} {signature}\tcommit (initial): {message}\n"
+        self.append_file(f"logs/{ref}", reflog)
+        self.append_file("logs/HEAD", reflog)
+        return commit_sha
+
+    def add_remote(self, name, url):
+        """Equivalent of `git remote add <name> <url>`"""
+        self.append_file("config",
+                         f'[remote "{name}"]\n'
+                         f"\turl = {url}\n"
+                         f"\tfetch = +refs/heads/*:refs/remotes/{name}/*\n")
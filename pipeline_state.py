@@ -0,0 +1,91 @@
+"""Checkpoints that let an interrupted setup resume where it stopped.
+
+After each step GitSetupPipeline records what it did in
+``.git/oneclick-state.json``:
+
+    {"version": 1,
+     "steps": {"files": {"dev_type": "unity"}, "commit": {"commit": "<sha>"},
+               "remote": {"remotes": {"origin": "...", "oneclick-mirror-1": "..."}},
+               "pushed": {"origin": {"url": "...", "commit": "<sha>"}}, ...},
+     "failed": {"step": "push", "error": "..."}}
+
+A rerun skips steps whose checkpoint is still valid, so a failed push does
+not redo the expensive staging and commit. A successful run deletes the
+file, so running setup again later commits whatever changed since. The file lives inside .git, so it
+is never committed and disappears with the repository.
+"""
+import json
+import os
+
+from template_store import atomic_write
+
+
+STATE_FILE = "oneclick-state.json"
+
+# Bumped whenever the recorded structure changes; older files are ignored
+STATE_VERSION = 1
+
+
+class PipelineState:
+    """Completed steps of one project folder's setup"""
+
+    def __init__(self, folder_path):
+        self.git_dir = os.path.join(folder_path, ".git")
+        self.path = os.path.join(self.git_dir, STATE_FILE)
+        self.steps = {}
+        self.failed = None
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("version") != STATE_VERSION:
+            return
+        self.steps = data.get("steps") or {}
+        self.failed = data.get("failed")
+
+    @property
+    def resumed(self):
+        """True when an earlier run left checkpoints behind"""
+        return bool(self.steps)
+
+    def get(self, step):
+        """Details recorded for a completed step, or None"""
+        return self.steps.get(step)
+
+    def complete(self, step, details=None):
+        self.steps[step] = details or {}
+        if self.failed and self.failed.get("step") == step:
+            self.failed = None
+        self.save()
+
+    def fail(self, step, error):
+        self.failed = {"step": step, "error": str(error)}
+        self.save()
+
+    def finish(self):
+        """Forget everything once a run succeeded, so the next run starts from scratch"""
+        self.steps = {}
+        self.failed = None
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+    def discard(self, *steps):
+        """Forget steps whose result no longer holds"""
+        for step in steps:
+            self.steps.pop(step, None)
+
+    def save(self):
+        # Before `init` there is no .git yet; those checkpoints are written with the next step
+        if not os.path.isdir(self.git_dir):
+            return
+        payload = {"version": STATE_VERSION, "steps": self.steps, "failed": self.failed}
+        try:
+            atomic_write(self.path, json.dumps(payload, indent=2) + "\n")
+        except OSError:
+            pass
@@ -0,0 +1,67 @@
+"""Tell transient push failures from permanent ones and space out retries.
+
+Network hiccups (DNS, timeouts, dropped connections, 5xx from the host) are
+worth retrying; wrong credentials, missing repositories and rejected refs
+are not, and retrying them only delays the error. Failures that match
+neither list are treated as permanent.
+"""
+import random
+import re
+
+
+# Extra attempts after the first one for transient failures
+PUSH_RETRIES = 3
+
+# Seconds before the first retry; doubled for every further attempt
+PUSH_BACKOFF = 2.0
+
+# Upper bound for a single wait
+PUSH_BACKOFF_MAX = 30.0
+
+AUTH_PATTERNS = re.compile(
+    r"Authentication failed|Permission denied \(publickey|could not read Username|could not read Password"
+    r"|Invalid username or password|The requested URL returned error: 40[13]|Host key verification failed",
+    re.IGNORECASE,
+)
+
+NOT_FOUND_PATTERNS = re.compile(
+    r"Repository not found|does not appear to be a git repository|The requested URL returned error: 404",
+    re.IGNORECASE,
+)
+
+REJECTED_PATTERNS = re.compile(
+    r"\[rejected\]|\[remote rejected\]|non-fast-forward|pre-receive hook declined|GH001|exceeds GitHub's file size limit",
+    re.IGNORECASE,
+)
+
+TRANSIENT_PATTERNS = re.compile(
+    r"Could not resolve host|Could not resolve hostname|Connection timed out|Operation timed out|timed out"
+    r"|Connection reset|Connection refused|Failed to connect|remote end hung up unexpectedly|early EOF"
+    r"|RPC failed|unexpected disconnect|Empty reply from server|SSL_ERROR|GnuTLS|TLS connection"
+    r"|The requested URL returned error: (?:429|5\d\d)|HTTP/2 stream \d+ was not closed cleanly"
+    r"|Temporary failure in name resolution|Network is unreachable|broken pipe",
+    re.IGNORECASE,
+)
+
+
+def classify_push_error(output):
+    """'auth', 'not_found', 'rejected', 'transient' or 'error' for the stderr of a failed push"""
+    if AUTH_PATTERNS.search(output):
+        return "auth"
+    if NOT_FOUND_PATTERNS.search(output):
+        return "not_found"
+    if REJECTED_PATTERNS.search(output):
+        return "rejected"
+    if TRANSIENT_PATTERNS.search(output):
+        return "transient"
+    return "error"
+
+
+def backoff_delay(attempt, base=PUSH_BACKOFF, cap=PUSH_BACKOFF_MAX):
+    """Wait before retry number `attempt` (1-based): exponential, capped, with jitter
+
+    The jitter keeps several remotes (or batch workers) that failed together
+    from retrying in lockstep against the same host.
+    """
+    delay = min(cap, base * 2 ** (attempt - 1))
+    return delay * random.uniform(0.5, 1.0)
@@ -0,0 +1,306 @@
+"""README templates with variables, conditionals and includes.
+
+Syntax (a small subset of Jinja):
+
+    {{ project_name }}                       variable, empty when unknown
+    {{ unity_version | default("[Your Unity Version]") }}
+    {{ project_name | upper }}               filters: default, upper, lower, title
+    {% if remote_url %} ... {% elif author %} ... {% else %} ... {% endif %}
+    {% if not python_version %} / {% if dev_type == "Unity" %} / {% if a and b %}
+    {% include "_about" %}                   README of another template or fragment
+
+A block tag alone on its line removes that whole line, so conditionals do
+not leave blank lines behind. Templates without any tags render verbatim.
+
+Each distinct template text is compiled once into a tree of closures and
+cached, so rendering the same type for hundreds of repositories only walks
+the tree.
+"""
+import datetime
+import functools
+import json
+import os
+import re
+
+from template_resolver import TemplateError
+
+
+class TemplateSyntaxError(TemplateError):
+    """A README template that cannot be compiled"""
+
+
+# Includes nested deeper than this are assumed to be recursive
+MAX_INCLUDE_DEPTH = 10
+
+TOKEN_PATTERN = re.compile(
+    r"(?P<line>^[ \t]*\{%(?P<line_tag>(?:[^%\n]|%(?!\}))*)%\}[ \t]*(?:\n|\Z))"
+    r"|\{%(?P<tag>(?:[^%\n]|%(?!\}))*)%\}"
+    r"|\{\{(?P<expr>(?:[^}\n]|\}(?!\}))*)\}\}",
+    re.MULTILINE,
+)
+NAME_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+STRING_PATTERN = re.compile(r'^"((?:[^"\\]|\\.)*)"$|^\'((?:[^\'\\]|\\.)*)\'$')
+FILTER_PATTERN = re.compile(r"^([a-z_]+)\s*(?:\((.*)\))?$")
+
+# Escapes understood in string literals; any other backslash is kept as written
+ESCAPE_PATTERN = re.compile(r"\\(.)", re.DOTALL)
+ESCAPES = {"\\": "\\", '"': '"', "'": "'", "n": "\n", "t": "\t"}
+
+FILTERS = {
+    "upper": lambda value: value.upper(),
+    "lower": lambda value: value.lower(),
+    "title": lambda value: value.title(),
+}
+
+
+def parse_string(text):
+    match = STRING_PATTERN.match(text.strip())
+    if not match:
+        raise TemplateSyntaxError(f"Expected a quoted string, got {text.strip()!r}")
+    value = match.group(1) if match.group(1) is not None else match.group(2)
+    return ESCAPE_PATTERN.sub(lambda escape: ESCAPES.get(escape.group(1), escape.group(0)), value)
+
+
+def parse_name(text):
+    name = text.strip()
+    if not NAME_PATTERN.match(name):
+        raise TemplateSyntaxError(f"Invalid variable name {name!r}")
+    return name
+
+
+def compile_expression(text):
+    """{{ name | filter(arg) | ... }} -> function(context) returning a string"""
+    name, *filters = text.split("|")
+    name = parse_name(name)
+    steps = []
+    for item in filters:
+        match = FILTER_PATTERN.match(item.strip())
+        if not match:
+            raise TemplateSyntaxError(f"Invalid filter {item.strip()!r}")
+        filter_name, argument = match.groups()
+        if filter_name == "default":
+            fallback = parse_string(argument or '""')
+            steps.append(lambda value, fallback=fallback: value or fallback)
+        elif filter_name in FILTERS and argument is None:
+            steps.append(FILTERS[filter_name])
+        else:
+            raise TemplateSyntaxError(f"Unknown filter {filter_name!r}")
+
+    def evaluate(context):
+        value = context.get(name)
+        value = "" if value is None else str(value)
+        for step in steps:
+            value = step(value)
+        return value
+    return evaluate
+
+
+def compile_condition(text):
+    """`a`, `not a`, `a == "x"`, `a != "x"`, joined with `and` / `or`"""
+    alternatives = []
+    for alternative in re.split(r"\s+or\s+", text.strip()):
+        terms = []
+        for term in re.split(r"\s+and\s+", alternative.strip()):
+            term = term.strip()
+            negate = term.startswith("not ")
+            if negate:
+                term = term[4:]
+            comparison = re.match(r"^(\w+)\s*(==|!=)\s*(.+)$", term)
+            if comparison:
+                name, operator, literal = comparison.groups()
+                name, literal = parse_name(name), parse_string(literal)
+                if operator == "==":
+                    check = lambda context, name=name, literal=literal: str(context.get(name) or "") == literal
+                else:
+                    check = lambda context, name=name, literal=literal: str(context.get(name) or "") != literal
+            else:
+                name = parse_name(term)
+                check = lambda context, name=name: bool(context.get(name))
+            if negate:
+                check = lambda context, check=check: not check(context)
+            terms.append(check)
+        alternatives.append(lambda context, terms=terms: all(term(context) for term in terms))
+    return lambda context: any(alternative(context) for alternative in alternatives)
+
+
+class CompiledTemplate:
+    """A parsed README template; render() only walks the prepared node list"""
+
+    def __init__(self, nodes):
+        self.nodes = nodes
+
+    def render(self, context, loader=None, depth=0):
+        out = []
+        render_nodes(self.nodes, context, loader, depth, out)
+        return "".join(out)
+
+
+def render_nodes(nodes, context, loader, depth, out):
+    for kind, payload in nodes:
+        if kind == "text":
+            out.append(payload)
+        elif kind == "expr":
+            out.append(payload(context))
+        elif kind == "if":
+            branches, otherwise = payload
+            for condition, body in branches:
+                if condition(context):
+                    render_nodes(body, context, loader, depth, out)
+                    break
+            else:
+                render_nodes(otherwise, context, loader, depth, out)
+        elif kind == "include":
+            if loader is None:
+                raise TemplateError(f"Cannot include '{payload}' without a template loader")
+            if depth >= MAX_INCLUDE_DEPTH:
+                raise TemplateError(f"README includes nested too deeply at '{payload}'")
+            out.append(compile_template(loader(payload)).render(context, loader, depth + 1))
+
+
+@functools.lru_cache(maxsize=512)
+def compile_template(text):
+    """Compile README template text (cached per distinct text)"""
+    root = []
+    # Open {% if %} blocks as [(branches, else_body), body being filled]
+    stack = []
+    body = root
+    position = 0
+
+    for match in TOKEN_PATTERN.finditer(text):
+        if match.start() > position:
+            body.append(("text", text[position:match.start()]))
+        position = match.end()
+
+        if match.group("expr") is not None:
+            body.append(("expr", compile_expression(match.group("expr"))))
+            continue
+
+        tag = (match.group("line_tag") if match.group("line") else match.group("tag")).strip()
+        keyword, _, argument = tag.partition(" ")
+        if keyword == "if":
+            block = ([(compile_condition(argument), [])], [])
+            body.append(("if", block))
+            body = block[0][0][1]
+            stack.append([block, body])
+        elif keyword in ("elif", "else", "endif"):
+            if not stack:
+                raise TemplateSyntaxError(f"{{% {keyword} %}} without {{% if %}}")
+            block, current = stack[-1]
+            if current is block[1] and keyword != "endif":
+                raise TemplateSyntaxError(f"{{% {keyword} %}} after {{% else %}}")
+            if keyword == "elif":
+                body = []
+                block[0].append((compile_condition(argument), body))
+                stack[-1][1] = body
+            elif keyword == "else":
+                body = block[1]
+                stack[-1][1] = body
+            else:
+                stack.pop()
+                body = stack[-1][1] if stack else root
+        elif keyword == "include":
+            body.append(("include", parse_string(argument)))
+        else:
+            raise TemplateSyntaxError(f"Unknown tag {{% {tag} %}}")
+
+    if stack:
+        raise TemplateSyntaxError("Missing {% endif %}")
+    if position < len(text):
+        body.append(("text", text[position:]))
+    return CompiledTemplate(root)
+
+
+# -- Context -------------------------------------------------------------------
+
+def read_text(path, limit=256 * 1024):
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return f.read(limit)
+    except OSError:
+        return None
+
+
+def read_json(path):
+    text = read_text(path)
+    if text is None:
+        return {}
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def mapping(value):
+    """value when it is a JSON object; legacy manifests use lists or null for some fields"""
+    return value if isinstance(value, dict) else {}
+
+
+def first_match(pattern, text):
+    if not text:
+        return None
+    match = re.search(pattern, text, re.MULTILINE)
+    return match.group(1).strip() if match else None
+
+
+def detect_versions(folder_path):
+    """Tool and project versions declared by files in the project root (only a few small reads)"""
+    versions = {}
+
+    package = read_json(os.path.join(folder_path, "package.json"))
+    dependencies = {**mapping(package.get("devDependencies")), **mapping(package.get("dependencies"))}
+    node = mapping(package.get("engines")).get("node")
+    node = node or (read_text(os.path.join(folder_path, ".nvmrc")) or "").strip() or None
+    composer = read_json(os.path.join(folder_path, "composer.json"))
+    pyproject = read_text(os.path.join(folder_path, "pyproject.toml"))
+    pubspec = read_text(os.path.join(folder_path, "pubspec.yaml"))
+
+    found = {
+        "project_version": package.get("version") or first_match(r'^version\s*=\s*"([^"]+)"', pyproject)
+                           or first_match(r"^version:\s*([^\s#]+)", pubspec),
+        "project_description": package.get("description"),
+        "node_version": node,
+        "next_version": dependencies.get("next"),
+        "react_version": dependencies.get("react"),
+        "python_version": (read_text(os.path.join(folder_path, ".python-version")) or "").strip()
+                          or first_match(r'^requires-python\s*=\s*"([^"]+)"', pyproject),
+        "unity_version": first_match(r"^m_EditorVersion:\s*(\S+)",
+                                     read_text(os.path.join(folder_path, "ProjectSettings", "ProjectVersion.txt"))),
+        # The Dart constraint under `environment:`, not the `sdk: flutter` of dependencies
+        "dart_sdk": first_match(r"^environment:[ \t]*\n(?:[ \t]+.*\n)*?[ \t]+sdk:[ \t]*[\"']?([^\"'\n]+)", pubspec),
+        "php_version": mapping(composer.get("require")).get("php"),
+        "laravel_version": mapping(composer.get("require")).get("laravel/framework"),
+    }
+    # Hand-edited manifests can hold numbers or lists where a version string belongs
+    versions.update({key: value for key, value in found.items() if value and isinstance(value, str)})
+    return versions
+
+
+def repository_name(remote_url):
+    """'owner/repo' style name from a remote URL or path"""
+    name = remote_url.rstrip("/").replace(":", "/").split("/")[-1] if remote_url else ""
+    return name[:-4] if name.endswith(".git") else name
+
+
+def readme_context(folder_path, remote_url="", dev_type_name="", author="", author_email="", today=None,
+                   detect=True):
+    """Variables available to README templates; detect=False leaves out what the project files declare"""
+    today = today or datetime.date.today()
+    context = {
+        "project_name": os.path.basename(os.path.abspath(folder_path)),
+        "remote_url": remote_url,
+        "repo_name": repository_name(remote_url),
+        "dev_type": dev_type_name,
+        "author": author,
+        "author_email": author_email,
+        "date": today.isoformat(),
+        "year": str(today.year),
+    }
+    if detect:
+        context.update(detect_versions(folder_path))
+    return context
+
+
+def render_readme(template_text, context, loader=None):
+    """Render README template text; loader(type_id) returns the README template to include"""
+    return compile_template(template_text).render(context, loader)
@@ -0,0 +1,162 @@
+"""Timing spans for a setup run, exportable as JSON or a Chrome trace.
+
+    trace = RunTrace("setup", counters=lambda: {"subprocesses": pipeline.git_processes})
+    with trace.span("commit"):
+        with trace.span("stage"):
+            ...
+            trace.add(files=120, bytes=4_000_000)
+
+Each span records its wall time, how much every counter moved while it was
+open, and the files/bytes added to it. Spans nest per thread, so steps that
+fan out (parallel pushes) show up on their own rows. ``to_chrome_trace()``
+produces the Trace Event Format read by chrome://tracing and Perfetto.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from app_paths import app_data_dir
+
+
+# How many traces the GUI keeps in the app data folder
+TRACE_HISTORY = 20
+
+
+class RunTrace:
+    """Spans recorded during one run"""
+
+    def __init__(self, name="setup", counters=None):
+        self.name = name
+        # counters() -> {name: number}; each span records how much these grew
+        self.counters = counters or (lambda: {})
+        self.started_at = time.time()
+        self.origin = time.perf_counter()
+        self.spans = []
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.thread_ids = {}
+
+    def stack(self):
+        if not hasattr(self.local, "stack"):
+            self.local.stack = []
+        return self.local.stack
+
+    def thread_index(self):
+        ident = threading.get_ident()
+        with self.lock:
+            return self.thread_ids.setdefault(ident, len(self.thread_ids))
+
+    @contextmanager
+    def span(self, name, **args):
+        """Time the enclosed block; keyword arguments are stored with the span"""
+        stack = self.stack()
+        record = {
+            "name": name,
+            "depth": len(stack),
+            "thread": self.thread_index(),
+            "start": time.perf_counter() - self.origin,
+            "files": 0,
+            "bytes": 0,
+        }
+        if args:
+            record["args"] = args
+        before = self.counters()
+        stack.append(record)
+        try:
+            yield record
+        except BaseException as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            stack.pop()
+            record["duration"] = time.perf_counter() - self.origin - record["start"]
+            after = self.counters()
+            for key, value in after.items():
+                # Values the block set itself (e.g. work done on other threads) are kept and added to
+                record[key] = record.get(key, 0) + value - before.get(key, 0)
+            with self.lock:
+                self.spans.append(record)
+
+    def add(self, files=0, bytes=0):
+        """Count files and bytes towards the innermost open span of this thread"""
+        stack = self.stack()
+        if stack:
+            stack[-1]["files"] += files
+            stack[-1]["bytes"] += bytes
+
+    def step_totals(self):
+        """{span name: seconds} for the pipeline's top-level spans, in the order they started
+
+        Spans opened on worker threads (the parallel pushes) are part of the
+        step that started them and are not counted again.
+        """
+        top = sorted((span for span in self.spans if span["depth"] == 0 and span["thread"] == 0),
+                     key=lambda span: span["start"])
+        totals = {}
+        for span in top:
+            totals[span["name"]] = round(totals.get(span["name"], 0.0) + span["duration"], 4)
+        return totals
+
+    def summary(self, limit=None):
+        """'commit 1.20s, push 0.80s, ...' for the top-level spans, slowest first"""
+        ranked = sorted(self.step_totals().items(), key=lambda item: -item[1])
+        return ", ".join(f"{name} {seconds:.2f}s" for name, seconds in ranked[:limit])
+
+    # -- Export ----------------------------------------------------------------
+
+    def to_json(self):
+        spans = sorted(self.spans, key=lambda span: span["start"])
+        return {
+            "name": self.name,
+            "started_at": self.started_at,
+            "duration": max((span["start"] + span["duration"] for span in spans), default=0.0),
+            "steps": self.step_totals(),
+            "spans": [dict(span, start=round(span["start"], 6), duration=round(span["duration"], 6))
+                      for span in spans],
+        }
+
+    def to_chrome_trace(self):
+        """Trace Event Format: one complete ("X") event per span, microsecond timestamps"""
+        events = [{"name": "process_name", "ph": "M", "pid": 1, "tid": 0, "args": {"name": self.name}}]
+        for index in sorted(set(self.thread_ids.values())):
+            events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": index,
+                           "args": {"name": "pipeline" if index == 0 else f"worker {index}"}})
+        for span in sorted(self.spans, key=lambda span: span["start"]):
+            details = {key: value for key, value in span.items()
+                       if key not in ("name", "depth", "thread", "start", "duration", "args")}
+            details.update(span.get("args", {}))
+            events.append({
+                "name": span["name"],
+                "ph": "X",
+                "ts": round(span["start"] * 1e6, 1),
+                "dur": round(span["duration"] * 1e6, 1),
+                "pid": 1,
+                "tid": span["thread"],
+                "args": details,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms",
+                "otherData": {"started_at": self.started_at}}
+
+    def save(self, path, format="chrome"):
+        """Write the trace as "chrome" (Trace Event Format) or "json" (plain span list)"""
+        data = self.to_chrome_trace() if format == "chrome" else self.to_json()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=1)
+        return path
+
+
+def save_run_trace(trace, directory=None, keep=TRACE_HISTORY):
+    """Save a Chrome trace into the app's traces folder and prune all but the newest `keep`"""
+    directory = directory or app_data_dir("traces")
+    stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(trace.started_at))
+    path = trace.save(os.path.join(directory, f"{trace.name}-{stamp}.trace.json"))
+
+    traces = sorted(name for name in os.listdir(directory) if name.endswith(".trace.json"))
+    for name in traces[:-keep]:
+        try:
+            os.unlink(os.path.join(directory, name))
+        except OSError:
+            pass
+    return path
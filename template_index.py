@@ -0,0 +1,220 @@
+"""In-memory search over development types.
+
+TemplateIndex keeps an inverted index from lower-cased word tokens to the
+types containing them, weighted by the field they came from (id > name >
+description > gitignore lines). Queries match each word as a prefix of an
+indexed token; a word with no prefix match falls back to id/name tokens one
+edit away, so "pyhton" still finds Python. Every query word must match.
+
+Very short prefixes ("p") can expand to thousands of tokens in a large
+catalogue; when that happens only id and name tokens are consulted, which
+are the ones that would rank first anyway.
+
+The index has no UI dependencies and can be used from batch scripts:
+
+    index = TemplateIndex(load_development_types("development_types.json"))
+    index.search("node web")   # -> ["web", "nextjs", ...]
+"""
+import bisect
+import re
+
+from template_resolver import TemplateError
+
+
+FIELD_WEIGHTS = {
+    "id": 8,
+    "name": 6,
+    "description": 2,
+    "gitignore": 1,
+}
+
+# Fields whose tokens also go into the small primary index
+PRIMARY_FIELDS = ("id", "name")
+
+# Multipliers applied to a field weight depending on how a query word matched
+EXACT_BONUS = 4
+PREFIX_BONUS = 2
+FUZZY_BONUS = 1
+
+# Fuzzy matching is skipped for very short words, where one edit matches almost anything
+FUZZY_MIN_LENGTH = 4
+
+# A prefix expanding to more tokens than this is matched against id/name tokens only
+MAX_PREFIX_EXPANSION = 64
+
+TOKEN_PATTERN = re.compile(r"[0-9a-z]+")
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def deletes(token):
+    """token plus every string one deletion away from it (symmetric-delete fuzzy lookup)"""
+    return {token} | {token[:i] + token[i + 1:] for i in range(len(token))}
+
+
+def type_fields(type_id, info, gitignore):
+    """(field, text) pairs indexed for one development type"""
+    yield "id", type_id
+    yield "name", info.get("name", "")
+    yield "description", info.get("description", "")
+    for line in gitignore:
+        if not line.startswith("#"):
+            yield "gitignore", line
+
+
+class TokenIndex:
+    """Postings plus a sorted vocabulary for prefix ranges"""
+
+    def __init__(self, with_fuzzy=False):
+        self.postings = {}      # token -> {type_id: weight}
+        self.vocabulary = []    # sorted tokens
+        # deletion variant -> tokens, only kept for the small primary index
+        self.delete_map = {} if with_fuzzy else None
+
+    def add(self, type_id, weights, bulk=False):
+        for token, weight in weights.items():
+            posting = self.postings.get(token)
+            if posting is None:
+                posting = self.postings[token] = {}
+                if not bulk:
+                    bisect.insort(self.vocabulary, token)
+                if self.delete_map is not None:
+                    for variant in deletes(token):
+                        self.delete_map.setdefault(variant, set()).add(token)
+            posting[type_id] = weight
+
+    def remove(self, type_id, tokens):
+        for token in tokens:
+            posting = self.postings.get(token)
+            if posting is None or posting.pop(type_id, None) is None or posting:
+                continue
+            del self.postings[token]
+            position = bisect.bisect_left(self.vocabulary, token)
+            if position < len(self.vocabulary) and self.vocabulary[position] == token:
+                del self.vocabulary[position]
+            if self.delete_map is not None:
+                for variant in deletes(token):
+                    self.delete_map.get(variant, set()).discard(token)
+
+    def sort(self):
+        self.vocabulary = sorted(self.postings)
+
+    def prefix_range(self, word):
+        start = bisect.bisect_left(self.vocabulary, word)
+        end = bisect.bisect_left(self.vocabulary, word + "\uffff", start)
+        return start, end
+
+    def fuzzy_tokens(self, word):
+        """Tokens within one insertion, deletion, substitution or transposition of word"""
+        found = set()
+        for variant in deletes(word):
+            found.update(self.delete_map.get(variant, ()))
+        return found
+
+
+class TemplateIndex:
+    """Ranked prefix/fuzzy search over a dev_types mapping, updated one type at a time"""
+
+    def __init__(self, dev_types=None, resolve=None):
+        # resolve(type_id) -> template with extends/include applied, so inherited patterns are searchable
+        self.resolve = resolve
+        self.rebuild(dev_types or {})
+
+    def __len__(self):
+        return len(self.type_tokens)
+
+    def rebuild(self, dev_types):
+        self.all = TokenIndex()
+        self.primary = TokenIndex(with_fuzzy=True)
+        self.type_tokens = {}   # type_id -> (all tokens, primary tokens), for removal
+        self.order = {}         # type_id -> catalogue position, for stable ties
+        self.word_cache = {}
+        for type_id in dev_types:
+            self.add(type_id, dev_types[type_id], bulk=True)
+        self.all.sort()
+        self.primary.sort()
+
+    def gitignore_lines(self, type_id, info):
+        if self.resolve is not None and (info.get("extends") or info.get("include")):
+            try:
+                return self.resolve(type_id)["gitignore"]
+            except TemplateError:
+                pass
+        return info.get("gitignore", [])
+
+    def add(self, type_id, info, bulk=False):
+        weights = {}
+        primary = {}
+        for field, text in type_fields(type_id, info, self.gitignore_lines(type_id, info)):
+            weight = FIELD_WEIGHTS[field]
+            for token in tokenize(text):
+                # A token counts once per type, with the weight of its best field
+                if weights.get(token, 0) < weight:
+                    weights[token] = weight
+                    if field in PRIMARY_FIELDS:
+                        primary[token] = weight
+
+        self.all.add(type_id, weights, bulk)
+        self.primary.add(type_id, primary, bulk)
+        self.type_tokens[type_id] = (tuple(weights), tuple(primary))
+        self.order.setdefault(type_id, len(self.order))
+
+    def update(self, type_id, info):
+        """Index a new or edited type"""
+        self.remove(type_id, keep_position=True)
+        self.add(type_id, info)
+
+    def remove(self, type_id, keep_position=False):
+        tokens, primary = self.type_tokens.pop(type_id, ((), ()))
+        self.all.remove(type_id, tokens)
+        self.primary.remove(type_id, primary)
+        if not keep_position:
+            self.order.pop(type_id, None)
+        self.word_cache.clear()
+
+    def word_scores(self, word):
+        """{type_id: score} for one query word; memoized until the index changes"""
+        scores = self.word_cache.get(word)
+        if scores is not None:
+            return scores
+
+        source = self.all
+        start, end = source.prefix_range(word)
+        if end - start > MAX_PREFIX_EXPANSION:
+            source = self.primary
+            start, end = source.prefix_range(word)
+        matches = [(token, EXACT_BONUS if token == word else PREFIX_BONUS)
+                   for token in source.vocabulary[start:end]]
+        if not matches and len(word) >= FUZZY_MIN_LENGTH:
+            source = self.primary
+            matches = [(token, FUZZY_BONUS) for token in source.fuzzy_tokens(word)]
+
+        scores = {}
+        for token, bonus in matches:
+            for type_id, weight in source.postings[token].items():
+                score = weight * bonus
+                if scores.get(type_id, 0) < score:
+                    scores[type_id] = score
+
+        self.word_cache[word] = scores
+        return scores
+
+    def search(self, query, limit=None):
+        """Type ids matching every word of query, best first"""
+        words = tokenize(query)
+        if not words:
+            return []
+
+        # Start from the rarest word so later intersections stay small
+        per_word = sorted((self.word_scores(word) for word in words), key=len)
+        totals = per_word[0]
+        for scores in per_word[1:]:
+            totals = {type_id: total + scores[type_id] for type_id, total in totals.items() if type_id in scores}
+            if not totals:
+                return []
+
+        order = self.order
+        ranked = sorted(totals, key=lambda type_id: (-totals[type_id], order.get(type_id, 0)))
+        return ranked[:limit] if limit else ranked
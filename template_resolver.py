@@ -0,0 +1,151 @@
+"""Template inheritance and composition.
+
+A development type may build on others:
+
+    "extends": "python"              parent type(s); their resolved .gitignore comes
+                                     first, and README/description are inherited
+                                     when the child leaves them empty
+    "include": ["_ide", "_os"]       fragments whose .gitignore lines are added
+                                     after the parents' and before the type's own
+    "abstract": true                 a fragment: only used by other types, never
+                                     offered for selection
+
+TemplateResolver flattens a type into the plain {name, description,
+gitignore, readme_template} shape the pipeline always used. Results are
+memoized per type; changing a type invalidates it and every type built on
+it, so lookups stay O(1) between edits.
+"""
+
+
+class TemplateError(Exception):
+    """A template references a missing type or inherits from itself"""
+
+
+def as_list(value):
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return list(value)
+
+
+def is_fragment(dev_types, type_id):
+    """True for abstract entries that only exist to be extended or included"""
+    check = getattr(dev_types, "is_abstract", None)
+    if check is not None:
+        return check(type_id)
+    return bool((dev_types.get(type_id) or {}).get("abstract"))
+
+
+def dependants(dev_types, type_id):
+    """Ids of the types that extend or include type_id, directly or through other types"""
+    declares = getattr(dev_types, "declares", None)
+    children = {}
+    for child_id in dev_types:
+        if declares is not None and not (declares(child_id, "extends") or declares(child_id, "include")):
+            continue
+        info = dev_types.get(child_id) or {}
+        for parent_id in as_list(info.get("extends")) + as_list(info.get("include")):
+            children.setdefault(parent_id, []).append(child_id)
+
+    found = []
+    pending = [type_id]
+    while pending:
+        for child_id in children.get(pending.pop(), ()):
+            if child_id not in found and child_id != type_id:
+                found.append(child_id)
+                pending.append(child_id)
+    return found
+
+
+def selectable_types(dev_types):
+    """Type ids a user can pick for a project, in catalogue order"""
+    return [type_id for type_id in dev_types if not is_fragment(dev_types, type_id)]
+
+
+def merge_gitignore(blocks):
+    """Concatenate .gitignore blocks, dropping patterns that are already present.
+
+    A repeated pattern is only redundant while no negation ("!pattern") has
+    been seen since its first occurrence, so negations reset the check.
+    """
+    lines = []
+    seen = set()
+    for block in blocks:
+        for line in block:
+            pattern = line.strip()
+            if pattern and not pattern.startswith("#"):
+                if pattern.startswith("!"):
+                    seen.clear()
+                elif pattern in seen:
+                    continue
+                else:
+                    seen.add(pattern)
+            lines.append(line)
+    return lines
+
+
+class TemplateResolver:
+    """Memoized flattening of extends/include chains over a dev_types mapping"""
+
+    def __init__(self, dev_types):
+        self.dev_types = dev_types
+        self.cache = {}
+        # parent id -> ids of types that extend or include it
+        self.children = {}
+
+    def resolve(self, type_id, chain=()):
+        resolved = self.cache.get(type_id)
+        if resolved is not None:
+            return resolved
+
+        if type_id in chain:
+            raise TemplateError(f"Template '{type_id}' inherits from itself ({' -> '.join(chain + (type_id,))})")
+        info = self.dev_types.get(type_id)
+        if info is None:
+            if chain:
+                raise TemplateError(f"Template '{chain[-1]}' builds on unknown template '{type_id}'")
+            raise TemplateError(f"Development type '{type_id}' not found in configuration.")
+
+        parents = as_list(info.get("extends"))
+        fragments = as_list(info.get("include"))
+        for parent_id in parents + fragments:
+            self.children.setdefault(parent_id, set()).add(type_id)
+
+        chain = chain + (type_id,)
+        bases = [self.resolve(parent_id, chain) for parent_id in parents]
+        included = [self.resolve(fragment_id, chain) for fragment_id in fragments]
+
+        def inherited(key):
+            if info.get(key):
+                return info[key]
+            return next((base[key] for base in bases if base.get(key)), "")
+
+        resolved = {
+            "name": info.get("name", type_id),
+            "description": inherited("description"),
+            "gitignore": merge_gitignore([base["gitignore"] for base in bases]
+                                         + [fragment["gitignore"] for fragment in included]
+                                         + [info.get("gitignore", [])]),
+            "readme_template": inherited("readme_template"),
+        }
+        self.cache[type_id] = resolved
+        return resolved
+
+    def invalidate(self, type_id):
+        """Forget type_id and everything that (transitively) builds on it"""
+        pending = [type_id]
+        while pending:
+            current = pending.pop()
+            self.cache.pop(current, None)
+            pending.extend(self.children.pop(current, ()))
+
+    def clear(self):
+        self.cache.clear()
+        self.children.clear()
+
+
+def resolve_template(dev_types, type_id):
+    """Resolved template for type_id, using the mapping's own memoizing resolver if it has one"""
+    resolver = getattr(dev_types, "resolver", None) or TemplateResolver(dev_types)
+    return resolver.resolve(type_id)
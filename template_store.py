@@ -0,0 +1,310 @@
+"""Persistent store for development types.
+
+development_types.json stays the source of truth and remains a plain JSON
+object, so batch mode, exports and PyInstaller keep reading it as before.
+Edits no longer rewrite it: each change is appended as one line to
+``development_types.json.journal`` and replayed on load. Once the journal
+grows past half the snapshot size it is folded back into the snapshot with
+an atomic write-and-rename.
+
+Compacted snapshots are written one type per line. Loading such a file only
+splits it into lines and reads each key; a type's body (gitignore list,
+README template) is decoded the first time that type is used. Hand-edited
+files in any other JSON layout are still accepted and simply parsed eagerly.
+
+Next to the JSON file a binary snapshot (compiled_catalogue.py) keeps the
+names, descriptions and body offsets of the last version seen. While it
+matches the JSON file, loading maps it and decodes only that index.
+"""
+import json
+import os
+import tempfile
+from collections.abc import MutableMapping
+
+from compiled_catalogue import CompiledCatalogue, CompiledEntry, build_catalogue, compiled_path
+from template_resolver import TemplateResolver
+
+
+JOURNAL_SUFFIX = ".journal"
+
+# Compact once the journal is larger than this and than half the snapshot
+COMPACT_MIN_BYTES = 256 * 1024
+
+_decoder = json.JSONDecoder()
+
+
+def _dump(value):
+    return json.dumps(value, ensure_ascii=False)
+
+
+def atomic_write(path, text):
+    """Write text (or bytes) to path so readers see either the old or the new file, never a partial one"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with (os.fdopen(fd, "wb") if isinstance(text, bytes)
+              else os.fdopen(fd, "w", encoding="utf-8", newline="\n")) as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def parse_snapshot_lines(text):
+    """Split a one-type-per-line snapshot into {type_id: raw_json}; None for other layouts"""
+    lines = text.split("\n")
+    while lines and not lines[-1].strip():
+        lines.pop()
+    if len(lines) < 2 or lines[0].strip() != "{" or lines[-1].strip() != "}":
+        return None
+
+    entries = {}
+    for line in lines[1:-1]:
+        line = line.strip()
+        if line.endswith(","):
+            line = line[:-1]
+        try:
+            type_id, end = _decoder.raw_decode(line)
+        except ValueError:
+            return None
+        body = line[end:].lstrip()
+        if not isinstance(type_id, str) or not body.startswith(":"):
+            return None
+        body = body[1:].strip()
+        if not body.startswith("{") or not body.endswith("}"):
+            return None
+        entries[type_id] = body
+    return entries
+
+
+class TemplateStore(MutableMapping):
+    """dict-like view of the development types whose writes cost O(changed type)
+
+    Values are decoded lazily: entries hold the raw JSON text read from
+    disk, a CompiledEntry pointing into the mapped snapshot, or the decoded
+    dict once it has been accessed.
+    """
+
+    def __init__(self, path, defaults=None):
+        self.path = path
+        self.journal_path = path + JOURNAL_SUFFIX
+        self.entries = {}
+        self.snapshot_bytes = 0
+        self.journal_bytes = 0
+        # Set when the file on disk cannot be trusted and must be rewritten on the next change
+        self.needs_snapshot = False
+        self._resolver = None
+        # True when the entries come from a current binary snapshot
+        self.compiled_loaded = False
+
+        if os.path.exists(path):
+            self.load_snapshot()
+        else:
+            self.entries = {type_id: dict(info) for type_id, info in (defaults or {}).items()}
+            self.needs_snapshot = True
+        self.replay_journal()
+
+    @classmethod
+    def from_types(cls, path, types):
+        """A store that holds the given types and overwrites path on the first change"""
+        store = cls.__new__(cls)
+        store.path = path
+        store.journal_path = path + JOURNAL_SUFFIX
+        store.entries = {type_id: dict(info) for type_id, info in types.items()}
+        store.snapshot_bytes = 0
+        store.journal_bytes = 0
+        store.needs_snapshot = True
+        store._resolver = None
+        store.compiled_loaded = False
+        return store
+
+    @property
+    def resolver(self):
+        """Memoized extends/include resolution, kept in step with every change"""
+        if self._resolver is None:
+            self._resolver = TemplateResolver(self)
+        return self._resolver
+
+    def changed(self, type_id=None):
+        if self._resolver is not None:
+            if type_id is None:
+                self._resolver.clear()
+            else:
+                self._resolver.invalidate(type_id)
+
+    def load_snapshot(self):
+        compiled = CompiledCatalogue.open(self.path)
+        if compiled is not None:
+            self.entries = dict(compiled.entries)
+            self.snapshot_bytes = os.path.getsize(self.path)
+            self.compiled_loaded = True
+            return
+
+        mtime_ns = os.stat(self.path).st_mtime_ns
+        with open(self.path, "rb") as f:
+            raw = f.read()
+        text = raw.decode("utf-8")
+        self.snapshot_bytes = len(text)
+
+        entries = parse_snapshot_lines(text)
+        if entries is None:
+            data = json.loads(text)
+            if not isinstance(data, dict):
+                raise ValueError(f"{self.path} does not contain a JSON object")
+            entries = data
+        self.entries = entries
+        self.write_compiled(raw, mtime_ns)
+
+    def write_compiled(self, raw, mtime_ns):
+        """Snapshot the JSON file just read so the next launch only decodes the index"""
+        try:
+            atomic_write(compiled_path(self.path), build_catalogue(raw, mtime_ns, self.entries))
+        except (OSError, ValueError, AttributeError):
+            # Read-only install folders, a snapshot mapped by another instance (Windows),
+            # or entries that are not objects: the JSON file works on its own
+            pass
+
+    def replay_journal(self):
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                journal = f.read()
+        except FileNotFoundError:
+            return
+        self.journal_bytes = len(journal)
+
+        for line in journal.split("\n"):
+            # A crash mid-append leaves a truncated last line; it is skipped
+            op, _, rest = line.partition("\t")
+            try:
+                if op == "P":
+                    id_text, _, body = rest.partition("\t")
+                    type_id = json.loads(id_text)
+                    if body.startswith("{") and body.endswith("}"):
+                        self.entries[type_id] = body
+                elif op == "D":
+                    self.entries.pop(json.loads(rest), None)
+            except ValueError:
+                continue
+
+    # -- Mapping interface -------------------------------------------------
+
+    def __getitem__(self, type_id):
+        value = self.entries[type_id]
+        if isinstance(value, str):
+            value = json.loads(value)
+            self.entries[type_id] = value
+        elif isinstance(value, CompiledEntry):
+            value = value.decode()
+            self.entries[type_id] = value
+        return value
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, type_id):
+        return type_id in self.entries
+
+    def declares(self, type_id, key):
+        """Whether type_id has a truthy key; undecoded entries without the key are answered from the raw text"""
+        value = self.entries.get(type_id)
+        if isinstance(value, CompiledEntry):
+            return value.declares(key)
+        if isinstance(value, str) and f'"{key}"' not in value:
+            return False
+        return bool(value is not None and self[type_id].get(key))
+
+    def summary(self, type_id):
+        """{"name", "description"} of a type (whichever it has), read from the snapshot index when possible"""
+        value = self.entries.get(type_id)
+        if isinstance(value, CompiledEntry):
+            return value.summary
+        info = self.get(type_id) or {}
+        return {key: info[key] for key in ("name", "description") if key in info}
+
+    def is_abstract(self, type_id):
+        return self.declares(type_id, "abstract")
+
+    def __setitem__(self, type_id, info):
+        self.update({type_id: info})
+
+    def __delitem__(self, type_id):
+        if type_id not in self.entries:
+            raise KeyError(type_id)
+        del self.entries[type_id]
+        self.changed(type_id)
+        self.append_journal([f"D\t{_dump(type_id)}"])
+
+    def update(self, types=(), **kwargs):
+        """Add or replace several types with a single journal append"""
+        self.apply(dict(types, **kwargs))
+
+    def apply(self, updates, removals=()):
+        """Add or replace updates and delete removals, all in one journal append"""
+        lines = []
+        for type_id, info in updates.items():
+            self.entries[type_id] = info
+            self.changed(type_id)
+            lines.append(f"P\t{_dump(type_id)}\t{_dump(info)}")
+        for type_id in removals:
+            if self.entries.pop(type_id, None) is not None:
+                self.changed(type_id)
+                lines.append(f"D\t{_dump(type_id)}")
+        if lines:
+            self.append_journal(lines)
+
+    def replace(self, types):
+        """Replace every type at once (import in replace mode)"""
+        self.entries = dict(types)
+        self.changed()
+        self.compact()
+
+    def to_dict(self):
+        """Fully decoded copy, e.g. for exporting"""
+        return {type_id: self[type_id] for type_id in self.entries}
+
+    # -- Persistence -------------------------------------------------------
+
+    def append_journal(self, lines):
+        if self.needs_snapshot:
+            self.compact()
+            return
+
+        text = "\n".join(lines) + "\n"
+        with open(self.journal_path, "a", encoding="utf-8", newline="\n") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        self.journal_bytes += len(text)
+
+        if self.journal_bytes > max(COMPACT_MIN_BYTES, self.snapshot_bytes // 2):
+            self.compact()
+
+    def compact(self):
+        """Fold the journal into a fresh snapshot; undecoded entries are copied verbatim"""
+        lines = []
+        for type_id, value in self.entries.items():
+            if isinstance(value, CompiledEntry):
+                body = value.text()
+            else:
+                body = value if isinstance(value, str) else _dump(value)
+            lines.append(f"  {_dump(type_id)}: {body}")
+        text = "{\n" + ",\n".join(lines) + ("\n" if lines else "") + "}\n"
+
+        atomic_write(self.path, text)
+        # Replaying an old journal over the new snapshot is harmless, so a crash here loses nothing
+        try:
+            os.unlink(self.journal_path)
+        except FileNotFoundError:
+            pass
+        self.snapshot_bytes = len(text)
+        self.journal_bytes = 0
+        self.needs_snapshot = False
@@ -0,0 +1,288 @@
+"""Guess a project's development type from the files in its folder.
+
+Each development type may declare how to recognise it:
+
+    "detect": {
+        "markers": [
+            "pubspec.yaml",                                     # a file or directory ("Assets/")
+            {"paths": ["package.json", "next.config.*"], "score": 12},
+            {"paths": ["requirements.txt"], "contains": "fastapi", "score": 10}
+        ],
+        "extensions": {".dart": 4},                             # weight x share of scanned files
+        "refines": "python"                                     # optional, see below
+    }
+
+A marker scores when every path exists (globs are allowed in the last path
+component) and, with "contains", the first path's text includes the string.
+Plain string markers score MARKER_SCORE. Scores and weights must be
+non-negative numbers; rules with any other value are ignored.
+
+A type that "refines" a more generic one (fastapi of python, nextjs of web)
+adds the generic type's score to its own once one of its own markers
+matched, so a FastAPI project always outranks plain Python by at least the
+FastAPI markers, however many generic Python files it also has. Without a
+marker of its own the refinement does not score at all.
+
+Markers only need a few stat calls. The extension histogram comes from a
+breadth-first walk that stops after MAX_SCAN_ENTRIES entries or SCAN_BUDGET
+seconds, skips dependency and build folders, and is not started at all when
+the markers already decide the ranking.
+"""
+import fnmatch
+import os
+import sys
+import time
+from collections import Counter, deque, namedtuple
+
+from template_resolver import as_list, is_fragment
+
+
+MARKER_SCORE = 10
+
+# Limits for the extension walk; together they keep detection well under 100 ms
+MAX_SCAN_ENTRIES = 4000
+MAX_SCAN_DEPTH = 4
+SCAN_BUDGET = 0.05
+
+# Folders that are large and say nothing about the project's own sources
+SKIP_DIRS = {
+    ".git", ".hg", ".svn", "node_modules", "vendor", "venv", ".venv", "env", "__pycache__",
+    "Library", "Temp", "Logs", "obj", "build", "Build", "dist", "out", ".next", ".dart_tool",
+    ".gradle", ".idea", ".vscode", "Pods", "target", "storage",
+}
+
+# Bytes of a file read for "contains" checks
+CONTAINS_READ_BYTES = 64 * 1024
+
+Candidate = namedtuple("Candidate", "type_id score confidence reasons")
+
+
+class ProjectFolder:
+    """Cached directory listings and file heads for one detection run"""
+
+    def __init__(self, root):
+        self.root = root
+        self.listings = {}
+        self.heads = {}
+
+    def listing(self, relative_dir):
+        if relative_dir not in self.listings:
+            try:
+                self.listings[relative_dir] = os.listdir(os.path.join(self.root, relative_dir))
+            except OSError:
+                self.listings[relative_dir] = []
+        return self.listings[relative_dir]
+
+    def find(self, pattern):
+        """Relative path matching pattern, or None; a trailing "/" requires a directory"""
+        want_dir = pattern.endswith("/")
+        parent, _, name = pattern.rstrip("/").replace("\\", "/").rpartition("/")
+        if any(ch in name for ch in "*?["):
+            matches = fnmatch.filter(self.listing(parent), name)
+        else:
+            matches = [name] if name in self.listing(parent) else []
+        for match in matches:
+            path = f"{parent}/{match}" if parent else match
+            if not want_dir or os.path.isdir(os.path.join(self.root, path)):
+                return path
+        return None
+
+    def head(self, relative_path):
+        if relative_path not in self.heads:
+            try:
+                with open(os.path.join(self.root, relative_path), "r", encoding="utf-8", errors="replace") as f:
+                    self.heads[relative_path] = f.read(CONTAINS_READ_BYTES)
+            except OSError:
+                self.heads[relative_path] = ""
+        return self.heads[relative_path]
+
+
+def rule_weight(value):
+    """A marker score or extension weight as a float, or None when it is negative or not a number"""
+    try:
+        weight = float(value)
+    except (TypeError, ValueError):
+        return None
+    return weight if weight >= 0 else None
+
+
+def compile_rules(dev_types):
+    """{type_id: (markers, extensions, refines)} for every selectable type that declares "detect" rules"""
+    rules = {}
+    declares = getattr(dev_types, "declares", None)
+    for type_id in dev_types:
+        if declares is not None and not declares(type_id, "detect"):
+            continue
+        if is_fragment(dev_types, type_id):
+            continue
+        detect = (dev_types.get(type_id) or {}).get("detect")
+        if not detect:
+            continue
+        markers = []
+        for marker in as_list(detect.get("markers")):
+            if isinstance(marker, str):
+                marker = {"paths": [marker]}
+            score = rule_weight(marker.get("score", MARKER_SCORE))
+            if score is not None:
+                markers.append((as_list(marker.get("paths")), marker.get("contains"), score))
+        # Negative weights could cancel the other scores out and leave nothing to rank against
+        extensions = {ext.lower(): weight for ext, weight in
+                      ((ext, rule_weight(weight)) for ext, weight in (detect.get("extensions") or {}).items())
+                      if weight is not None}
+        refines = detect.get("refines")
+        rules[type_id] = (markers, extensions, refines if isinstance(refines, str) and refines != type_id else None)
+
+    # A refinement also counts the generic type's extensions; a generic type that does not
+    # declare detect rules (or is itself a refinement) adds nothing
+    declared = {type_id: rule[2] for type_id, rule in rules.items()}
+    for type_id, (markers, extensions, refines) in rules.items():
+        parent = rules.get(refines)
+        if parent is None or declared[refines]:
+            rules[type_id] = (markers, extensions, None)
+            continue
+        merged = dict(parent[1])
+        for ext, weight in extensions.items():
+            merged[ext] = merged.get(ext, 0.0) + weight
+        rules[type_id] = (markers, merged, refines)
+    return rules
+
+
+def extension_histogram(root, deadline):
+    """Counter of file extensions from a bounded breadth-first walk"""
+    counts = Counter()
+    pending = deque([(root, 0)])
+    scanned = 0
+    while pending and scanned < MAX_SCAN_ENTRIES and time.perf_counter() < deadline:
+        directory, depth = pending.popleft()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    scanned += 1
+                    if scanned >= MAX_SCAN_ENTRIES:
+                        break
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if is_dir:
+                        if depth < MAX_SCAN_DEPTH and entry.name not in SKIP_DIRS:
+                            pending.append((entry.path, depth + 1))
+                    else:
+                        counts[os.path.splitext(entry.name)[1].lower()] += 1
+        except OSError:
+            continue
+    return counts
+
+
+def detect_types(folder_path, dev_types, rules=None):
+    """Candidate types for folder_path, best first; empty when nothing matched.
+
+    rules can be passed in (from compile_rules) when detecting many folders
+    against the same catalogue.
+    """
+    rules = compile_rules(dev_types) if rules is None else rules
+    deadline = time.perf_counter() + SCAN_BUDGET
+    folder = ProjectFolder(folder_path)
+
+    scores = {}
+    reasons = {}
+    for type_id, (markers, _, _) in rules.items():
+        for paths, contains, score in markers:
+            found = [folder.find(path) for path in paths]
+            if not all(found):
+                continue
+            if contains and contains not in folder.head(found[0]):
+                continue
+            scores[type_id] = scores.get(type_id, 0.0) + score
+            reasons.setdefault(type_id, []).append(" + ".join(found))
+    # Refinements that matched build on their generic type's markers
+    matched = set(scores)
+    for type_id, (_, _, refines) in rules.items():
+        if refines and type_id in matched and refines in matched:
+            scores[type_id] += scores[refines]
+            reasons[type_id] = reasons[refines] + reasons[type_id]
+
+    # The walk can add at most the largest extension weight to any type; skip it
+    # when that could not change which type comes first
+    ranked = sorted(scores.values(), reverse=True)
+    max_extension = max((max(ext.values(), default=0) for _, ext, _ in rules.values()), default=0)
+    decided = ranked and (len(ranked) == 1 and ranked[0] > max_extension
+                          or len(ranked) > 1 and ranked[0] - ranked[1] > max_extension)
+
+    if not decided and max_extension:
+        counts = extension_histogram(folder_path, deadline)
+        total = sum(counts.values())
+        if total:
+            for type_id, (_, extensions, refines) in rules.items():
+                if refines and type_id not in matched:
+                    continue
+                for ext, weight in extensions.items():
+                    if counts[ext]:
+                        share = counts[ext] / total
+                        scores[type_id] = scores.get(type_id, 0.0) + weight * share
+                        reasons.setdefault(type_id, []).append(f"{share:.0%} {ext} files")
+
+    total_score = sum(scores.values())
+    candidates = [Candidate(type_id, round(score, 2), score / total_score, reasons[type_id])
+                  for type_id, score in scores.items() if score > 0]
+    candidates.sort(key=lambda candidate: -candidate.score)
+    return candidates
+
+
+def detect_type(folder_path, dev_types, default=None, rules=None):
+    """The most likely type id for folder_path, or default when nothing matched"""
+    candidates = detect_types(folder_path, dev_types, rules)
+    return candidates[0].type_id if candidates else default
+
+
+# Folders each shipped type must be recognised from; `python type_detector.py` checks them
+DETECTION_FIXTURES = {
+    "python": {"requirements.txt": "requests\n", "main.py": "", "tool/util.py": ""},
+    "fastapi": {"requirements.txt": "fastapi\nuvicorn\n", "main.py": "", "app/__init__.py": "",
+                "app/routes.py": "", "app/models.py": ""},
+    "web": {"package.json": "{}", "index.html": "", "app.js": "", "style.css": ""},
+    "nextjs": {"package.json": '{"dependencies": {"next": "14.2.0", "react": "18.3.0"}}',
+               "next.config.js": "", "pages/index.js": "", "pages/about.js": ""},
+    "unity": {"ProjectSettings/ProjectVersion.txt": "m_EditorVersion: 2022.3.1f1\n", "Assets/Player.cs": ""},
+    "flutter": {"pubspec.yaml": "name: app\n", "lib/main.dart": ""},
+    "laravel": {"artisan": "", "composer.json": '{"require": {"laravel/framework": "^11.0"}}', "app/User.php": ""},
+    "android": {"app/src/main/AndroidManifest.xml": "", "settings.gradle": "", "gradlew": ""},
+}
+
+
+def check_detection(dev_types, fixtures=DETECTION_FIXTURES):
+    """{expected type: detected type} for every fixture folder that is recognised as something else"""
+    import tempfile
+
+    rules = compile_rules(dev_types)
+    mismatches = {}
+    for expected, files in fixtures.items():
+        if expected not in rules:
+            continue
+        with tempfile.TemporaryDirectory() as folder:
+            for relative, text in files.items():
+                path = os.path.join(folder, *relative.split("/"))
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(text)
+            detected = detect_type(folder, dev_types, rules=rules)
+        if detected != expected:
+            mismatches[expected] = detected
+    return mismatches
+
+
+def main(argv=None):
+    """Check a catalogue's detection rules against DETECTION_FIXTURES"""
+    from git_pipeline import load_development_types
+
+    argv = sys.argv[1:] if argv is None else argv
+    config = argv[0] if argv else os.path.join(os.path.dirname(os.path.abspath(__file__)), "development_types.json")
+    mismatches = check_detection(load_development_types(config))
+    for expected, detected in mismatches.items():
+        print(f"{expected} fixture detected as {detected or 'nothing'}")
+    print("Detection rules OK" if not mismatches else f"{len(mismatches)} fixtures misdetected")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+"""Virtualized development-type picker.
+
+Only ``visible_rows`` rows of widgets ever exist. Scrolling or filtering
+moves a window over the list of type ids and re-labels those rows, so
+the cost of opening the window or editing a type does not depend on how
+many types are installed.
+"""
+import tkinter as tk
+from tkinter import ttk
+
+
+# Number of rows (and therefore widgets) kept alive
+PICKER_VISIBLE_ROWS = 6
+
+# Delay before a filter keystroke is applied, so fast typing filters once
+FILTER_DELAY_MS = 60
+
+
+class TypePicker(ttk.Frame):
+    """Searchable radio list over a dev_types mapping bound to a StringVar"""
+
+    def __init__(self, parent, dev_types, variable, search, emoji_for=None, selectable=None,
+                 visible_rows=PICKER_VISIBLE_ROWS):
+        super().__init__(parent, style="Glass.TFrame")
+        self.dev_types = dev_types
+        self.variable = variable
+        # search(query) -> ranked type ids, e.g. TemplateIndex.search
+        self.search = search
+        self.emoji_for = emoji_for or (lambda type_id: "")
+        # selectable(type_id) -> False hides an entry (e.g. template fragments)
+        self.selectable = selectable or (lambda type_id: True)
+        self.visible_rows = visible_rows
+
+        self.order = [type_id for type_id in dev_types if self.selectable(type_id)]
+        self.visible_ids = list(self.order)
+        self.top = 0
+        self.filter_job = None
+
+        # Type-ahead filter
+        filter_row = ttk.Frame(self, style="Glass.TFrame")
+        filter_row.pack(fill=tk.X, pady=(0, 6))
+        ttk.Label(filter_row, text="🔍 Search:", style="Glass.TLabel").pack(side=tk.LEFT)
+        self.filter_var = tk.StringVar(value="")
+        self.filter_entry = ttk.Entry(filter_row, textvariable=self.filter_var, style="Glass.TEntry")
+        self.filter_entry.pack(side=tk.LEFT, padx=8, fill=tk.X, expand=True)
+        self.count_label = ttk.Label(filter_row, text="", style="Glass.TLabel", font=("Segoe UI", 8))
+        self.count_label.pack(side=tk.LEFT)
+        self.filter_var.trace_add("write", self.schedule_filter)
+        self.filter_entry.bind("<Return>", self.select_first_match)
+
+        # Fixed pool of recycled rows plus a scrollbar driven by row index
+        body = ttk.Frame(self, style="Glass.TFrame")
+        body.pack(fill=tk.X)
+        self.scrollbar = ttk.Scrollbar(body, orient="vertical", command=self.yview,
+                                       style="Glass.Vertical.TScrollbar")
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        rows_frame = ttk.Frame(body, style="Glass.TFrame")
+        rows_frame.pack(side=tk.LEFT, fill=tk.X, expand=True)
+
+        self.rows = []
+        for _ in range(visible_rows):
+            row = ttk.Frame(rows_frame, style="Glass.TFrame")
+            radio = ttk.Radiobutton(row, variable=variable, style="Glass.TRadiobutton")
+            radio.pack(side=tk.LEFT)
+            desc = ttk.Label(row, style="Glass.TLabel", font=("Segoe UI", 8))
+            desc.pack(side=tk.LEFT, padx=(10, 0))
+            for widget in (rows_frame, row, radio, desc):
+                widget.bind("<MouseWheel>", self.on_mousewheel)
+                widget.bind("<Button-4>", self.on_mousewheel)
+                widget.bind("<Button-5>", self.on_mousewheel)
+            self.rows.append((row, radio, desc))
+
+        self.render()
+
+    # -- Data ----------------------------------------------------------------
+
+    def info(self, type_id):
+        # Rows only show the name and description, which a compiled catalogue has without decoding the type
+        summary = getattr(self.dev_types, "summary", None)
+        if summary is not None:
+            return summary(type_id)
+        return self.dev_types.get(type_id) or {}
+
+    def query(self):
+        return self.filter_var.get().strip()
+
+    def matching(self, query):
+        return [type_id for type_id in self.search(query) if self.selectable(type_id)]
+
+    def upsert(self, type_id):
+        """A type was added or edited; only the visible rows are re-labelled"""
+        if not self.selectable(type_id):
+            self.remove(type_id)
+            return
+        if type_id not in self.order:
+            self.order.append(type_id)
+        if self.query():
+            # The search callable sees the updated index, so the ranking stays correct
+            self.visible_ids = self.matching(self.query())
+        elif type_id not in self.visible_ids:
+            self.visible_ids.append(type_id)
+        self.render()
+
+    def remove(self, type_id):
+        if type_id in self.order:
+            self.order.remove(type_id)
+        if type_id in self.visible_ids:
+            self.visible_ids.remove(type_id)
+        self.render()
+
+    def reload(self):
+        """The whole catalogue changed (e.g. an import)"""
+        self.order = [type_id for type_id in self.dev_types if self.selectable(type_id)]
+        self.apply_filter()
+
+    # -- Filtering -----------------------------------------------------------
+
+    def schedule_filter(self, *args):
+        if self.filter_job is not None:
+            self.after_cancel(self.filter_job)
+        self.filter_job = self.after(FILTER_DELAY_MS, self.apply_filter)
+
+    def apply_filter(self):
+        self.filter_job = None
+        query = self.query()
+        self.visible_ids = self.matching(query) if query else list(self.order)
+        self.top = 0
+        self.render()
+
+    def select_first_match(self, event=None):
+        if self.filter_job is not None:
+            self.after_cancel(self.filter_job)
+            self.apply_filter()
+        if self.visible_ids:
+            self.variable.set(self.visible_ids[0])
+
+    # -- Scrolling and rendering ---------------------------------------------
+
+    def max_top(self):
+        return max(0, len(self.visible_ids) - self.visible_rows)
+
+    def yview(self, *args):
+        """Scrollbar command; positions are whole rows"""
+        if args[0] == "moveto":
+            self.top = round(float(args[1]) * len(self.visible_ids))
+        elif args[0] == "scroll":
+            step = self.visible_rows if args[2] == "pages" else 1
+            self.top += int(args[1]) * step
+        self.render()
+
+    def on_mousewheel(self, event):
+        if getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0:
+            self.yview("scroll", -1, "units")
+        else:
+            self.yview("scroll", 1, "units")
+        # Keep the main window's bind_all scroll handler from also firing
+        return "break"
+
+    def scroll_to(self, type_id):
+        if type_id in self.visible_ids:
+            index = self.visible_ids.index(type_id)
+            if not self.top <= index < self.top + self.visible_rows:
+                self.top = index
+            self.render()
+
+    def render(self):
+        self.top = min(max(self.top, 0), self.max_top())
+        for slot, (row, radio, desc) in enumerate(self.rows):
+            index = self.top + slot
+            if index >= len(self.visible_ids):
+                row.pack_forget()
+                continue
+            type_id = self.visible_ids[index]
+            info = self.info(type_id)
+            radio.configure(text=f"{self.emoji_for(type_id)} {info.get('name', type_id)}", value=type_id)
+            desc.configure(text=f"• {info['description']}" if "description" in info else "")
+            row.pack(fill=tk.X, pady=3)
+
+        total = len(self.visible_ids)
+        if total:
+            self.scrollbar.set(self.top / total, min(1.0, (self.top + self.visible_rows) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        self.count_label.configure(text=f"{total} of {len(self.order)}")